@@ -2,5 +2,13 @@
 from backend.controllers.project_controller import ProjectController
 from backend.controllers.document_controller import DocumentController
 from backend.controllers.query_controller import QueryController
+from backend.controllers.index_controller import IndexController
+from backend.controllers.maintenance_controller import MaintenanceController
 
-__all__ = ["ProjectController", "DocumentController", "QueryController"]
+__all__ = [
+    "ProjectController",
+    "DocumentController",
+    "QueryController",
+    "IndexController",
+    "MaintenanceController"
+]
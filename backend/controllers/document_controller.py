@@ -2,15 +2,21 @@
 Document Controller.
 Business logic for document upload and processing.
 """
-from typing import Optional, List
-from sqlalchemy import select
+from typing import Optional, List, Dict, Any
+from sqlalchemy import select, update, delete, func, text, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
-from backend.database.models import Asset, Chunk, Project
+from backend.database.models import Asset, Chunk, Project, AssetCentroid, IngestionJob, IngestionRun
+from backend.database.bulk import delete_in_batches
+from backend.database.counters import adjust_project_counters
 from backend.services.file_service import FileService
 from backend.services.document_loader import DocumentLoaderService
 from backend.services.chunking_service import ChunkingService
 from backend.services.embedding_service import EmbeddingService
+from backend.services.ingestion_pipeline import IngestionPipeline, IngestionMetrics
 from backend.providers.vectordb.factory import VectorDBProviderFactory
+from backend.providers.vectordb.interface import VectorDBInterface
+from backend.workers.job_queue import JobQueue
+from backend.config import settings
 from datetime import datetime
 import logging
 
@@ -27,14 +33,22 @@ class DocumentController:
         self.chunking_service = ChunkingService()
         self.embedding_service = EmbeddingService()
         self.vector_db = VectorDBProviderFactory.create_provider()
+        self.ingestion_pipeline = IngestionPipeline(
+            document_loader=self.document_loader,
+            chunking_service=self.chunking_service,
+            embedding_service=self.embedding_service,
+            vector_db=self.vector_db,
+            file_service=self.file_service
+        )
+        self.job_queue = JobQueue()
     
     async def upload_document(
         self,
         db: AsyncSession,
         project_id: int,
-        file_content: bytes,
+        upload_file: Any,
         filename: str,
-        file_size: int
+        declared_size: Optional[int] = None
     ) -> Asset:
         """
         Upload document and save metadata.
@@ -42,9 +56,10 @@ class DocumentController:
         Args:
             db: Database session
             project_id: Project ID
-            file_content: File content bytes
+            upload_file: File stream with an async read(size) method
             filename: Original filename
-            file_size: File size in bytes
+            declared_size: Size reported by the client, if known, used to
+                           reject oversized files before streaming
             
         Returns:
             Created asset
@@ -53,8 +68,8 @@ class DocumentController:
             ValueError: If validation fails
         """
         try:
-            # Validate file
-            is_valid, error_msg = self.file_service.validate_file(filename, file_size)
+            # Validate file (the size limit is enforced again while streaming)
+            is_valid, error_msg = self.file_service.validate_file(filename, declared_size or 0)
             if not is_valid:
                 raise ValueError(error_msg)
             
@@ -65,9 +80,9 @@ class DocumentController:
             if not project:
                 raise ValueError(f"Project not found: {project_id}")
             
-            # Save file
-            unique_filename, file_path = await self.file_service.save_upload_file(
-                file_content=file_content,
+            # Stream file to disk
+            saved = await self.file_service.save_upload_stream(
+                upload_file=upload_file,
                 filename=filename,
                 project_id=project_id
             )
@@ -79,16 +94,22 @@ class DocumentController:
             # Create asset record
             asset = Asset(
                 project_id=project_id,
-                filename=unique_filename,
+                filename=saved['unique_filename'],
                 original_filename=filename,
-                file_path=file_path,
-                file_size=file_size,
+                file_path=saved['file_path'],
+                file_size=saved['file_size'],
                 file_type=file_type,
-                status="uploaded"
+                status="uploaded",
+                extra_metadata={'sha256': saved['sha256']}
             )
             
             db.add(asset)
-            await db.commit()
+            await adjust_project_counters(db, project_id, assets=1, size=saved['file_size'])
+            try:
+                await db.commit()
+            except Exception:
+                await self.file_service.delete_file(saved['file_path'], saved['sha256'])
+                raise
             await db.refresh(asset)
             
             logger.info(f"Uploaded document: {asset.id} - {filename}")
@@ -102,7 +123,8 @@ class DocumentController:
     async def process_document(
         self,
         db: AsyncSession,
-        asset_id: int
+        asset_id: int,
+        resume: bool = False
     ) -> bool:
         """
         Process document: extract, chunk, embed, and store.
@@ -110,90 +132,654 @@ class DocumentController:
         Args:
             db: Database session
             asset_id: Asset ID
+            resume: The job is retried after its worker was lost, so the
+                    asset may still be marked as processing by that run
             
         Returns:
             True if successful
+            
+        Raises:
+            ValueError: If the asset is missing, being deleted, or being
+                        processed by another run
         """
         try:
-            # Get asset
-            asset_stmt = select(Asset).where(Asset.id == asset_id)
-            asset_result = await db.execute(asset_stmt)
-            asset = asset_result.scalar_one_or_none()
+            # Claim the asset in one statement so two runs cannot both start
+            claimable = ["uploaded", "completed", "failed"]
+            if resume:
+                claimable.append("processing")
+            claimed = await db.scalar(
+                update(Asset)
+                .where(Asset.id == asset_id, Asset.status.in_(claimable))
+                .values(status="processing")
+                .returning(Asset.id)
+            )
+            if claimed is None:
+                await db.rollback()
+                raise ValueError(f"Asset not found or already being processed or deleted: {asset_id}")
+            await db.commit()
             
-            if not asset:
-                raise ValueError(f"Asset not found: {asset_id}")
+            asset_stmt = select(Asset).where(Asset.id == asset_id).execution_options(populate_existing=True)
+            asset = (await db.execute(asset_stmt)).scalar_one()
             
-            # Update status to processing
-            asset.status = "processing"
-            await db.commit()
+            project_id = asset.project_id
+            metrics = IngestionMetrics()
+            metrics.counts['file_bytes'] = asset.file_size or 0
+            started_at = datetime.utcnow()
             
             try:
-                # Extract text
-                logger.info(f"Extracting text from {asset.original_filename}")
-                text = await self.document_loader.load_document(asset.file_path)
-                
-                # Chunk text
-                logger.info(f"Chunking text ({len(text)} characters)")
-                chunks_data = await self.chunking_service.chunk_document(
-                    text=text,
-                    document_name=asset.original_filename,
-                    additional_metadata={
-                        'file_type': asset.file_type,
-                        'asset_id': asset.id
-                    }
+                # A project's first document fixes its embedding model; it
+                # moves to a newly configured model only by being reindexed
+                await self._claim_embedding_model(
+                    db, project_id, self.embedding_service.get_embedding_model_name()
                 )
                 
-                # Create chunk records
-                chunk_records = []
-                for i, chunk_data in enumerate(chunks_data):
-                    chunk = Chunk(
-                        project_id=asset.project_id,
-                        asset_id=asset.id,
-                        content=chunk_data['content'],
-                        chunk_index=i,
-                        extra_metadata=chunk_data['metadata']
-                    )
-                    db.add(chunk)
-                    chunk_records.append(chunk)
+                # Served generation. The share lock only holds until the first batch
+                # commit; a mid-run switch is prevented by IndexController._switch,
+                # which postpones while this asset is processing with a live job
+                served = await self._served_index(db, project_id, lock=True)
+                generation = served.index_generation
+                embedding_model = served.embedding_model
                 
-                await db.commit()
-                
-                # Refresh to get IDs
-                for chunk in chunk_records:
-                    await db.refresh(chunk)
+                # Identical file already processed with the same settings: copy its index
+                has_chunks = await self._has_chunks(db, asset, generation)
+                source = None if has_chunks else await self._find_processed_duplicate(db, asset, embedding_model)
+                if source:
+                    await self._clone_from_asset(db, source, asset, generation)
+                    await self._mark_completed(db, asset, embedding_model, cloned_from=source.id)
+                    logger.info(f"Completed document {asset.id} by cloning asset {source.id}")
+                    return True
                 
-                # Generate embeddings
-                logger.info(f"Generating embeddings for {len(chunk_records)} chunks")
-                texts = [chunk.content for chunk in chunk_records]
-                embeddings = await self.embedding_service.generate_embeddings(texts)
-                
-                # Store embeddings in chunks and vector DB
-                chunk_ids = [chunk.id for chunk in chunk_records]
-                await self.vector_db.add_vectors(
-                    collection_name=f"project_{asset.project_id}",
-                    vectors=embeddings,
-                    ids=chunk_ids
+                # Stream extract -> chunk -> embed -> write, re-using unchanged chunks
+                logger.info(f"Ingesting {asset.original_filename}")
+                result = await self.ingestion_pipeline.run(
+                    db, asset, metrics, generation=generation, embedding_model=embedding_model
                 )
                 
+                # Maintain document summary vector for two-stage retrieval
+                await self._update_asset_centroid(db, asset, result['centroid'], result['chunk_count'])
+                
                 # Update asset status
-                asset.status = "completed"
-                asset.processed_at = datetime.utcnow()
-                await db.commit()
+                await self._mark_completed(db, asset, embedding_model, ingestion=result['stats'])
+                await self._record_run(db, project_id, asset_id, started_at, metrics, "completed")
                 
                 logger.info(f"Completed processing document: {asset.id}")
                 return True
                 
             except Exception as e:
                 # Mark as failed
-                asset.status = "failed"
-                asset.error_message = str(e)
-                await db.commit()
+                await db.rollback()
+                try:
+                    await db.refresh(asset)
+                    asset.status = "failed"
+                    asset.error_message = str(e)
+                    # Chunks written before the failure stay in the index
+                    await self._sync_chunk_count(db, asset)
+                    await db.commit()
+                except Exception as mark_error:
+                    # E.g. the asset or project was deleted meanwhile; the
+                    # original error is the one worth reporting
+                    await db.rollback()
+                    logger.warning(f"Could not mark document {asset_id} as failed: {str(mark_error)}")
+                metrics.finish()
+                await self._record_run(db, project_id, asset_id, started_at, metrics, "failed", str(e))
                 raise
                 
         except Exception as e:
             logger.error(f"Error processing document: {str(e)}")
             raise
     
+    async def queue_processing(
+        self,
+        db: AsyncSession,
+        asset_id: int
+    ) -> Optional[IngestionJob]:
+        """
+        Queue a document for (re)processing by the ingestion workers.
+        
+        Args:
+            db: Database session
+            asset_id: Asset ID
+            
+        Returns:
+            Queued job or None if the asset was not found
+            
+        Raises:
+            ValueError: If the asset is being processed or deleted, or
+                        already has a pending processing job
+        """
+        try:
+            asset = await self._lock_for_processing(db, asset_id)
+            if not asset:
+                return None
+            
+            return await self.job_queue.enqueue(
+                db,
+                JobQueue.PROCESS_DOCUMENT,
+                asset_id=asset_id,
+                project_id=asset.project_id
+            )
+            
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error queueing document processing: {str(e)}")
+            raise
+    
+    async def _lock_for_processing(self, db: AsyncSession, asset_id: int) -> Optional[Asset]:
+        """
+        Lock an asset that is about to be queued for processing.
+        
+        The row lock is held until the job is enqueued (enqueue commits),
+        so two requests cannot both pass the checks below.
+        
+        Args:
+            db: Database session
+            asset_id: Asset ID
+            
+        Returns:
+            Locked asset or None if not found
+            
+        Raises:
+            ValueError: If the asset is being processed or deleted, or
+                        already has a pending processing job
+        """
+        asset_stmt = (
+            select(Asset)
+            .where(Asset.id == asset_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        asset = (await db.execute(asset_stmt)).scalar_one_or_none()
+        if not asset:
+            return None
+        
+        if asset.status in ("processing", "deleting"):
+            raise ValueError(f"Document {asset_id} cannot be processed while {asset.status}")
+        
+        pending = await db.scalar(
+            select(IngestionJob.id).where(
+                IngestionJob.asset_id == asset_id,
+                IngestionJob.job_type == JobQueue.PROCESS_DOCUMENT,
+                IngestionJob.status.in_(("queued", "running"))
+            ).limit(1)
+        )
+        if pending:
+            raise ValueError(f"Document {asset_id} is already queued for processing (job {pending})")
+        
+        return asset
+    
+    async def replace_document(
+        self,
+        db: AsyncSession,
+        asset_id: int,
+        upload_file: Any,
+        filename: str,
+        declared_size: Optional[int] = None
+    ) -> Optional[Asset]:
+        """
+        Replace the file of an existing document with a revised version.
+        
+        The asset keeps its ID and chunks and is queued for processing,
+        which re-uses the chunks (and embeddings) whose content did not change.
+        
+        Args:
+            db: Database session
+            asset_id: Asset ID
+            upload_file: File stream with an async read(size) method
+            filename: Original filename of the new version
+            declared_size: Size reported by the client, if known
+            
+        Returns:
+            Updated asset or None if not found
+            
+        Raises:
+            ValueError: If validation fails, or the asset is being processed
+                        or deleted or already queued for processing
+        """
+        try:
+            # Checked before streaming the upload, and again under lock after it
+            asset = await self._lock_for_processing(db, asset_id)
+            if not asset:
+                return None
+            project_id = asset.project_id
+            await db.rollback()
+            
+            is_valid, error_msg = self.file_service.validate_file(filename, declared_size or 0)
+            if not is_valid:
+                raise ValueError(error_msg)
+            
+            saved = await self.file_service.save_upload_stream(
+                upload_file=upload_file,
+                filename=filename,
+                project_id=project_id
+            )
+            
+            try:
+                asset = await self._lock_for_processing(db, asset_id)
+            except Exception:
+                await self.file_service.delete_file(saved['file_path'], saved['sha256'])
+                raise
+            if not asset:
+                await self.file_service.delete_file(saved['file_path'], saved['sha256'])
+                return None
+            
+            from pathlib import Path
+            old_path = asset.file_path
+            old_sha256 = (asset.extra_metadata or {}).get('sha256')
+            await adjust_project_counters(db, asset.project_id, size=saved['file_size'] - (asset.file_size or 0))
+            
+            asset.filename = saved['unique_filename']
+            asset.original_filename = filename
+            asset.file_path = saved['file_path']
+            asset.file_size = saved['file_size']
+            asset.file_type = Path(filename).suffix.lstrip('.')
+            asset.status = "uploaded"
+            asset.error_message = None
+            asset.extra_metadata = {
+                **(asset.extra_metadata or {}),
+                'sha256': saved['sha256'],
+                'replaced_at': datetime.utcnow().isoformat()
+            }
+            
+            # Commits the new version together with its processing job
+            try:
+                await self.job_queue.enqueue(
+                    db,
+                    JobQueue.PROCESS_DOCUMENT,
+                    asset_id=asset_id,
+                    project_id=asset.project_id
+                )
+            except Exception:
+                await self.file_service.delete_file(saved['file_path'], saved['sha256'])
+                raise
+            
+            await self.file_service.delete_file(old_path, sha256=old_sha256)
+            
+            logger.info(f"Replaced file of document {asset.id} with {filename}")
+            return asset
+            
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error replacing document: {str(e)}")
+            raise
+    
+    async def reindex_document(
+        self,
+        db: AsyncSession,
+        asset: Asset,
+        generation: int,
+        donor_generation: int
+    ) -> dict:
+        """
+        Build an asset's chunks and vectors in a new index generation.
+        
+        The asset keeps its status and served chunks; the new centroid and
+        pipeline settings are staged in its metadata until the generation
+        is switched to. Chunks are embedded with the configured model, at
+        most REINDEX_EMBEDDING_RATE embeddings per second.
+        
+        Args:
+            db: Database session
+            asset: Completed asset
+            generation: Generation being built
+            donor_generation: Served generation (embeddings of identical chunks are copied)
+            
+        Returns:
+            Ingestion stats
+        """
+        metrics = IngestionMetrics()
+        metrics.counts['file_bytes'] = asset.file_size or 0
+        started_at = datetime.utcnow()
+        project_id, asset_id = asset.project_id, asset.id
+        
+        try:
+            result = await self.ingestion_pipeline.run(
+                db, asset, metrics,
+                generation=generation,
+                donor_generation=donor_generation,
+                embedding_rate=settings.reindex_embedding_rate or None
+            )
+            asset.extra_metadata = {
+                **(asset.extra_metadata or {}),
+                'reindex': {
+                    'generation': generation,
+                    'centroid': result['centroid'],
+                    'chunk_count': result['chunk_count'],
+                    'pipeline': self._pipeline_signature(),
+                    'processed_at': asset.processed_at.isoformat() if asset.processed_at else None
+                }
+            }
+            await db.commit()
+            await self._record_run(db, project_id, asset_id, started_at, metrics, "completed")
+            return result['stats']
+            
+        except Exception as e:
+            await db.rollback()
+            metrics.finish()
+            await self._record_run(db, project_id, asset_id, started_at, metrics, "failed", str(e))
+            raise
+    
+    @staticmethod
+    async def _served_index(db: AsyncSession, project_id: int, lock: bool = False) -> Any:
+        """
+        Get the index generation and embedding model a project serves.
+        
+        Args:
+            db: Database session
+            project_id: Project ID
+            lock: Hold a share lock on the project row until the next commit
+            
+        Returns:
+            Row with index_generation and embedding_model (None until the
+            project's first document is processed)
+        """
+        stmt = select(Project.index_generation, Project.embedding_model).where(Project.id == project_id)
+        if lock:
+            stmt = stmt.with_for_update(read=True)
+        return (await db.execute(stmt)).one()
+    
+    @staticmethod
+    async def _claim_embedding_model(db: AsyncSession, project_id: int, embedding_model: str) -> None:
+        """Record the embedding model of a project that has none yet."""
+        await db.execute(
+            update(Project)
+            .where(Project.id == project_id, Project.embedding_model.is_(None))
+            .values(embedding_model=embedding_model)
+        )
+        await db.commit()
+    
+    async def _has_chunks(self, db: AsyncSession, asset: Asset, generation: int) -> bool:
+        """Check whether an asset already has chunk records in a generation."""
+        stmt = select(Chunk.id).where(
+            Chunk.asset_id == asset.id,
+            Chunk.generation == generation
+        ).limit(1)
+        result = await db.execute(stmt)
+        return result.first() is not None
+    
+    def _pipeline_signature(self, embedding_model: Optional[str] = None) -> dict:
+        """Settings that determine an asset's chunks and embeddings."""
+        return {
+            'chunk_size': self.chunking_service.chunk_size,
+            'chunk_overlap': self.chunking_service.chunk_overlap,
+            'parent_chunk_size': self.chunking_service.parent_chunk_size,
+            'chunk_length_unit': self.chunking_service.length_unit,
+            'embedding_model': embedding_model or self.embedding_service.get_embedding_model_name()
+        }
+    
+    async def _record_run(
+        self,
+        db: AsyncSession,
+        project_id: int,
+        asset_id: int,
+        started_at: datetime,
+        metrics: IngestionMetrics,
+        status: str,
+        error_message: Optional[str] = None
+    ) -> None:
+        """
+        Store the metrics of one ingestion run for throughput statistics.
+        
+        Failures are logged only; they never fail the ingestion itself.
+        
+        Args:
+            db: Database session
+            project_id: Project ID
+            asset_id: Asset ID
+            started_at: Run start (UTC)
+            metrics: Run metrics
+            status: "completed" or "failed"
+            error_message: Failure reason
+        """
+        summary = metrics.as_dict()
+        try:
+            db.add(IngestionRun(
+                project_id=project_id,
+                asset_id=asset_id,
+                status=status,
+                error_message=error_message,
+                **{counter: summary.get(counter, 0) for counter in ('file_bytes',) + IngestionMetrics.COUNTERS},
+                duration_seconds=summary['duration_seconds'],
+                stage_seconds=summary['stage_seconds'],
+                started_at=started_at
+            ))
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error recording ingestion run: {str(e)}")
+    
+    async def _mark_completed(
+        self,
+        db: AsyncSession,
+        asset: Asset,
+        embedding_model: str,
+        **extra_metadata
+    ) -> None:
+        """
+        Mark asset as processed and record the pipeline settings used.
+        
+        Args:
+            db: Database session
+            asset: Processed asset
+            embedding_model: Model the asset's chunks were embedded with
+            **extra_metadata: Additional values stored in asset metadata
+        """
+        asset.status = "completed"
+        asset.error_message = None
+        asset.processed_at = datetime.utcnow()
+        asset.extra_metadata = {
+            **(asset.extra_metadata or {}),
+            'pipeline': self._pipeline_signature(embedding_model),
+            **extra_metadata
+        }
+        await self._sync_chunk_count(db, asset)
+        await db.commit()
+    
+    async def _sync_chunk_count(self, db: AsyncSession, asset: Asset) -> None:
+        """
+        Record the asset's served chunk count and apply the change to its
+        project's counters (committed by the caller).
+        
+        Args:
+            db: Database session
+            asset: Asset whose processing run ended
+        """
+        generation = (await self._served_index(db, asset.project_id)).index_generation
+        chunk_count = await db.scalar(select(func.count(Chunk.id)).where(
+            Chunk.asset_id == asset.id,
+            Chunk.generation == generation
+        ))
+        delta = chunk_count - (asset.chunk_count or 0)
+        asset.chunk_count = chunk_count
+        await adjust_project_counters(db, asset.project_id, chunks=delta)
+    
+    async def _find_processed_duplicate(
+        self,
+        db: AsyncSession,
+        asset: Asset,
+        embedding_model: str
+    ) -> Optional[Asset]:
+        """
+        Find a completed asset with identical content and pipeline settings.
+        
+        Args:
+            db: Database session
+            asset: Asset being processed
+            embedding_model: Model the asset is embedded with
+            
+        Returns:
+            Source asset to clone from, or None
+        """
+        sha256 = (asset.extra_metadata or {}).get('sha256')
+        if not sha256:
+            return None
+        
+        stmt = select(Asset).where(
+            # Literal key so the ix_assets_sha256 expression index applies
+            Asset.extra_metadata.op("->>")(literal_column("'sha256'")) == sha256,
+            Asset.status == "completed",
+            Asset.id != asset.id
+        ).order_by(Asset.processed_at.desc())
+        result = await db.execute(stmt)
+        
+        signature = self._pipeline_signature(embedding_model)
+        for candidate in result.scalars().all():
+            if (candidate.extra_metadata or {}).get('pipeline') == signature:
+                return candidate
+        return None
+    
+    async def _clone_from_asset(
+        self,
+        db: AsyncSession,
+        source: Asset,
+        asset: Asset,
+        generation: int
+    ) -> None:
+        """
+        Copy parent windows, chunks, embeddings and centroid from another asset.
+        
+        Rows are copied with INSERT ... SELECT so content and embeddings never
+        leave the database; metadata is rewritten to point at the new asset.
+        
+        Args:
+            db: Database session
+            source: Completed asset with identical content
+            asset: Asset being processed
+            generation: Generation to write (the source's served one is read)
+        """
+        source_generation = (await self._served_index(db, source.project_id)).index_generation
+        params = {
+            'source_id': source.id,
+            'source_generation': source_generation,
+            'asset_id': asset.id,
+            'project_id': asset.project_id,
+            'generation': generation,
+            'document_name': asset.original_filename
+        }
+        
+        await db.execute(text("""
+            INSERT INTO parent_chunks (project_id, asset_id, content, parent_index, generation, metadata)
+            SELECT :project_id, :asset_id, content, parent_index, :generation,
+                   (metadata::jsonb || jsonb_build_object(
+                       'asset_id', CAST(:asset_id AS integer), 'document_name', CAST(:document_name AS text)
+                   ))::json
+            FROM parent_chunks
+            WHERE asset_id = :source_id AND generation = :source_generation
+        """), params)
+        
+        # Children are re-linked to the new parent with the same parent_index
+        await db.execute(text("""
+            INSERT INTO chunks (project_id, asset_id, content, chunk_index, generation,
+                                embedding, embedding_model, embedding_dimension, metadata)
+            SELECT :project_id, :asset_id, c.content, c.chunk_index, :generation,
+                   c.embedding, c.embedding_model, c.embedding_dimension,
+                   (c.metadata::jsonb
+                    || jsonb_build_object('asset_id', CAST(:asset_id AS integer), 'document_name', CAST(:document_name AS text))
+                    || CASE WHEN p.id IS NULL THEN '{}'::jsonb
+                            ELSE jsonb_build_object('parent_id', p.id) END)::json
+            FROM chunks c
+            LEFT JOIN parent_chunks p
+                   ON p.asset_id = :asset_id
+                  AND p.generation = :generation
+                  AND p.parent_index = (c.metadata->>'parent_index')::int
+            WHERE c.asset_id = :source_id AND c.generation = :source_generation
+        """), params)
+        
+        await db.execute(text("""
+            INSERT INTO asset_centroids (asset_id, project_id, embedding, chunk_count)
+            SELECT :asset_id, :project_id, embedding, chunk_count
+            FROM asset_centroids
+            WHERE asset_id = :source_id
+        """), params)
+        
+        await db.commit()
+        
+        # External vector stores hold vectors outside the chunks table
+        if not self.vector_db.stores_embeddings_in_chunks:
+            await self._clone_external_vectors(db, source, asset, source_generation, generation)
+    
+    async def _clone_external_vectors(
+        self,
+        db: AsyncSession,
+        source: Asset,
+        asset: Asset,
+        source_generation: int,
+        generation: int
+    ) -> None:
+        """
+        Copy vectors of cloned chunks in an external vector store.
+        
+        Args:
+            db: Database session
+            source: Asset the chunks were copied from
+            asset: Asset the chunks were copied to
+            source_generation: Generation the chunks were copied from
+            generation: Generation the chunks were copied to
+        """
+        stmt = select(
+            Chunk.id, Chunk.asset_id, Chunk.chunk_index, Chunk.content, Chunk.extra_metadata,
+            Chunk.embedding_model, Chunk.embedding_dimension
+        ).where(
+            ((Chunk.asset_id == source.id) & (Chunk.generation == source_generation))
+            | ((Chunk.asset_id == asset.id) & (Chunk.generation == generation))
+        )
+        rows = (await db.execute(stmt)).all()
+        
+        source_ids = {row.chunk_index: row.id for row in rows if row.asset_id == source.id}
+        new_rows = {row.chunk_index: row for row in rows if row.asset_id == asset.id}
+        
+        source_collection = VectorDBInterface.collection_name(source.project_id, source_generation)
+        vectors = await self.vector_db.get_vectors(source_collection, list(source_ids.values()))
+        
+        pairs = [
+            (new_rows[index], vectors[source_id])
+            for index, source_id in source_ids.items()
+            if index in new_rows and source_id in vectors
+        ]
+        if pairs:
+            await self.vector_db.add_vectors(
+                collection_name=VectorDBInterface.collection_name(asset.project_id, generation),
+                vectors=[vector for _, vector in pairs],
+                ids=[row.id for row, _ in pairs],
+                metadata=[
+                    VectorDBInterface.vector_payload(
+                        project_id=asset.project_id,
+                        asset_id=asset.id,
+                        generation=generation,
+                        content=row.content,
+                        metadata=row.extra_metadata,
+                        embedding_model=row.embedding_model,
+                        embedding_dimension=row.embedding_dimension
+                    )
+                    for row, _ in pairs
+                ]
+            )
+    
+    async def _update_asset_centroid(
+        self,
+        db: AsyncSession,
+        asset: Asset,
+        centroid: List[float],
+        chunk_count: int
+    ) -> None:
+        """
+        Store the centroid of an asset's chunk embeddings.
+        
+        Args:
+            db: Database session
+            asset: Processed asset
+            centroid: Mean normalized embedding of the asset's chunks
+            chunk_count: Number of chunks the centroid covers
+        """
+        if not chunk_count:
+            return
+        
+        await db.merge(AssetCentroid(
+            asset_id=asset.id,
+            project_id=asset.project_id,
+            embedding=centroid,
+            chunk_count=chunk_count
+        ))
+    
     async def get_document(
         self,
         db: AsyncSession,
@@ -246,34 +832,114 @@ class DocumentController:
         self,
         db: AsyncSession,
         asset_id: int
-    ) -> bool:
+    ) -> Optional[Dict[str, Any]]:
         """
-        Delete document and associated chunks.
+        Delete document with its chunks, vectors and file.
+        
+        Documents with at least DELETE_BACKGROUND_MIN_CHUNKS chunks are
+        marked "deleting" and removed by a background job instead.
         
         Args:
             db: Database session
             asset_id: Asset ID
             
         Returns:
-            True if deleted
+            None if not found, else dict with 'status' ("deleted" or
+            "deleting") and the background 'job_id'
+            
+        Raises:
+            ValueError: If the document is being processed or deleted
         """
         try:
             # Get asset
             asset = await self.get_document(db, asset_id)
             if not asset:
-                return False
+                return None
             
-            # Delete file
-            await self.file_service.delete_file(asset.file_path)
+            if asset.status in ("processing", "deleting"):
+                raise ValueError(f"Document {asset_id} cannot be deleted while {asset.status}")
             
-            # Delete from database (cascade will delete chunks)
-            await db.delete(asset)
-            await db.commit()
+            chunk_count = await db.scalar(select(func.count(Chunk.id)).where(Chunk.asset_id == asset_id))
+            if chunk_count >= settings.delete_background_min_chunks:
+                asset.status = "deleting"
+                await db.commit()
+                # Not tied to the asset row, so the job outlives the asset
+                job = await self.job_queue.enqueue(
+                    db,
+                    JobQueue.DELETE_DOCUMENT,
+                    project_id=asset.project_id,
+                    payload={'asset_id': asset_id, 'chunks': chunk_count, 'deleted_chunks': 0}
+                )
+                logger.info(f"Queued deletion of document {asset_id} ({chunk_count} chunks)")
+                return {'status': 'deleting', 'job_id': job.id}
             
-            logger.info(f"Deleted document: {asset_id}")
-            return True
+            await self._delete_asset(db, asset)
+            return {'status': 'deleted', 'job_id': None}
             
         except Exception as e:
             await db.rollback()
             logger.error(f"Error deleting document: {str(e)}")
             raise
+    
+    async def run_delete_document(self, db: AsyncSession, job: IngestionJob) -> None:
+        """
+        Background deletion of a large document.
+        
+        Args:
+            db: Database session
+            job: Deletion job (payload carries 'asset_id'; progress is
+                 reported as 'deleted_chunks')
+        """
+        asset = await self.get_document(db, job.payload['asset_id'])
+        if not asset:
+            return
+        
+        payload = dict(job.payload)
+        
+        async def report(deleted: int) -> None:
+            payload['deleted_chunks'] = deleted
+            await self.job_queue.update_payload(db, job.id, payload, job.locked_by)
+        
+        await self._delete_asset(db, asset, on_batch=report)
+    
+    async def _delete_asset(self, db: AsyncSession, asset: Asset, on_batch: Any = None) -> None:
+        """
+        Remove an asset with set-based statements.
+        
+        Chunks are deleted in short batches; parent windows, centroid and
+        jobs go with the asset row through ON DELETE CASCADE, so no row is
+        loaded into the session. External vectors are deleted by asset_id
+        in every generation the asset has chunks in.
+        
+        Args:
+            db: Database session
+            asset: Asset to delete
+            on_batch: Optional coroutine called with the deleted chunk count
+        """
+        asset_id, project_id = asset.id, asset.project_id
+        file_path, sha256 = asset.file_path, (asset.extra_metadata or {}).get('sha256')
+        
+        generations = []
+        if not self.vector_db.stores_embeddings_in_chunks:
+            generations = (await db.execute(
+                select(Chunk.generation).where(Chunk.asset_id == asset_id).distinct()
+            )).scalars().all()
+        
+        await delete_in_batches(db, Chunk, Chunk.asset_id == asset_id, on_batch=on_batch)
+        deleted = (await db.execute(
+            delete(Asset).where(Asset.id == asset_id).returning(Asset.file_size, Asset.chunk_count)
+        )).first()
+        if deleted:
+            await adjust_project_counters(
+                db, project_id, assets=-1, size=-(deleted.file_size or 0), chunks=-deleted.chunk_count
+            )
+        await db.commit()
+        
+        for generation in generations:
+            await self.vector_db.delete_vectors(
+                VectorDBInterface.collection_name(project_id, generation),
+                filter_dict={'asset_id': asset_id}
+            )
+        
+        await self.file_service.delete_file(file_path, sha256=sha256)
+        logger.info(f"Deleted document: {asset_id}")
@@ -0,0 +1,405 @@
+"""
+Index Controller.
+Blue/green re-indexing of a project with the current chunking and embedding settings.
+"""
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+import asyncio
+import time
+from sqlalchemy import select, update, delete, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.models import Project, Asset, Chunk, ParentChunk, AssetCentroid, ProjectCounters, IngestionJob
+from backend.database.bulk import delete_in_batches
+from backend.controllers.document_controller import DocumentController
+from backend.providers.vectordb.interface import VectorDBInterface
+from backend.workers.job_queue import JobQueue
+from backend.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IndexController:
+    """
+    Controller for project reindexing.
+
+    A reindex builds the next index generation (chunks, parent windows and
+    vectors tagged with the generation number) from the cached extracted
+    text while queries keep reading the served generation. Once every
+    completed document is built, the project's index_generation is switched
+    in one transaction and the old generation is garbage-collected.
+
+    This is also how a project moves to a new embedding model: queries keep
+    being embedded with the served generation's model, documents processed
+    meanwhile are embedded with it too, and the project switches to the
+    configured model only once the new generation covers every document.
+    """
+
+    def __init__(self, document_controller: Optional[DocumentController] = None):
+        """
+        Initialize index controller.
+
+        Args:
+            document_controller: Controller used to build each document
+        """
+        self.document_controller = document_controller or DocumentController()
+        self.vector_db = self.document_controller.vector_db
+        self.job_queue = JobQueue()
+
+    async def start_reindex(
+        self,
+        db: AsyncSession,
+        project_id: int
+    ) -> Optional[IngestionJob]:
+        """
+        Queue a reindex of a project.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+
+        Returns:
+            Queued job, or None if the project does not exist
+
+        Raises:
+            ValueError: If a reindex of the project is already queued or running
+        """
+        project = await db.get(Project, project_id)
+        if not project:
+            return None
+
+        running = await self._latest_job(db, project_id)
+        if running and running.status in ("queued", "running"):
+            raise ValueError(f"Project {project_id} is already being reindexed (job {running.id})")
+
+        generation = project.index_generation + 1
+        job = await self.job_queue.enqueue(
+            db,
+            JobQueue.REINDEX_PROJECT,
+            project_id=project_id,
+            payload={'generation': generation, 'embedding_model': self._embedding_model()}
+        )
+        logger.info(f"Queued reindex of project {project_id} into generation {generation}")
+        return job
+
+    async def start_model_migrations(self, db: AsyncSession) -> List[IngestionJob]:
+        """
+        Queue a reindex of every project served with another embedding model.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Queued jobs (projects already being reindexed are skipped)
+        """
+        embedding_model = self._embedding_model()
+        stmt = select(Project.id).where(
+            Project.embedding_model.isnot(None),
+            Project.embedding_model != embedding_model
+        ).order_by(Project.id)
+        project_ids = (await db.execute(stmt)).scalars().all()
+
+        jobs = []
+        for project_id in project_ids:
+            try:
+                job = await self.start_reindex(db, project_id)
+            except ValueError:
+                continue
+            if job:
+                jobs.append(job)
+
+        if jobs:
+            logger.info(f"Queued migration of {len(jobs)} projects to embedding model {embedding_model}")
+        return jobs
+
+    async def get_reindex_status(
+        self,
+        db: AsyncSession,
+        project_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of the latest reindex of a project.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+
+        Returns:
+            Dict with the served generation and the latest job's status and
+            progress, or None if the project does not exist
+        """
+        project = await db.get(Project, project_id)
+        if not project:
+            return None
+
+        job = await self._latest_job(db, project_id)
+        coverage = await db.execute(
+            select(Chunk.embedding_model, func.count(Chunk.id)).where(
+                Chunk.project_id == project_id,
+                Chunk.generation == project.index_generation
+            ).group_by(Chunk.embedding_model)
+        )
+        return {
+            'project_id': project_id,
+            'active_generation': project.index_generation,
+            'embedding_model': project.embedding_model,
+            'embedding_models': {model or 'unknown': count for model, count in coverage.all()},
+            'target_embedding_model': (job.payload or {}).get('embedding_model') if job else None,
+            'job_id': job.id if job else None,
+            'status': job.status if job else None,
+            'generation': (job.payload or {}).get('generation') if job else None,
+            'progress': (job.payload or {}).get('progress') if job else None,
+            'last_error': job.last_error if job else None
+        }
+
+    async def run_reindex(self, db: AsyncSession, job: IngestionJob) -> None:
+        """
+        Build, switch to and clean up after a new index generation.
+
+        Safe to re-run after a crash: documents already built for the
+        generation are skipped, and a switched generation only has its
+        garbage collection redone.
+
+        Args:
+            db: Database session
+            job: Reindex job (payload carries the target 'generation')
+        """
+        project_id = job.project_id
+        generation = job.payload['generation']
+        payload = dict(job.payload)
+
+        project = await db.get(Project, project_id)
+        if not project:
+            return
+        donor_generation = project.index_generation
+
+        if donor_generation >= generation:
+            await self._collect_old_generations(db, project_id, donor_generation)
+            return
+
+        started = time.perf_counter()
+        progress = {
+            'stage': 'building',
+            'assets_total': 0,
+            'assets_done': 0,
+            'chunks': 0,
+            'embedded': 0,
+            'kept': 0,
+            'started_at': datetime.utcnow().isoformat()
+        }
+
+        async def report(stage: str) -> None:
+            elapsed = time.perf_counter() - started
+            progress.update({
+                'stage': stage,
+                'elapsed_seconds': round(elapsed, 1),
+                'chunks_per_second': round(progress['chunks'] / elapsed, 2) if elapsed else 0.0,
+                'embeddings_per_second': round(progress['embedded'] / elapsed, 2) if elapsed else 0.0
+            })
+            payload['progress'] = progress
+            await self.job_queue.update_payload(db, job.id, payload, job.locked_by)
+
+        switch_deadline = None
+        while True:
+            pending = await self._assets_to_build(db, project_id, generation)
+            if not pending:
+                await report('switching')
+                if await self._switch(db, project_id, generation):
+                    break
+                # Documents still processing in the served generation
+                if switch_deadline is None:
+                    switch_deadline = time.monotonic() + settings.reindex_switch_timeout_seconds
+                elif time.monotonic() > switch_deadline:
+                    raise TimeoutError(
+                        f"Project {project_id} still has documents processing after "
+                        f"{settings.reindex_switch_timeout_seconds}s, switch to generation "
+                        f"{generation} postponed"
+                    )
+                await asyncio.sleep(settings.ingestion_poll_interval_seconds)
+                continue
+
+            switch_deadline = None
+
+            progress['assets_total'] = progress['assets_done'] + len(pending)
+            for asset in pending:
+                stats = await self.document_controller.reindex_document(
+                    db, asset, generation, donor_generation
+                )
+                progress['assets_done'] += 1
+                progress['chunks'] += stats['chunks']
+                progress['embedded'] += stats['embedded']
+                progress['kept'] += stats['kept']
+                await report('building')
+
+        logger.info(f"Project {project_id} now serves index generation {generation}")
+
+        await report('collecting')
+        await self._collect_old_generations(db, project_id, generation)
+        await report('completed')
+
+    async def _latest_job(self, db: AsyncSession, project_id: int) -> Optional[IngestionJob]:
+        """Most recent reindex job of a project."""
+        stmt = select(IngestionJob).where(
+            IngestionJob.project_id == project_id,
+            IngestionJob.job_type == JobQueue.REINDEX_PROJECT
+        ).order_by(IngestionJob.id.desc()).limit(1)
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    def _embedding_model(self) -> str:
+        """Embedding model new generations are built with."""
+        return self.document_controller.embedding_service.get_embedding_model_name()
+
+    def _is_built(self, asset: Asset, generation: int) -> bool:
+        """Whether the asset's current version is built in the generation with the current settings."""
+        staged = (asset.extra_metadata or {}).get('reindex')
+        if not staged or staged.get('generation') != generation:
+            return False
+        if staged.get('pipeline') != self.document_controller._pipeline_signature():
+            return False
+        processed_at = asset.processed_at.isoformat() if asset.processed_at else None
+        return staged.get('processed_at') == processed_at
+
+    async def _assets_to_build(
+        self,
+        db: AsyncSession,
+        project_id: int,
+        generation: int
+    ) -> List[Asset]:
+        """
+        Completed documents not (or no longer) built in the generation.
+
+        Documents processed again after being built (replaced files, new
+        uploads finished during the reindex) are built again.
+        """
+        stmt = select(Asset).where(
+            Asset.project_id == project_id,
+            Asset.status == "completed"
+        ).order_by(Asset.id)
+        assets = (await db.execute(stmt)).scalars().all()
+        return [asset for asset in assets if not self._is_built(asset, generation)]
+
+    async def _switch(self, db: AsyncSession, project_id: int, generation: int) -> bool:
+        """
+        Atomically make the new generation the served one.
+
+        The project row is locked, so documents that start processing
+        afterwards read the new generation; documents already processing
+        (in the old one) postpone the switch, unless nothing is working on
+        them any more.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            generation: Built generation
+
+        Returns:
+            True if switched, False if it has to be retried later
+        """
+        try:
+            project = (await db.execute(
+                select(Project).where(Project.id == project_id).with_for_update()
+            )).scalar_one()
+
+            # Assets left "processing" by a crashed run without a live job
+            # would otherwise hold the switch back forever
+            live_job = select(IngestionJob.id).where(
+                IngestionJob.asset_id == Asset.id,
+                IngestionJob.job_type == JobQueue.PROCESS_DOCUMENT,
+                or_(
+                    IngestionJob.status == "queued",
+                    and_(
+                        IngestionJob.status == "running",
+                        IngestionJob.locked_at >= func.now() - self.job_queue.lock_timeout
+                    )
+                )
+            ).exists()
+            processing = await db.scalar(select(func.count(Asset.id)).where(
+                Asset.project_id == project_id,
+                Asset.status == "processing",
+                live_job
+            ))
+            assets = (await db.execute(select(Asset).where(
+                Asset.project_id == project_id,
+                Asset.status == "completed"
+            ))).scalars().all()
+            if processing or not all(self._is_built(asset, generation) for asset in assets):
+                await db.rollback()
+                return False
+
+            for asset in assets:
+                metadata = dict(asset.extra_metadata)
+                staged = metadata.pop('reindex')
+                metadata['pipeline'] = staged['pipeline']
+                asset.extra_metadata = metadata
+
+                if staged['chunk_count']:
+                    await db.merge(AssetCentroid(
+                        asset_id=asset.id,
+                        project_id=project_id,
+                        embedding=staged['centroid'],
+                        chunk_count=staged['chunk_count']
+                    ))
+                else:
+                    await db.execute(delete(AssetCentroid).where(AssetCentroid.asset_id == asset.id))
+
+            # Served chunk counts now come from the new generation (only
+            # completed documents are built in it)
+            chunk_counts = dict((await db.execute(
+                select(Chunk.asset_id, func.count(Chunk.id)).where(
+                    Chunk.project_id == project_id,
+                    Chunk.generation == generation
+                ).group_by(Chunk.asset_id)
+            )).all())
+            for asset in assets:
+                asset.chunk_count = chunk_counts.get(asset.id, 0)
+            await db.execute(update(Asset).where(
+                Asset.project_id == project_id,
+                Asset.status != "completed"
+            ).values(chunk_count=0))
+            await db.execute(update(ProjectCounters).where(
+                ProjectCounters.project_id == project_id
+            ).values(
+                chunk_count=sum(asset.chunk_count for asset in assets),
+                updated_at=func.now()
+            ))
+
+            project.index_generation = generation
+            project.embedding_model = self._embedding_model()
+            await db.commit()
+            return True
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error switching index generation: {str(e)}")
+            raise
+
+    async def _collect_old_generations(
+        self,
+        db: AsyncSession,
+        project_id: int,
+        generation: int
+    ) -> None:
+        """
+        Delete chunks, parent windows and vectors of non-served generations.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            generation: Served generation (kept)
+        """
+        for model in (Chunk, ParentChunk):
+            await delete_in_batches(
+                db, model,
+                model.project_id == project_id,
+                model.generation != generation
+            )
+
+        if not self.vector_db.stores_embeddings_in_chunks:
+            # Every stale generation, not just the previous one: a crash
+            # before collection or quick successive switches leave several
+            for name in await self.vector_db.list_collections():
+                parsed = VectorDBInterface.parse_collection_name(name)
+                if parsed and parsed[0] == project_id and parsed[1] != generation:
+                    await self.vector_db.delete_collection(name)
+
+        logger.info(f"Collected old index generations of project {project_id}")
@@ -0,0 +1,317 @@
+"""
+Maintenance Controller.
+Finds and removes storage no project, document or index generation refers to.
+"""
+from typing import Optional, List, Dict, Any, Set, Tuple
+from pathlib import Path
+import asyncio
+from sqlalchemy import select, func, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.models import Project, Asset, Chunk, ParentChunk, IngestionJob
+from backend.database.bulk import delete_in_batches
+from backend.database.counters import recount_project_counters
+from backend.services.file_service import FileService
+from backend.services.document_loader import DocumentLoaderService
+from backend.providers.vectordb.factory import VectorDBProviderFactory
+from backend.providers.vectordb.interface import VectorDBInterface
+from backend.workers.job_queue import JobQueue
+from backend.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceController:
+    """
+    Controller for storage reconciliation.
+
+    Deletes normally clean up after themselves, but crashes between the
+    database commit and the file/vector cleanup, aborted uploads, loader
+    version bumps and interrupted reindexes leave orphans behind. A
+    reconciliation compares upload_dir, the chunk tables and the vector
+    collections against the live projects, assets and generations and
+    removes the difference in small, throttled batches.
+    """
+
+    def __init__(
+        self,
+        file_service: Optional[FileService] = None,
+        vector_db: Optional[VectorDBInterface] = None
+    ):
+        """
+        Initialize maintenance controller.
+
+        Args:
+            file_service: File service owning upload_dir
+            vector_db: Vector database provider
+        """
+        self.file_service = file_service or FileService()
+        self.vector_db = vector_db or VectorDBProviderFactory.create_provider()
+        self.job_queue = JobQueue()
+
+    async def reconcile(self, db: AsyncSession, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Find (and unless dry_run, remove) orphaned storage.
+
+        Args:
+            db: Database session
+            dry_run: Only report what would be removed
+
+        Returns:
+            Report with count and bytes per kind ("project_dirs", "files",
+            "extracted", "blobs", "chunks", "parent_chunks"), orphaned
+            collections and the total reclaimable bytes; unless dry_run,
+            also the number of project counters that had drifted
+        """
+        try:
+            served = dict((await db.execute(select(Project.id, Project.index_generation))).all())
+            building = await self._building_generations(db)
+
+            files = await self._scan_files(db, set(served))
+            generations = await self._scan_generations(db, served, building)
+            collections = await self._scan_collections(served, building)
+
+            report = {kind: {'count': 0, 'bytes': 0} for kind in (
+                "project_dirs", "files", "extracted", "blobs", "chunks", "parent_chunks"
+            )}
+            for kind, _, size in files:
+                report[kind]['count'] += 1
+                report[kind]['bytes'] += size
+            for kind, _, _, count, size in generations:
+                report[kind]['count'] += count
+                report[kind]['bytes'] += size
+            report['collections'] = {'count': len(collections), 'names': collections}
+            report['reclaimable_bytes'] = sum(
+                entry['bytes'] for entry in report.values() if 'bytes' in entry
+            )
+            report['dry_run'] = dry_run
+
+            if not dry_run:
+                await self._remove_generations(db, generations)
+                await self._remove_files(files)
+                await self._remove_collections(db, collections)
+                report['counters_corrected'] = await recount_project_counters(db)
+                logger.info(
+                    f"Storage reconciliation reclaimed {report['reclaimable_bytes']} bytes "
+                    f"and {len(collections)} collections"
+                )
+
+            return report
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error reconciling storage: {str(e)}")
+            raise
+
+    async def run_reconcile(self, db: AsyncSession, job: IngestionJob) -> None:
+        """
+        Run a reconciliation job, storing its report in the job payload.
+
+        Periodic jobs queue their successor once finished.
+
+        Args:
+            db: Database session
+            job: Reconcile job (payload may set 'dry_run' and 'periodic')
+        """
+        payload = dict(job.payload or {})
+        payload['report'] = await self.reconcile(db, dry_run=bool(payload.get('dry_run')))
+        await self.job_queue.update_payload(db, job.id, payload, job.locked_by)
+
+        if payload.get('periodic') and settings.storage_gc_interval_hours > 0:
+            await self.job_queue.enqueue(
+                db,
+                JobQueue.RECONCILE_STORAGE,
+                payload={'periodic': True},
+                delay_seconds=settings.storage_gc_interval_hours * 3600
+            )
+
+    async def start_reconcile(self, db: AsyncSession) -> IngestionJob:
+        """
+        Queue a one-off reconciliation.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Queued job
+
+        Raises:
+            ValueError: If a one-off reconciliation is already queued or running
+        """
+        pending = await self._pending_jobs(db)
+        running = next((job for job in pending if not (job.payload or {}).get('periodic')), None)
+        if running:
+            raise ValueError(f"Storage reconciliation already queued (job {running.id})")
+        return await self.job_queue.enqueue(db, JobQueue.RECONCILE_STORAGE)
+
+    async def schedule(self, db: AsyncSession) -> Optional[IngestionJob]:
+        """
+        Queue the periodic reconciliation unless it is already queued or running.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Queued job, or None if one already exists
+        """
+        pending = await self._pending_jobs(db)
+        if any((job.payload or {}).get('periodic') for job in pending):
+            return None
+        return await self.job_queue.enqueue(
+            db,
+            JobQueue.RECONCILE_STORAGE,
+            payload={'periodic': True},
+            delay_seconds=settings.storage_gc_interval_hours * 3600
+        )
+
+    async def _pending_jobs(self, db: AsyncSession) -> List[IngestionJob]:
+        """Queued or running reconcile jobs."""
+        stmt = select(IngestionJob).where(
+            IngestionJob.job_type == JobQueue.RECONCILE_STORAGE,
+            IngestionJob.status.in_(("queued", "running"))
+        )
+        return list((await db.execute(stmt)).scalars().all())
+
+    async def _building_generations(self, db: AsyncSession) -> Set[Tuple[int, int]]:
+        """(project_id, generation) of reindexes that are queued or running."""
+        stmt = select(IngestionJob.project_id, IngestionJob.payload).where(
+            IngestionJob.job_type == JobQueue.REINDEX_PROJECT,
+            IngestionJob.status.in_(("queued", "running"))
+        )
+        return {
+            (project_id, (payload or {}).get('generation'))
+            for project_id, payload in (await db.execute(stmt)).all()
+        }
+
+    async def _scan_files(self, db: AsyncSession, projects: Set[int]) -> List[Tuple[str, Path, int]]:
+        """Orphaned uploads, extracted-text artifacts, blobs and project directories."""
+        live_files = set()
+        live_extracted: Dict[int, Set[str]] = {}
+        rows = await db.execute(select(Asset.id, Asset.project_id, Asset.file_path, Asset.extra_metadata))
+        for asset_id, project_id, file_path, metadata in rows.all():
+            if file_path:
+                live_files.add(str(Path(file_path).resolve()))
+            sha256 = (metadata or {}).get('sha256')
+            if sha256:
+                name = FileService.extracted_text_name(sha256, DocumentLoaderService.LOADER_VERSION)
+                live_extracted.setdefault(project_id, set()).update((name, f"{name}.{asset_id}.part"))
+
+        return await asyncio.to_thread(
+            self.file_service.find_orphans,
+            projects,
+            live_files,
+            live_extracted,
+            settings.storage_gc_grace_seconds
+        )
+
+    async def _scan_generations(
+        self,
+        db: AsyncSession,
+        served: Dict[int, int],
+        building: Set[Tuple[int, int]]
+    ) -> List[Tuple[str, int, int, int, int]]:
+        """
+        (kind, project_id, generation, rows, bytes) of chunks in stale generations.
+
+        Only (project_id, generation) is read, which the
+        ix_*_project_generation indexes cover, so chunk content and
+        embeddings are never loaded. Bytes are estimated from the table's
+        total size and its share of stale rows.
+        """
+        live = [(project_id, generation) for project_id, generation in served.items()]
+        live += [(project_id, generation) for project_id, generation in building if generation is not None]
+
+        stale = []
+        for kind, model in (("chunks", Chunk), ("parent_chunks", ParentChunk)):
+            stmt = select(model.project_id, model.generation, func.count())
+            if live:
+                stmt = stmt.where(tuple_(model.project_id, model.generation).notin_(live))
+            rows = (await db.execute(stmt.group_by(model.project_id, model.generation))).all()
+            if not rows:
+                continue
+
+            bytes_per_row = await self._bytes_per_row(db, model.__tablename__, sum(count for _, _, count in rows))
+            for project_id, generation, count in rows:
+                stale.append((kind, project_id, generation, count, int(count * bytes_per_row)))
+        return stale
+
+    @staticmethod
+    async def _bytes_per_row(db: AsyncSession, table: str, min_rows: int) -> float:
+        """Average on-disk row size (with TOAST and indexes) from planner statistics."""
+        total_bytes, row_estimate = (await db.execute(
+            text(
+                "SELECT pg_total_relation_size(CAST(:table AS regclass)), reltuples "
+                "FROM pg_class WHERE oid = CAST(:table AS regclass)"
+            ),
+            {'table': table}
+        )).one()
+        # reltuples is -1 before the first ANALYZE and may lag behind inserts
+        return total_bytes / max(row_estimate, min_rows, 1)
+
+    async def _scan_collections(
+        self,
+        served: Dict[int, int],
+        building: Set[Tuple[int, int]]
+    ) -> List[str]:
+        """Vector collections of deleted projects or stale generations."""
+        stale = []
+        for name in await self.vector_db.list_collections():
+            parsed = VectorDBInterface.parse_collection_name(name)
+            if not parsed:
+                continue
+            project_id, generation = parsed
+            if served.get(project_id) == generation or (project_id, generation) in building:
+                continue
+            stale.append(name)
+        return sorted(stale)
+
+    async def _is_stale(self, db: AsyncSession, project_id: int, generation: int) -> bool:
+        """Re-check a generation right before deleting it (a reindex may have started)."""
+        served = await db.scalar(select(Project.index_generation).where(Project.id == project_id))
+        if served == generation:
+            return False
+        return (project_id, generation) not in await self._building_generations(db)
+
+    async def _throttle(self, _: int = 0) -> None:
+        """Pause between batches so reconciliation does not starve user traffic."""
+        await asyncio.sleep(settings.storage_gc_batch_delay_seconds)
+
+    async def _remove_generations(
+        self,
+        db: AsyncSession,
+        generations: List[Tuple[str, int, int, int, int]]
+    ) -> None:
+        """Delete the rows of stale generations in throttled batches."""
+        models = {"chunks": Chunk, "parent_chunks": ParentChunk}
+        for kind, project_id, generation, _, _ in generations:
+            if not await self._is_stale(db, project_id, generation):
+                continue
+            model = models[kind]
+            await delete_in_batches(
+                db, model,
+                model.project_id == project_id,
+                model.generation == generation,
+                batch_size=settings.storage_gc_batch_size,
+                on_batch=self._throttle
+            )
+
+    async def _remove_files(self, files: List[Tuple[str, Path, int]]) -> None:
+        """Delete orphaned paths in throttled batches off the event loop."""
+        paths = [path for _, path, _ in files]
+        batch_size = settings.storage_gc_batch_size
+        for start in range(0, len(paths), batch_size):
+            await asyncio.to_thread(FileService.remove_paths, paths[start:start + batch_size])
+            await self._throttle()
+
+        # Blobs only referenced by removed uploads
+        if paths:
+            await asyncio.to_thread(self.file_service.prune_blobs)
+
+    async def _remove_collections(self, db: AsyncSession, collections: List[str]) -> None:
+        """Drop orphaned vector collections."""
+        for name in collections:
+            project_id, generation = VectorDBInterface.parse_collection_name(name)
+            if not await self._is_stale(db, project_id, generation):
+                continue
+            await self.vector_db.delete_collection(name)
+            await self._throttle()
@@ -3,10 +3,15 @@ Project Controller.
 Business logic for project management.
 """
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from backend.database.models import Project, Asset, Chunk
+from backend.database.models import Project, Asset, Chunk, ParentChunk, ProjectCounters, IngestionJob
+from backend.database.bulk import delete_in_batches
 from backend.services.file_service import FileService
+from backend.providers.vectordb.factory import VectorDBProviderFactory
+from backend.providers.vectordb.interface import VectorDBInterface
+from backend.workers.job_queue import JobQueue
+from backend.config import settings
 from datetime import datetime
 import logging
 
@@ -19,6 +24,8 @@ class ProjectController:
     def __init__(self):
         """Initialize project controller."""
         self.file_service = FileService()
+        self.vector_db = VectorDBProviderFactory.create_provider()
+        self.job_queue = JobQueue()
     
     async def create_project(
         self,
@@ -47,6 +54,8 @@ class ProjectController:
             )
             
             db.add(project)
+            await db.flush()
+            db.add(ProjectCounters(project_id=project.id))
             await db.commit()
             await db.refresh(project)
             
@@ -162,37 +171,105 @@ class ProjectController:
         self,
         db: AsyncSession,
         project_id: int
-    ) -> bool:
+    ) -> Optional[Dict[str, Any]]:
         """
         Delete project and all associated data.
         
+        Projects with at least DELETE_BACKGROUND_MIN_CHUNKS chunks are
+        deleted by a background job instead.
+        
         Args:
             db: Database session
             project_id: Project ID
             
         Returns:
-            True if deleted successfully
+            None if not found, else dict with 'status' ("deleted" or
+            "deleting") and the background 'job_id'
+            
+        Raises:
+            ValueError: If the project is already being deleted
         """
         try:
-            # Delete files from storage
-            await self.file_service.delete_project_files(project_id)
+            project = await self.get_project(db, project_id)
+            if not project:
+                return None
             
-            # Delete from database (cascade will handle assets and chunks)
-            stmt = delete(Project).where(Project.id == project_id)
-            result = await db.execute(stmt)
-            await db.commit()
+            if (project.extra_metadata or {}).get('deleting_job_id'):
+                raise ValueError(f"Project {project_id} is already being deleted")
             
-            deleted = result.rowcount > 0
-            if deleted:
-                logger.info(f"Deleted project: {project_id}")
+            chunk_count = await db.scalar(select(func.count(Chunk.id)).where(Chunk.project_id == project_id))
+            if chunk_count >= settings.delete_background_min_chunks:
+                # Not tied to the project row, so the job outlives the project
+                job = await self.job_queue.enqueue(
+                    db,
+                    JobQueue.DELETE_PROJECT,
+                    payload={'project_id': project_id, 'chunks': chunk_count, 'deleted_chunks': 0}
+                )
+                project.extra_metadata = {**(project.extra_metadata or {}), 'deleting_job_id': job.id}
+                await db.commit()
+                logger.info(f"Queued deletion of project {project_id} ({chunk_count} chunks)")
+                return {'status': 'deleting', 'job_id': job.id}
             
-            return deleted
+            await self._delete_project(db, project)
+            return {'status': 'deleted', 'job_id': None}
             
         except Exception as e:
             await db.rollback()
             logger.error(f"Error deleting project: {str(e)}")
             raise
     
+    async def run_delete_project(self, db: AsyncSession, job: IngestionJob) -> None:
+        """
+        Background deletion of a large project.
+        
+        Args:
+            db: Database session
+            job: Deletion job (payload carries 'project_id'; progress is
+                 reported as 'deleted_chunks')
+        """
+        project = await self.get_project(db, job.payload['project_id'])
+        if not project:
+            return
+        
+        payload = dict(job.payload)
+        
+        async def report(deleted: int) -> None:
+            payload['deleted_chunks'] = deleted
+            await self.job_queue.update_payload(db, job.id, payload, job.locked_by)
+        
+        await self._delete_project(db, project, on_batch=report)
+    
+    async def _delete_project(self, db: AsyncSession, project: Project, on_batch: Any = None) -> None:
+        """
+        Remove a project with set-based statements.
+        
+        Chunks and parent windows are deleted in short batches; assets,
+        centroids, runs and jobs go with the project row through
+        ON DELETE CASCADE. External collections of every generation are
+        dropped, then the project's files.
+        
+        Args:
+            db: Database session
+            project: Project to delete
+            on_batch: Optional coroutine called with the deleted chunk count
+        """
+        project_id, last_generation = project.id, project.index_generation + 1
+        
+        await delete_in_batches(db, Chunk, Chunk.project_id == project_id, on_batch=on_batch)
+        await delete_in_batches(db, ParentChunk, ParentChunk.project_id == project_id)
+        await db.execute(delete(Project).where(Project.id == project_id))
+        await db.commit()
+        
+        # Served generation, older ones not yet collected and one being built
+        if not self.vector_db.stores_embeddings_in_chunks:
+            for generation in range(last_generation + 1):
+                collection_name = VectorDBInterface.collection_name(project_id, generation)
+                if await self.vector_db.collection_exists(collection_name):
+                    await self.vector_db.delete_collection(collection_name)
+        
+        await self.file_service.delete_project_files(project_id)
+        logger.info(f"Deleted project: {project_id}")
+    
     async def get_project_stats(
         self,
         db: AsyncSession,
@@ -201,6 +278,10 @@ class ProjectController:
         """
         Get project statistics.
         
+        Document totals are one aggregate over the project's assets; the
+        served chunk count comes from its counters instead of counting
+        (possibly millions of) chunk rows.
+        
         Args:
             db: Database session
             project_id: Project ID
@@ -209,23 +290,34 @@ class ProjectController:
             Statistics dictionary
         """
         try:
-            # Get asset count
-            asset_stmt = select(Asset).where(Asset.project_id == project_id)
-            asset_result = await db.execute(asset_stmt)
-            assets = asset_result.scalars().all()
+            status_stmt = select(
+                func.count(Asset.id).label('asset_count'),
+                func.coalesce(func.sum(Asset.file_size), 0).label('total_size'),
+                func.count(Asset.id).filter(Asset.status == 'completed').label('completed_assets'),
+                func.count(Asset.id).filter(Asset.status == 'processing').label('processing_assets'),
+                func.count(Asset.id).filter(Asset.status == 'failed').label('failed_assets')
+            ).where(Asset.project_id == project_id)
+            statuses = (await db.execute(status_stmt)).one()
             
-            # Get chunk count
-            chunk_stmt = select(Chunk).where(Chunk.project_id == project_id)
-            chunk_result = await db.execute(chunk_stmt)
-            chunks = chunk_result.scalars().all()
+            counters = await db.get(ProjectCounters, project_id)
+            if counters:
+                chunk_count = counters.chunk_count
+            else:
+                # Served index generation only
+                chunk_count = await db.scalar(
+                    select(func.count(Chunk.id)).join(Project, Project.id == Chunk.project_id).where(
+                        Chunk.project_id == project_id,
+                        Chunk.generation == Project.index_generation
+                    )
+                )
             
             return {
-                'asset_count': len(assets),
-                'chunk_count': len(chunks),
-                'total_size': sum(a.file_size for a in assets),
-                'completed_assets': sum(1 for a in assets if a.status == 'completed'),
-                'processing_assets': sum(1 for a in assets if a.status == 'processing'),
-                'failed_assets': sum(1 for a in assets if a.status == 'failed')
+                'asset_count': statuses.asset_count,
+                'chunk_count': chunk_count or 0,
+                'total_size': statuses.total_size,
+                'completed_assets': statuses.completed_assets,
+                'processing_assets': statuses.processing_assets,
+                'failed_assets': statuses.failed_assets
             }
             
         except Exception as e:
@@ -6,6 +6,7 @@ from typing import Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.services.query_service import QueryService
 from backend.services.answer_service import AnswerService
+from backend.services.context_compressor import ContextCompressorService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,7 @@ class QueryController:
         """Initialize query controller."""
         self.query_service = QueryService()
         self.answer_service = AnswerService()
+        self.context_compressor = ContextCompressorService()
     
     async def answer_query(
         self,
@@ -26,7 +28,9 @@ class QueryController:
         query: str,
         top_k: int = 5,
         language: str = "ar",
-        asset_id: Optional[int] = None
+        asset_id: Optional[int] = None,
+        compress: bool = False,
+        mmr_lambda: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Process query and generate answer.
@@ -38,6 +42,8 @@ class QueryController:
             top_k: Number of chunks to retrieve
             language: Response language ('ar' or 'en')
             asset_id: Optional specific document to search
+            compress: Keep only query-relevant sentences before generation
+            mmr_lambda: Optional MMR relevance/diversity trade-off
             
         Returns:
             Dictionary with answer and metadata
@@ -50,7 +56,8 @@ class QueryController:
                 query=query,
                 project_id=project_id,
                 top_k=top_k,
-                asset_id=asset_id
+                asset_id=asset_id,
+                mmr_lambda=mmr_lambda
             )
             
             if not similar_chunks:
@@ -61,14 +68,29 @@ class QueryController:
                     'context_used': 0
                 }
             
+            # Search runs on small chunks; answer from their parent windows
+            context_chunks = await self.answer_service.expand_to_parents(db, similar_chunks)
+            
+            original_chunks = context_chunks
+            compression_stats = None
+            if compress:
+                context_chunks, compression_stats = self.context_compressor.compress(
+                    query=query,
+                    chunks=context_chunks
+                )
+            
             # Generate answer
             result = await self.answer_service.generate_answer(
                 query=query,
-                context_chunks=similar_chunks,
+                context_chunks=context_chunks,
                 language=language,
-                include_sources=True
+                include_sources=True,
+                original_chunks=original_chunks
             )
             
+            if compression_stats:
+                result['metadata']['compression'] = compression_stats
+            
             logger.info(f"Generated answer for query (used {result['context_used']} chunks)")
             return result
             
@@ -1,15 +1,29 @@
 """Database package initialization."""
-from backend.database.models import Base, Project, Asset, Chunk
-from backend.database.connection import engine, async_session_maker, get_db, init_db, close_db
+from backend.database.models import (
+    Base, Project, Asset, Chunk, ParentChunk, AssetCentroid, ProjectCounters, IngestionJob, IngestionRun
+)
+from backend.database.connection import engine, async_session_maker, get_db, init_db, close_db, get_pool_stats
+from backend.database.bulk import bulk_insert_chunks, delete_in_batches
+from backend.database.counters import adjust_project_counters, recount_project_counters
 
 __all__ = [
     "Base",
     "Project",
     "Asset",
     "Chunk",
+    "ParentChunk",
+    "AssetCentroid",
+    "ProjectCounters",
+    "IngestionJob",
+    "IngestionRun",
     "engine",
     "async_session_maker",
     "get_db",
     "init_db",
-    "close_db"
+    "close_db",
+    "get_pool_stats",
+    "bulk_insert_chunks",
+    "delete_in_batches",
+    "adjust_project_counters",
+    "recount_project_counters"
 ]
@@ -0,0 +1,84 @@
+"""
+Bulk Write Helpers.
+Set-based inserts and deletes for high-volume tables.
+"""
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+from sqlalchemy import insert, select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.models import Chunk
+
+# Rows per multi-row INSERT ... VALUES statement
+CHUNK_INSERT_BATCH_SIZE = 1000
+
+# Rows per DELETE statement (and transaction) of a batched delete
+DELETE_BATCH_SIZE = 5000
+
+
+async def bulk_insert_chunks(
+    db: AsyncSession,
+    rows: List[Dict[str, Any]],
+    batch_size: int = CHUNK_INSERT_BATCH_SIZE
+) -> List[int]:
+    """
+    Insert chunk rows with multi-row INSERT ... RETURNING id statements.
+    
+    Replaces adding ORM objects one by one and refreshing each to learn
+    its ID (N + 1 round trips) with one statement per batch.
+    
+    Args:
+        db: Database session (not committed)
+        rows: Dictionaries with project_id, asset_id, content, chunk_index,
+              extra_metadata and optionally embedding
+        batch_size: Rows per statement
+        
+    Returns:
+        IDs of the inserted chunks, in input order
+    """
+    if not rows:
+        return []
+    
+    # Every row needs the same keys to share one statement
+    rows = [{'embedding': None, **row} for row in rows]
+    stmt = insert(Chunk).returning(Chunk.id, sort_by_parameter_order=True)
+    
+    ids: List[int] = []
+    for start in range(0, len(rows), batch_size):
+        result = await db.execute(stmt, rows[start:start + batch_size])
+        ids.extend(result.scalars().all())
+    return ids
+
+
+async def delete_in_batches(
+    db: AsyncSession,
+    model: Any,
+    *criteria: Any,
+    batch_size: int = DELETE_BATCH_SIZE,
+    on_batch: Optional[Callable[[int], Awaitable[None]]] = None
+) -> int:
+    """
+    Delete matching rows with one short transaction per batch.
+    
+    Keeps lock time and WAL per transaction bounded when removing
+    hundreds of thousands of rows, instead of one long DELETE (or an ORM
+    delete that loads every row first).
+    
+    Args:
+        db: Database session (committed after every batch)
+        model: Mapped class with an integer 'id' primary key
+        *criteria: WHERE clauses selecting the rows
+        batch_size: Rows per statement
+        on_batch: Optional coroutine called with the running total after each batch
+        
+    Returns:
+        Number of deleted rows
+    """
+    total = 0
+    while True:
+        batch = select(model.id).where(*criteria).limit(batch_size).scalar_subquery()
+        result = await db.execute(delete(model).where(model.id.in_(batch)))
+        await db.commit()
+        total += result.rowcount
+        if on_batch:
+            await on_batch(total)
+        if result.rowcount < batch_size:
+            return total
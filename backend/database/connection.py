@@ -2,20 +2,65 @@
 Database connection management with async SQLAlchemy.
 Provides engine and session factory.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine, async_sessionmaker
 from sqlalchemy.pool import NullPool
+from backend.database.pool import MeteredQueuePool, pool_metrics
 from backend.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def create_engine(
+    database_url: Optional[str] = None,
+    pool_size: Optional[int] = None
+) -> AsyncEngine:
+    """
+    Create an async engine with the configured connection pool.
+
+    Args:
+        database_url: Database URL (defaults to settings)
+        pool_size: Persistent connections (defaults to settings; 0 opens a
+                   new connection for every session)
+
+    Returns:
+        Async engine reporting to pool_metrics
+    """
+    database_url = database_url or settings.database_url
+    pool_size = settings.db_pool_size if pool_size is None else pool_size
+
+    options = {}
+    if pool_size > 0:
+        options.update(
+            poolclass=MeteredQueuePool,
+            pool_size=pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping
+        )
+    else:
+        options['poolclass'] = NullPool
+
+    if database_url.startswith("postgresql+asyncpg"):
+        # SQLAlchemy's per-connection cache of asyncpg prepared statements
+        options['connect_args'] = {'prepared_statement_cache_size': settings.db_statement_cache_size}
+
+    new_engine = create_async_engine(
+        database_url,
+        echo=False,  # Set to True for SQL query logging
+        future=True,
+        **options
+    )
+    event.listen(new_engine.sync_engine, "connect", lambda *_: pool_metrics.record_connect())
+    event.listen(new_engine.sync_engine, "invalidate", lambda *_: pool_metrics.record_invalidation())
+    return new_engine
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,  # Set to True for SQL query logging
-    poolclass=NullPool,  # Use NullPool for async or configure pool
-    future=True
-)
+engine = create_engine()
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -44,27 +89,32 @@ async def get_db() -> AsyncSession:
 
 
 async def init_db():
-    """Initialize database - create tables if they don't exist."""
-    from backend.database.models import Base
+    """Initialize database - enable pgvector and apply schema migrations."""
+    from backend.database.migrations import run_migrations
     from sqlalchemy import text
     try:
         async with engine.begin() as conn:
             # Enable pgvector extension
             await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-            
-            # Create all tables
-            await conn.run_sync(Base.metadata.create_all)
-            logger.info("Database initialized successfully with pgvector")
+            logger.info("pgvector extension enabled")
     except Exception as e:
         logger.warning(f"Could not initialize pgvector extension: {str(e)}")
-        logger.info("Attempting to initialize other tables...")
-        try:
-            async with engine.begin() as conn:
-                # Try to create tables one by one or skip those that fail
-                await conn.run_sync(Base.metadata.create_all)
-                logger.info("Database tables initialized (some might have failed)")
-        except Exception as e2:
-            logger.error(f"Failed to initialize database tables: {str(e2)}")
+    
+    if not settings.db_auto_migrate:
+        logger.info("Automatic migrations disabled (run: python -m backend.database.migrations)")
+        return
+    
+    try:
+        await run_migrations()
+        logger.info("Database initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to migrate database schema: {str(e)}")
+        raise
+
+
+def get_pool_stats() -> dict:
+    """Checkout latency and utilization of the engine's connection pool."""
+    return pool_metrics.snapshot(engine.sync_engine.pool)
 
 
 async def close_db():
@@ -0,0 +1,106 @@
+"""
+Project counters.
+Incremental maintenance and repair of the per-project totals in project_counters.
+"""
+from typing import Optional
+from sqlalchemy import select, update, insert, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.models import Project, Asset, Chunk, ProjectCounters
+
+
+async def adjust_project_counters(
+    db: AsyncSession,
+    project_id: int,
+    assets: int = 0,
+    size: int = 0,
+    chunks: int = 0
+) -> None:
+    """
+    Add deltas to a project's counters.
+
+    A single UPDATE ... SET x = x + delta, so concurrent writers never lose
+    an increment. Not committed: call it in the transaction that makes the
+    change it accounts for.
+
+    Args:
+        db: Database session
+        project_id: Project ID
+        assets: Change in document count
+        size: Change in total file size (bytes)
+        chunks: Change in served chunk count
+    """
+    if not (assets or size or chunks):
+        return
+    await db.execute(
+        update(ProjectCounters)
+        .where(ProjectCounters.project_id == project_id)
+        .values(
+            asset_count=ProjectCounters.asset_count + assets,
+            total_size=ProjectCounters.total_size + size,
+            chunk_count=ProjectCounters.chunk_count + chunks,
+            updated_at=func.now()
+        )
+    )
+
+
+async def recount_project_counters(db: AsyncSession, project_id: Optional[int] = None) -> int:
+    """
+    Recompute documents' served chunk counts and the project counters.
+
+    Repairs drift (and creates missing counter rows) with set-based
+    statements. Documents being processed or deleted keep their counts,
+    which their run updates when it ends.
+
+    Args:
+        db: Database session (committed)
+        project_id: Only this project (defaults to all)
+
+    Returns:
+        Number of counter rows corrected (missing rows are created first)
+    """
+    served_generation = select(Project.index_generation).where(
+        Project.id == Asset.project_id
+    ).scalar_subquery()
+    served_chunks = select(func.count(Chunk.id)).where(
+        Chunk.asset_id == Asset.id,
+        Chunk.generation == served_generation
+    ).scalar_subquery()
+    stmt = update(Asset).where(
+        Asset.status.notin_(("processing", "deleting")),
+        Asset.chunk_count != served_chunks
+    ).values(chunk_count=served_chunks)
+    if project_id is not None:
+        stmt = stmt.where(Asset.project_id == project_id)
+    await db.execute(stmt, execution_options={'synchronize_session': False})
+
+    missing = select(Project.id).where(
+        ~select(ProjectCounters.project_id).where(ProjectCounters.project_id == Project.id).exists()
+    )
+    if project_id is not None:
+        missing = missing.where(Project.id == project_id)
+    await db.execute(insert(ProjectCounters).from_select(['project_id'], missing))
+
+    def total(column):
+        return select(func.coalesce(column, 0)).where(
+            Asset.project_id == ProjectCounters.project_id
+        ).scalar_subquery()
+
+    asset_count = total(func.count(Asset.id))
+    total_size = total(func.sum(Asset.file_size))
+    chunk_count = total(func.sum(Asset.chunk_count))
+    stmt = update(ProjectCounters).where(or_(
+        ProjectCounters.asset_count != asset_count,
+        ProjectCounters.total_size != total_size,
+        ProjectCounters.chunk_count != chunk_count
+    )).values(
+        asset_count=asset_count,
+        total_size=total_size,
+        chunk_count=chunk_count,
+        updated_at=func.now()
+    )
+    if project_id is not None:
+        stmt = stmt.where(ProjectCounters.project_id == project_id)
+    corrected = await db.execute(stmt, execution_options={'synchronize_session': False})
+
+    await db.commit()
+    return max(corrected.rowcount, 0)
@@ -0,0 +1,101 @@
+"""
+Schema migrations.
+Applies the Alembic migrations in backend/migrations at startup or from the
+command line:
+
+    python -m backend.database.migrations [upgrade [revision] | current | history]
+"""
+from pathlib import Path
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+import logging
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+# Serializes migrations of API and worker processes starting together
+MIGRATION_LOCK_ID = 734_112_901
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """
+    Alembic configuration for the project's migrations.
+
+    Args:
+        connection: Connection migrations run on (a new one is opened from
+                    DATABASE_URL if omitted)
+
+    Returns:
+        Alembic Config
+    """
+    config = Config(str(ALEMBIC_INI))
+    if connection is not None:
+        config.attributes["connection"] = connection
+        # Keep the application's logging setup
+        config.attributes["configure_logger"] = False
+    return config
+
+
+def upgrade_database(connection: Connection, revision: str = "head") -> None:
+    """
+    Upgrade the schema on a synchronous connection (use AsyncConnection.run_sync).
+
+    Args:
+        connection: Database connection
+        revision: Target revision
+    """
+    postgres = connection.dialect.name == "postgresql"
+    if postgres:
+        connection.execute(text("SELECT pg_advisory_lock(:id)"), {'id': MIGRATION_LOCK_ID})
+    # Migrations manage their own transactions (indexes are built outside one)
+    connection.commit()
+    try:
+        command.upgrade(alembic_config(connection), revision)
+    finally:
+        if postgres:
+            connection.execute(text("SELECT pg_advisory_unlock(:id)"), {'id': MIGRATION_LOCK_ID})
+            connection.commit()
+
+
+async def run_migrations(revision: str = "head") -> None:
+    """
+    Upgrade the application database to a revision.
+
+    Args:
+        revision: Target revision
+    """
+    from backend.database.connection import engine
+
+    async with engine.connect() as conn:
+        await conn.run_sync(upgrade_database, revision)
+    logger.info(f"Database schema upgraded to {revision}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="RAGMind schema migrations")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "current", "history"])
+    parser.add_argument("revision", nargs="?", default="head", help="Target revision for upgrade")
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        async def upgrade() -> None:
+            from backend.database.connection import close_db
+            try:
+                await run_migrations(args.revision)
+            finally:
+                await close_db()
+
+        asyncio.run(upgrade())
+    elif args.command == "current":
+        command.current(alembic_config(), verbose=True)
+    else:
+        command.history(alembic_config())
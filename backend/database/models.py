@@ -2,7 +2,7 @@
 Database models using SQLAlchemy async ORM.
 Defines tables for projects, assets, and chunks with vector embeddings.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, JSON, LargeBinary
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Float, JSON, LargeBinary, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -22,6 +22,11 @@ class Project(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Index generation served to queries (see reindexing)
+    index_generation = Column(Integer, default=0, server_default="0", nullable=False)
+    # Embedding model of the served generation (queries are embedded with it)
+    embedding_model = Column(String(255), nullable=True)
+    
     # Metadata (renamed to avoid conflict with SQLAlchemy metadata)
     extra_metadata = Column("metadata", JSON, default={})
     
@@ -51,6 +56,9 @@ class Asset(Base):
     status = Column(String(50), default="uploaded")  # uploaded, processing, completed, failed
     error_message = Column(Text, nullable=True)
     
+    # Chunks in the project's served index generation (set when processing ends)
+    chunk_count = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_at = Column(DateTime(timezone=True), nullable=True)
@@ -61,6 +69,13 @@ class Asset(Base):
     # Relationships
     project = relationship("Project", back_populates="assets")
     chunks = relationship("Chunk", back_populates="asset", cascade="all, delete-orphan")
+    parent_chunks = relationship("ParentChunk", back_populates="asset", cascade="all, delete-orphan")
+    centroid = relationship("AssetCentroid", back_populates="asset", cascade="all, delete-orphan", uselist=False)
+    
+    __table_args__ = (
+        Index("ix_assets_project_created", "project_id", "created_at"),
+        Index("ix_assets_sha256", text("(metadata->>'sha256')")),
+    )
     
     def __repr__(self):
         return f"<Asset(id={self.id}, filename='{self.filename}', status='{self.status}')>"
@@ -78,9 +93,16 @@ class Chunk(Base):
     content = Column(Text, nullable=False)
     chunk_index = Column(Integer, nullable=False)  # Position in document
     
+    # Index generation (a reindex builds the next one alongside the served one)
+    generation = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Vector embedding (stored as JSON/List for compatibility if pgvector is missing)
     # Vector search is handled by Qdrant if pgvector is not available
     embedding = Column(JSON, nullable=True)
+    # Model and dimension that produced the embedding (vectors of different
+    # models are not comparable)
+    embedding_model = Column(String(255), nullable=True)
+    embedding_dimension = Column(Integer, nullable=True)
     
     # Metadata (renamed to avoid conflict)
     extra_metadata = Column("metadata", JSON, default={})  # page_number, section, etc.
@@ -92,5 +114,172 @@ class Chunk(Base):
     project = relationship("Project", back_populates="chunks")
     asset = relationship("Asset", back_populates="chunks")
     
+    __table_args__ = (
+        Index("ix_chunks_project_generation", "project_id", "generation"),
+        Index("ix_chunks_project_asset_index", "project_id", "asset_id", "chunk_index"),
+        Index("ix_chunks_asset_generation", "asset_id", "generation"),
+    )
+    
     def __repr__(self):
         return f"<Chunk(id={self.id}, asset_id={self.asset_id}, chunk_index={self.chunk_index})>"
+
+
+class ParentChunk(Base):
+    """Parent window model for small-to-big retrieval.
+    
+    Child chunks are embedded and searched; the parent window they belong to
+    (linked via the child's metadata 'parent_id') is sent to the LLM.
+    """
+    __tablename__ = "parent_chunks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    asset_id = Column(Integer, ForeignKey("assets.id", ondelete="CASCADE"), nullable=False)
+    
+    # Content
+    content = Column(Text, nullable=False)
+    parent_index = Column(Integer, nullable=False)  # Position in document
+    generation = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Metadata (renamed to avoid conflict)
+    extra_metadata = Column("metadata", JSON, default={})
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    asset = relationship("Asset", back_populates="parent_chunks")
+    
+    __table_args__ = (
+        Index("ix_parent_chunks_project_generation", "project_id", "generation"),
+        Index("ix_parent_chunks_asset_generation", "asset_id", "generation"),
+    )
+    
+    def __repr__(self):
+        return f"<ParentChunk(id={self.id}, asset_id={self.asset_id}, parent_index={self.parent_index})>"
+
+
+class AssetCentroid(Base):
+    """Per-asset summary vector (normalized mean of chunk embeddings).
+    
+    Used by two-stage retrieval to pick candidate documents before
+    searching their chunks.
+    """
+    __tablename__ = "asset_centroids"
+    
+    asset_id = Column(Integer, ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Centroid vector (JSON for the same compatibility reasons as Chunk.embedding)
+    embedding = Column(JSON, nullable=False)
+    chunk_count = Column(Integer, nullable=False)
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    asset = relationship("Asset", back_populates="centroid")
+    
+    def __repr__(self):
+        return f"<AssetCentroid(asset_id={self.asset_id}, chunk_count={self.chunk_count})>"
+
+
+class ProjectCounters(Base):
+    """Per-project totals maintained incrementally by ingestion and deletion.
+    
+    Lets stats endpoints read documents, bytes and served chunks in
+    constant time instead of counting rows; the storage reconciliation job
+    recomputes them to repair any drift.
+    """
+    __tablename__ = "project_counters"
+    
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    asset_count = Column(Integer, default=0, server_default="0", nullable=False)
+    total_size = Column(BigInteger, default=0, server_default="0", nullable=False)
+    chunk_count = Column(BigInteger, default=0, server_default="0", nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ProjectCounters(project_id={self.project_id}, assets={self.asset_count}, chunks={self.chunk_count})>"
+
+
+class IngestionJob(Base):
+    """Durable background job (document processing and other ingestion work).
+    
+    Jobs are claimed by workers with SELECT ... FOR UPDATE SKIP LOCKED, so any
+    number of worker processes can share the same table.
+    """
+    __tablename__ = "ingestion_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(50), nullable=False)  # process_document, ...
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=True)
+    asset_id = Column(Integer, ForeignKey("assets.id", ondelete="CASCADE"), nullable=True)
+    payload = Column(JSON, default={})
+    
+    # Status
+    status = Column(String(50), default="queued")  # queued, running, completed, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    last_error = Column(Text, nullable=True)
+    
+    # Scheduling and locking
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(String(255), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index("ix_ingestion_jobs_status_run_after", "status", "run_after"),
+        Index("ix_ingestion_jobs_project_type", "project_id", "job_type"),
+        Index("ix_ingestion_jobs_asset_id", "asset_id"),
+    )
+    
+    def __repr__(self):
+        return f"<IngestionJob(id={self.id}, job_type='{self.job_type}', status='{self.status}')>"
+
+
+class IngestionRun(Base):
+    """Timings and counters of one document processing run.
+    
+    Kept after the asset is deleted (asset_id is cleared) so project
+    throughput history stays complete.
+    """
+    __tablename__ = "ingestion_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    asset_id = Column(Integer, ForeignKey("assets.id", ondelete="SET NULL"), nullable=True)
+    status = Column(String(50), nullable=False)  # completed, failed
+    error_message = Column(Text, nullable=True)
+    
+    # Volume
+    file_bytes = Column(Integer, default=0)
+    pages = Column(Integer, default=0)
+    characters = Column(Integer, default=0)
+    chunks = Column(Integer, default=0)
+    kept = Column(Integer, default=0)  # chunks re-used with their embedding
+    embedded = Column(Integer, default=0)
+    removed = Column(Integer, default=0)
+    embedding_requests = Column(Integer, default=0)
+    embedding_retries = Column(Integer, default=0)
+    
+    # Timing (stage_seconds: extract, chunk, vector_lookup, embed, db_write, vector_write)
+    duration_seconds = Column(Float, default=0.0)
+    stage_seconds = Column(JSON, default={})
+    
+    # Timestamps
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_ingestion_runs_project_started", "project_id", "started_at"),
+        Index("ix_ingestion_runs_asset_id", "asset_id"),
+    )
+    
+    def __repr__(self):
+        return f"<IngestionRun(id={self.id}, asset_id={self.asset_id}, status='{self.status}')>"
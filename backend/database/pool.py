@@ -0,0 +1,129 @@
+"""
+Connection pool instrumentation.
+Checkout latency and utilization of the async engine's connection pool.
+"""
+from typing import Dict, Any, Optional
+from collections import deque
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+class PoolMetrics:
+    """Process-wide counters of connection checkouts."""
+
+    # Checkouts kept for percentiles
+    WINDOW = 1000
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.peak_checked_out = 0
+            self._recent = deque(maxlen=self.WINDOW)
+
+    def record_checkout(self, seconds: float, checked_out: int = 0, timed_out: bool = False) -> None:
+        """
+        Record a checkout attempt.
+
+        Args:
+            seconds: Time spent waiting for (or opening) a connection
+            checked_out: Connections in use after the checkout
+            timed_out: Whether the pool timeout expired
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self._recent.append(seconds)
+
+    def record_connect(self) -> None:
+        """Record a new DBAPI connection."""
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        """Record a connection discarded as broken or stale."""
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        """
+        Current metrics, with the pool's occupancy if it is a metered queue pool.
+
+        Args:
+            pool: Engine pool to report on
+
+        Returns:
+            Dict of counters, checkout wait statistics (ms) and utilization
+        """
+        with self._lock:
+            recent = sorted(self._recent)
+            attempts = self.checkouts + self.timeouts
+            stats = {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'peak_checked_out': self.peak_checked_out,
+                'wait_ms_avg': round(self.wait_seconds_total / attempts * 1000, 3) if attempts else 0.0,
+                'wait_ms_p50': round(self._percentile(recent, 0.50) * 1000, 3),
+                'wait_ms_p95': round(self._percentile(recent, 0.95) * 1000, 3),
+                'wait_ms_max': round(self.wait_seconds_max * 1000, 3)
+            }
+
+        if isinstance(pool, MeteredQueuePool):
+            capacity = pool.size() + max(pool.max_overflow, 0)
+            stats.update({
+                'pool_size': pool.size(),
+                'max_overflow': pool.max_overflow,
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'utilization': round(pool.checkedout() / capacity, 3) if capacity else 0.0
+            })
+        return stats
+
+    @staticmethod
+    def _percentile(values: list, fraction: float) -> float:
+        """Nearest-rank percentile of sorted values."""
+        if not values:
+            return 0.0
+        return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waits."""
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        """Create the pool, keeping the configured overflow for reporting."""
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        self.max_overflow = max_overflow
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - start, checked_out=self.checkedout())
+        return connection
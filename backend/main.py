@@ -16,7 +16,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 from backend.database import init_db, close_db
-from backend.routes import projects, documents, query, health, stats, bot_config
+from backend.routes import projects, documents, query, health, stats, bot_config, jobs, maintenance
+from backend.workers.ingestion_worker import IngestionWorkerPool
+from backend.services.parser_pool import ParserPool
 
 
 @asynccontextmanager
@@ -31,10 +33,22 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
     
+    # Start parser processes before the first upload arrives
+    await ParserPool.get_instance().warm()
+    
+    # Start in-process ingestion workers
+    worker_pool = None
+    if settings.ingestion_workers > 0:
+        worker_pool = IngestionWorkerPool()
+        await worker_pool.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down RAGMind API...")
+    if worker_pool:
+        await worker_pool.stop()
+    ParserPool.get_instance().shutdown()
     await close_db()
     logger.info("Database connections closed")
 
@@ -78,6 +92,8 @@ app.include_router(documents.router)
 app.include_router(query.router)
 app.include_router(stats.router)
 app.include_router(bot_config.router)
+app.include_router(jobs.router)
+app.include_router(maintenance.router)
 
 
 if __name__ == "__main__":
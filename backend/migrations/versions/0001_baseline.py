@@ -0,0 +1,164 @@
+"""Baseline schema
+
+Creates the tables that Base.metadata.create_all used to create at
+startup. Tables that already exist (databases created before migrations)
+are left untouched; 0002 brings their columns up to date.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing(table: str) -> bool:
+    return not sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if _missing("projects"):
+        op.create_table(
+            "projects",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("index_generation", sa.Integer(), server_default="0", nullable=False),
+            sa.Column("embedding_model", sa.String(255), nullable=True),
+            sa.Column("metadata", sa.JSON(), nullable=True)
+        )
+        op.create_index("ix_projects_id", "projects", ["id"])
+        op.create_index("ix_projects_name", "projects", ["name"])
+
+    if _missing("assets"):
+        op.create_table(
+            "assets",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("filename", sa.String(500), nullable=False),
+            sa.Column("original_filename", sa.String(500), nullable=False),
+            sa.Column("file_path", sa.String(1000), nullable=False),
+            sa.Column("file_size", sa.Integer(), nullable=False),
+            sa.Column("file_type", sa.String(50), nullable=False),
+            sa.Column("status", sa.String(50), nullable=True),
+            sa.Column("error_message", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("metadata", sa.JSON(), nullable=True)
+        )
+        op.create_index("ix_assets_id", "assets", ["id"])
+
+    if _missing("chunks"):
+        op.create_table(
+            "chunks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("asset_id", sa.Integer(), sa.ForeignKey("assets.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("chunk_index", sa.Integer(), nullable=False),
+            sa.Column("generation", sa.Integer(), server_default="0", nullable=False),
+            sa.Column("embedding", sa.JSON(), nullable=True),
+            sa.Column("embedding_model", sa.String(255), nullable=True),
+            sa.Column("embedding_dimension", sa.Integer(), nullable=True),
+            sa.Column("metadata", sa.JSON(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now())
+        )
+        op.create_index("ix_chunks_id", "chunks", ["id"])
+        op.create_index("ix_chunks_project_generation", "chunks", ["project_id", "generation"])
+
+    if _missing("parent_chunks"):
+        op.create_table(
+            "parent_chunks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("asset_id", sa.Integer(), sa.ForeignKey("assets.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("parent_index", sa.Integer(), nullable=False),
+            sa.Column("generation", sa.Integer(), server_default="0", nullable=False),
+            sa.Column("metadata", sa.JSON(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now())
+        )
+        op.create_index("ix_parent_chunks_id", "parent_chunks", ["id"])
+
+    if _missing("asset_centroids"):
+        op.create_table(
+            "asset_centroids",
+            sa.Column("asset_id", sa.Integer(), sa.ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("embedding", sa.JSON(), nullable=False),
+            sa.Column("chunk_count", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now())
+        )
+        op.create_index("ix_asset_centroids_project_id", "asset_centroids", ["project_id"])
+
+    if _missing("ingestion_jobs"):
+        op.create_table(
+            "ingestion_jobs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("job_type", sa.String(50), nullable=False),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=True),
+            sa.Column("asset_id", sa.Integer(), sa.ForeignKey("assets.id", ondelete="CASCADE"), nullable=True),
+            sa.Column("payload", sa.JSON(), nullable=True),
+            sa.Column("status", sa.String(50), nullable=True),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("max_attempts", sa.Integer(), nullable=False),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("run_after", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("locked_by", sa.String(255), nullable=True),
+            sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True)
+        )
+        op.create_index("ix_ingestion_jobs_id", "ingestion_jobs", ["id"])
+        op.create_index("ix_ingestion_jobs_status_run_after", "ingestion_jobs", ["status", "run_after"])
+
+    if _missing("ingestion_runs"):
+        op.create_table(
+            "ingestion_runs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("asset_id", sa.Integer(), sa.ForeignKey("assets.id", ondelete="SET NULL"), nullable=True),
+            sa.Column("status", sa.String(50), nullable=False),
+            sa.Column("error_message", sa.Text(), nullable=True),
+            sa.Column("file_bytes", sa.Integer(), nullable=True),
+            sa.Column("pages", sa.Integer(), nullable=True),
+            sa.Column("characters", sa.Integer(), nullable=True),
+            sa.Column("chunks", sa.Integer(), nullable=True),
+            sa.Column("kept", sa.Integer(), nullable=True),
+            sa.Column("embedded", sa.Integer(), nullable=True),
+            sa.Column("removed", sa.Integer(), nullable=True),
+            sa.Column("embedding_requests", sa.Integer(), nullable=True),
+            sa.Column("embedding_retries", sa.Integer(), nullable=True),
+            sa.Column("duration_seconds", sa.Float(), nullable=True),
+            sa.Column("stage_seconds", sa.JSON(), nullable=True),
+            sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("finished_at", sa.DateTime(timezone=True), server_default=sa.func.now())
+        )
+        op.create_index("ix_ingestion_runs_id", "ingestion_runs", ["id"])
+        op.create_index("ix_ingestion_runs_project_started", "ingestion_runs", ["project_id", "started_at"])
+
+
+def downgrade() -> None:
+    for table in (
+        "ingestion_runs",
+        "ingestion_jobs",
+        "asset_centroids",
+        "parent_chunks",
+        "chunks",
+        "assets",
+        "projects"
+    ):
+        op.drop_table(table)
@@ -0,0 +1,69 @@
+"""Index generations and embedding model tags
+
+Brings databases created before migrations up to date: adds the
+generation and embedding model columns (previously ALTERed at startup)
+and tags existing vectors with the model that produced them. A no-op on
+databases created by 0001.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ("projects", sa.Column("index_generation", sa.Integer(), server_default="0", nullable=False)),
+    ("projects", sa.Column("embedding_model", sa.String(255), nullable=True)),
+    ("chunks", sa.Column("generation", sa.Integer(), server_default="0", nullable=False)),
+    ("chunks", sa.Column("embedding_model", sa.String(255), nullable=True)),
+    ("chunks", sa.Column("embedding_dimension", sa.Integer(), nullable=True)),
+    ("parent_chunks", sa.Column("generation", sa.Integer(), server_default="0", nullable=False))
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, column in COLUMNS:
+        if column.name not in {c["name"] for c in inspector.get_columns(table)}:
+            op.add_column(table, column)
+
+    if "ix_chunks_project_generation" not in {i["name"] for i in inspector.get_indexes("chunks")}:
+        op.create_index("ix_chunks_project_generation", "chunks", ["project_id", "generation"])
+
+    # Untagged vectors were produced by the model recorded for their
+    # document, or by the configured one before models were recorded
+    op.execute(sa.text("""
+        UPDATE chunks
+        SET embedding_model = COALESCE(assets.metadata->'pipeline'->>'embedding_model', :embedding_model),
+            embedding_dimension = json_array_length(chunks.embedding)
+        FROM assets
+        WHERE chunks.asset_id = assets.id AND chunks.embedding_model IS NULL
+    """).bindparams(embedding_model=settings.embedding_model))
+    op.execute("""
+        UPDATE projects
+        SET embedding_model = (
+            SELECT chunks.embedding_model FROM chunks
+            WHERE chunks.project_id = projects.id AND chunks.generation = projects.index_generation
+            LIMIT 1
+        )
+        WHERE embedding_model IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chunks_project_generation", table_name="chunks")
+    for table, column in reversed(COLUMNS):
+        op.drop_column(table, column.name)
@@ -0,0 +1,53 @@
+"""Performance indexes
+
+Indexes for the project/document filters every search, stats query,
+reindex and delete uses; without them those are sequential scans of
+chunks and parent_chunks. On PostgreSQL they are built CONCURRENTLY so
+live databases keep serving reads and writes. A failed concurrent build
+leaves an INVALID index behind; drop it and run the upgrade again.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    # Per-document listing, stats and ordered reads within a project
+    ("ix_chunks_project_asset_index", "chunks", ["project_id", "asset_id", "chunk_index"]),
+    # Document (re)processing and deletes, and the assets foreign key cascade
+    ("ix_chunks_asset_generation", "chunks", ["asset_id", "generation"]),
+    ("ix_parent_chunks_project_generation", "parent_chunks", ["project_id", "generation"]),
+    ("ix_parent_chunks_asset_generation", "parent_chunks", ["asset_id", "generation"]),
+    # Document listing (newest first)
+    ("ix_assets_project_created", "assets", ["project_id", "created_at"]),
+    # Duplicate lookup by content hash
+    ("ix_assets_sha256", "assets", [sa.text("(metadata->>'sha256')")]),
+    # Latest reindex of a project, and foreign key cascades
+    ("ix_ingestion_jobs_project_type", "ingestion_jobs", ["project_id", "job_type"]),
+    ("ix_ingestion_jobs_asset_id", "ingestion_jobs", ["asset_id"]),
+    ("ix_ingestion_runs_asset_id", "ingestion_runs", ["asset_id"])
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,62 @@
+"""Project counters
+
+Adds assets.chunk_count (served chunks per document) and the
+project_counters table that ingestion and deletion keep up to date, and
+fills both from the existing rows.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("assets", sa.Column("chunk_count", sa.Integer(), server_default="0", nullable=False))
+    op.create_table(
+        "project_counters",
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("asset_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_size", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("chunk_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now())
+    )
+
+    op.execute("""
+        UPDATE assets
+        SET chunk_count = served.chunk_count
+        FROM (
+            SELECT chunks.asset_id, COUNT(*) AS chunk_count
+            FROM chunks
+            JOIN projects ON projects.id = chunks.project_id
+            WHERE chunks.generation = projects.index_generation
+            GROUP BY chunks.asset_id
+        ) AS served
+        WHERE assets.id = served.asset_id
+    """)
+    op.execute("""
+        INSERT INTO project_counters (project_id, asset_count, total_size, chunk_count)
+        SELECT projects.id,
+               COUNT(assets.id),
+               COALESCE(SUM(assets.file_size), 0),
+               COALESCE(SUM(assets.chunk_count), 0)
+        FROM projects
+        LEFT JOIN assets ON assets.project_id = projects.id
+        GROUP BY projects.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("project_counters")
+    op.drop_column("assets", "chunk_count")
@@ -0,0 +1,4 @@
+"""Parsing package initialization.
+
+Kept free of heavy imports: parser worker processes import only this package.
+"""
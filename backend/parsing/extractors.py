@@ -0,0 +1,154 @@
+"""
+Document Extractors.
+Picklable parsing functions executed inside parser worker processes.
+
+They live outside backend.services so that spawned workers import only the
+parsing libraries, not the LLM and vector database clients.
+"""
+from typing import Any, Callable, Dict, List
+import os
+
+PAGE_SEPARATOR = "\n\n"
+
+# Queue on which each task announces the process running it (set per worker)
+_task_log = None
+
+
+def warm_worker(task_log: Any = None) -> None:
+    """Worker initializer: import parser modules once per process."""
+    global _task_log
+    _task_log = task_log
+    
+    import pypdf  # noqa: F401
+    import docx  # noqa: F401
+
+
+def run_task(task_id: int, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a parsing function, first reporting which worker process runs it.
+    
+    Args:
+        task_id: Parent-assigned task ID
+        func: Parsing function
+        *args: Function arguments
+        
+    Returns:
+        Function result
+    """
+    if _task_log is not None:
+        _task_log.put((task_id, os.getpid()))
+    return func(*args)
+
+
+def worker_pid() -> int:
+    """No-op task used to start workers ahead of the first upload."""
+    return os.getpid()
+
+
+def assemble_pages(page_texts: List[str], first_page: int = 1) -> Dict[str, Any]:
+    """
+    Join page texts and record where each page starts and ends.
+    
+    Args:
+        page_texts: Text of consecutive pages
+        first_page: Page number of page_texts[0]
+        
+    Returns:
+        Dict with 'text', 'pages' ([{'page_number', 'start', 'end'}]) and
+        'page_count'. Empty pages are skipped but still counted.
+    """
+    parts = []
+    pages = []
+    offset = 0
+    
+    for page_number, page_text in enumerate(page_texts, first_page):
+        if not page_text or not page_text.strip():
+            continue
+        
+        if parts:
+            offset += len(PAGE_SEPARATOR)
+        pages.append({
+            'page_number': page_number,
+            'start': offset,
+            'end': offset + len(page_text)
+        })
+        parts.append(page_text)
+        offset += len(page_text)
+    
+    return {
+        'text': PAGE_SEPARATOR.join(parts),
+        'pages': pages,
+        'page_count': len(page_texts)
+    }
+
+
+def extract_pdf(file_path: str) -> Dict[str, Any]:
+    """
+    Extract text and page offsets from a PDF.
+    
+    Args:
+        file_path: Path to PDF file
+        
+    Returns:
+        Extracted document dict (see assemble_pages)
+    """
+    from pypdf import PdfReader
+    
+    reader = PdfReader(file_path)
+    return assemble_pages([page.extract_text() or "" for page in reader.pages])
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """
+    Count pages of a PDF without extracting text.
+    
+    Args:
+        file_path: Path to PDF file
+        
+    Returns:
+        Number of pages
+    """
+    from pypdf import PdfReader
+    
+    return len(PdfReader(file_path).pages)
+
+
+def extract_pdf_pages(file_path: str, start: int, end: int) -> List[str]:
+    """
+    Extract text of a page range, for parallel extraction of large PDFs.
+    
+    Args:
+        file_path: Path to PDF file
+        start: First page index (0-based, inclusive)
+        end: Last page index (exclusive)
+        
+    Returns:
+        Text of each page in the range
+    """
+    from pypdf import PdfReader
+    
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, min(end, len(reader.pages)))]
+
+
+def extract_docx(file_path: str) -> Dict[str, Any]:
+    """
+    Extract text from a DOCX file.
+    
+    Args:
+        file_path: Path to DOCX file
+        
+    Returns:
+        Extracted document dict (DOCX has no fixed pages, so 'pages' is empty)
+    """
+    from docx import Document
+    
+    doc = Document(file_path)
+    text_parts = [para.text for para in doc.paragraphs if para.text.strip()]
+    
+    return {
+        'text': PAGE_SEPARATOR.join(text_parts),
+        'pages': [],
+        'page_count': 0,
+        'paragraph_count': len(doc.paragraphs)
+    }
@@ -31,7 +31,7 @@ class GeminiProvider(LLMInterface):
         
         # Initialize models
         self.chat_model = genai.GenerativeModel(self.model_name)
-        self.embedding_model = "models/gemini-embedding-001"
+        self.embedding_model = settings.embedding_model
         
         logger.info(f"Gemini provider initialized with model: {self.model_name}")
     
@@ -93,12 +93,14 @@ class GeminiProvider(LLMInterface):
         
         Args:
             texts: List of texts to embed
+            **kwargs: 'model' overrides the configured embedding model
             
         Returns:
             List of embedding vectors
         """
         try:
             embeddings = []
+            model = kwargs.get('model') or self.embedding_model
             
             # Use asyncio.gather for parallel processing with a semaphore to control concurrency
             # This is significantly faster than sequential processing
@@ -111,7 +113,7 @@ class GeminiProvider(LLMInterface):
                     result = await loop.run_in_executor(
                         None,
                         lambda: genai.embed_content(
-                            model=self.embedding_model,
+                            model=model,
                             content=text,
                             task_type="retrieval_document"
                         )
@@ -44,7 +44,8 @@ class LLMInterface(ABC):
         
         Args:
             texts: List of text strings to embed
-            **kwargs: Additional provider-specific parameters
+            **kwargs: Additional provider-specific parameters; 'model'
+                      selects another embedding model of the provider
             
         Returns:
             List of embedding vectors
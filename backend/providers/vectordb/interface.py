@@ -3,12 +3,80 @@ Abstract VectorDB Provider Interface.
 Defines the contract for vector database providers.
 """
 from abc import ABC, abstractmethod
+import re
 from typing import List, Dict, Any, Optional, Tuple
 
 
 class VectorDBInterface(ABC):
     """Abstract base class for vector database providers."""
     
+    # True if vectors live in the chunks table itself (copied with the rows)
+    stores_embeddings_in_chunks: bool = False
+    
+    # Names produced by collection_name
+    COLLECTION_PATTERN = re.compile(r"^project_(\d+)(?:_g(\d+))?$")
+    
+    @staticmethod
+    def collection_name(project_id: int, generation: int = 0) -> str:
+        """
+        Name of the collection holding a project's vectors.
+        
+        Args:
+            project_id: Project ID
+            generation: Index generation (each reindex builds a new one)
+            
+        Returns:
+            "project_<id>", suffixed with "_g<generation>" after the first reindex
+        """
+        if generation:
+            return f"project_{project_id}_g{generation}"
+        return f"project_{project_id}"
+    
+    @staticmethod
+    def parse_collection_name(name: str) -> Optional[Tuple[int, int]]:
+        """
+        Inverse of collection_name.
+        
+        Args:
+            name: Collection name
+            
+        Returns:
+            (project_id, generation), or None for other collections
+        """
+        match = VectorDBInterface.COLLECTION_PATTERN.match(name)
+        if not match:
+            return None
+        return int(match.group(1)), int(match.group(2) or 0)
+    
+    @staticmethod
+    def vector_payload(
+        project_id: int,
+        asset_id: int,
+        generation: int,
+        content: str,
+        metadata: Dict[str, Any],
+        embedding_model: Optional[str],
+        embedding_dimension: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        Metadata stored with a chunk's vector in an external store.
+        
+        Carries every field search and delete filter on, plus what a search
+        hit returns (content, chunk metadata and asset id).
+        
+        Returns:
+            Payload dict for add_vectors
+        """
+        return {
+            'project_id': project_id,
+            'asset_id': asset_id,
+            'generation': generation,
+            'embedding_model': embedding_model,
+            'embedding_dimension': embedding_dimension,
+            'content': content,
+            'metadata': metadata
+        }
+    
     @abstractmethod
     async def create_collection(
         self,
@@ -53,6 +121,26 @@ class VectorDBInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    async def get_vectors(
+        self,
+        collection_name: str,
+        ids: List[Any],
+        **kwargs
+    ) -> Dict[Any, List[float]]:
+        """
+        Fetch stored vectors by id.
+        
+        Args:
+            collection_name: Collection name
+            ids: List of identifiers
+            **kwargs: Provider-specific parameters
+            
+        Returns:
+            Mapping of id to vector (missing ids are omitted)
+        """
+        pass
+    
     @abstractmethod
     async def search(
         self,
@@ -69,14 +157,41 @@ class VectorDBInterface(ABC):
             collection_name: Collection name
             query_vector: Query embedding vector
             top_k: Number of results to return
-            filter_dict: Optional metadata filters
-            **kwargs: Provider-specific parameters
+            filter_dict: Optional metadata filters ('project_id', 'asset_id',
+                         'asset_ids' for a list of assets, 'generation', or
+                         'embedding_model' to only compare vectors of the
+                         query's model)
+            **kwargs: Provider-specific parameters; 'include_embeddings=True'
+                      adds each hit's vector to its metadata as 'embedding'
             
         Returns:
             List of tuples: (id, similarity_score, metadata)
         """
         pass
     
+    @abstractmethod
+    async def delete_vectors(
+        self,
+        collection_name: str,
+        ids: Optional[List[Any]] = None,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> bool:
+        """
+        Remove vectors by id or by metadata filter.
+        
+        Args:
+            collection_name: Collection name
+            ids: List of identifiers
+            filter_dict: Metadata filters as in search (e.g. {'asset_id': 7}),
+                         used when no ids are given
+            **kwargs: Provider-specific parameters
+            
+        Returns:
+            True if successful
+        """
+        pass
+    
     @abstractmethod
     async def delete_collection(
         self,
@@ -95,6 +210,19 @@ class VectorDBInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    async def list_collections(self, **kwargs) -> List[str]:
+        """
+        List the names of all collections.
+        
+        Args:
+            **kwargs: Provider-specific parameters
+            
+        Returns:
+            Collection names
+        """
+        pass
+    
     @abstractmethod
     async def collection_exists(
         self,
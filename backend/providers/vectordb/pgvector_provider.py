@@ -3,11 +3,13 @@ PGVector Provider Implementation.
 Uses PostgreSQL with pgvector extension for vector storage.
 """
 from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy import select, delete, text
+from sqlalchemy import select, update, delete, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.providers.vectordb.interface import VectorDBInterface
 from backend.database.models import Chunk, Project
 from backend.database.connection import async_session_maker
+from backend.config import settings
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,8 +18,16 @@ logger = logging.getLogger(__name__)
 class PGVectorProvider(VectorDBInterface):
     """PostgreSQL pgvector implementation."""
     
-    def __init__(self):
-        """Initialize PGVector provider."""
+    stores_embeddings_in_chunks = True
+    
+    def __init__(self, write_batch_size: int = None):
+        """
+        Initialize PGVector provider.
+        
+        Args:
+            write_batch_size: Embeddings written per UPDATE (defaults to settings)
+        """
+        self.write_batch_size = write_batch_size or settings.vector_write_batch_size
         logger.info("PGVector provider initialized")
     
     async def create_collection(
@@ -62,17 +72,32 @@ class PGVectorProvider(VectorDBInterface):
             True if successful
         """
         try:
+            # One UPDATE ... FROM unnest(...) per batch instead of a SELECT per chunk;
+            # metadata (if given) is merged into the existing JSON server-side
+            stmt = text("""
+                UPDATE chunks
+                SET embedding = v.embedding::json,
+                    metadata = CASE
+                        WHEN v.metadata IS NULL THEN chunks.metadata
+                        ELSE (COALESCE(chunks.metadata::jsonb, '{}'::jsonb) || v.metadata::jsonb)::json
+                    END
+                FROM unnest(CAST(:ids AS integer[]), CAST(:embeddings AS text[]), CAST(:metadata AS text[]))
+                    AS v(id, embedding, metadata)
+                WHERE chunks.id = v.id
+            """)
+            
             async with async_session_maker() as session:
-                for i, (chunk_id, vector) in enumerate(zip(ids, vectors)):
-                    # Update chunk with embedding
-                    stmt = select(Chunk).where(Chunk.id == chunk_id)
-                    result = await session.execute(stmt)
-                    chunk = result.scalar_one_or_none()
-                    
-                    if chunk:
-                        chunk.embedding = vector
-                        if metadata and i < len(metadata):
-                            chunk.extra_metadata.update(metadata[i])
+                for start in range(0, len(ids), self.write_batch_size):
+                    end = start + self.write_batch_size
+                    batch_metadata = [
+                        json.dumps(metadata[i]) if metadata and i < len(metadata) else None
+                        for i in range(start, min(end, len(ids)))
+                    ]
+                    await session.execute(stmt, {
+                        'ids': list(ids[start:end]),
+                        'embeddings': [json.dumps(vector) for vector in vectors[start:end]],
+                        'metadata': batch_metadata
+                    })
                 
                 await session.commit()
                 logger.info(f"Added {len(vectors)} vectors to collection '{collection_name}'")
@@ -82,6 +107,35 @@ class PGVectorProvider(VectorDBInterface):
             logger.error(f"Error adding vectors: {str(e)}")
             raise
     
+    async def get_vectors(
+        self,
+        collection_name: str,
+        ids: List[Any],
+        **kwargs
+    ) -> Dict[Any, List[float]]:
+        """
+        Fetch chunk embeddings by chunk id.
+        
+        Args:
+            collection_name: Not used (using chunks table)
+            ids: List of chunk IDs
+            
+        Returns:
+            Mapping of chunk ID to embedding
+        """
+        try:
+            async with async_session_maker() as session:
+                stmt = select(Chunk.id, Chunk.embedding).where(
+                    Chunk.id.in_(ids),
+                    Chunk.embedding.isnot(None)
+                )
+                result = await session.execute(stmt)
+                return {row.id: row.embedding for row in result.all()}
+                
+        except Exception as e:
+            logger.error(f"Error getting vectors: {str(e)}")
+            raise
+    
     async def search(
         self,
         collection_name: str,
@@ -110,10 +164,7 @@ class PGVectorProvider(VectorDBInterface):
                 
                 # Apply filters
                 if filter_dict:
-                    if 'project_id' in filter_dict:
-                        query = query.where(Chunk.project_id == filter_dict['project_id'])
-                    if 'asset_id' in filter_dict:
-                        query = query.where(Chunk.asset_id == filter_dict['asset_id'])
+                    query = query.where(*self._filter_criteria(filter_dict))
                 
                 result = await session.execute(query)
                 rows = result.all()
@@ -127,18 +178,19 @@ class PGVectorProvider(VectorDBInterface):
                     if not norm1 or not norm2: return 0.0
                     return dot_product / (norm1 * norm2)
                 
+                include_embeddings = kwargs.get('include_embeddings', False)
+                
                 scored_results = []
                 for row in rows:
                     sim = cosine_similarity(query_vector, row.embedding)
-                    scored_results.append((
-                        row.id,
-                        sim,
-                        {
-                            'content': row.content,
-                            'metadata': row.extra_metadata,
-                            'asset_id': row.asset_id
-                        }
-                    ))
+                    payload = {
+                        'content': row.content,
+                        'metadata': row.extra_metadata,
+                        'asset_id': row.asset_id
+                    }
+                    if include_embeddings:
+                        payload['embedding'] = row.embedding
+                    scored_results.append((row.id, sim, payload))
                 
                 # Sort by similarity and take top_k
                 scored_results.sort(key=lambda x: x[1], reverse=True)
@@ -151,6 +203,59 @@ class PGVectorProvider(VectorDBInterface):
             logger.error(f"Error searching vectors: {str(e)}")
             raise
     
+    @staticmethod
+    def _filter_criteria(filter_dict: Dict[str, Any]) -> List[Any]:
+        """WHERE clauses on the chunks table for a search/delete filter."""
+        criteria = []
+        if 'project_id' in filter_dict:
+            criteria.append(Chunk.project_id == filter_dict['project_id'])
+        if 'asset_id' in filter_dict:
+            criteria.append(Chunk.asset_id == filter_dict['asset_id'])
+        if 'asset_ids' in filter_dict:
+            criteria.append(Chunk.asset_id.in_(filter_dict['asset_ids']))
+        if 'generation' in filter_dict:
+            criteria.append(Chunk.generation == filter_dict['generation'])
+        if 'embedding_model' in filter_dict:
+            criteria.append(Chunk.embedding_model == filter_dict['embedding_model'])
+        return criteria
+    
+    async def delete_vectors(
+        self,
+        collection_name: str,
+        ids: Optional[List[Any]] = None,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> bool:
+        """
+        Clear chunk embeddings by chunk id or filter.
+        
+        Args:
+            collection_name: Not used (using chunks table)
+            ids: List of chunk IDs
+            filter_dict: Filters as in search, used when no ids are given
+            
+        Returns:
+            True if successful
+        """
+        try:
+            if ids:
+                criteria = [Chunk.id.in_(ids)]
+            elif filter_dict:
+                criteria = self._filter_criteria(filter_dict)
+            else:
+                return True
+            
+            async with async_session_maker() as session:
+                stmt = update(Chunk).where(*criteria).values(embedding=None)
+                result = await session.execute(stmt)
+                await session.commit()
+                logger.info(f"Deleted {result.rowcount} vectors from collection '{collection_name}'")
+                return True
+                
+        except Exception as e:
+            logger.error(f"Error deleting vectors: {str(e)}")
+            raise
+    
     async def delete_collection(
         self,
         collection_name: str,
@@ -179,6 +284,15 @@ class PGVectorProvider(VectorDBInterface):
             logger.error(f"Error deleting collection: {str(e)}")
             raise
     
+    async def list_collections(self, **kwargs) -> List[str]:
+        """
+        List collections.
+        
+        Returns:
+            Empty list (vectors live in the chunks table)
+        """
+        return []
+    
     async def collection_exists(
         self,
         collection_name: str,
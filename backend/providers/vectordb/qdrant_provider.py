@@ -27,6 +27,12 @@ class QdrantProvider(VectorDBInterface):
             from qdrant_client import QdrantClient
             from qdrant_client.models import Distance, VectorParams, PointStruct
             
+            self.Distance = Distance
+            self.VectorParams = VectorParams
+            self.PointStruct = PointStruct
+            # Collections known to exist (created lazily on first write)
+            self._collections = set()
+            
             if url.startswith("path://"):
                 path = url.replace("path://", "")
                 self.client = QdrantClient(path=path)
@@ -55,11 +61,7 @@ class QdrantProvider(VectorDBInterface):
             True if successful
         """
         try:
-            # Check if collection exists
-            collections = self.client.get_collections().collections
-            exists = any(c.name == collection_name for c in collections)
-            
-            if not exists:
+            if not self.client.collection_exists(collection_name):
                 self.client.create_collection(
                     collection_name=collection_name,
                     vectors_config=self.VectorParams(
@@ -71,6 +73,7 @@ class QdrantProvider(VectorDBInterface):
             else:
                 logger.info(f"Qdrant collection '{collection_name}' already exists")
             
+            self._collections.add(collection_name)
             return True
             
         except Exception as e:
@@ -86,18 +89,24 @@ class QdrantProvider(VectorDBInterface):
         **kwargs
     ) -> bool:
         """
-        Add vectors to Qdrant collection.
+        Add vectors to Qdrant collection (created on first use).
         
         Args:
             collection_name: Collection name
             vectors: List of embeddings
             ids: List of IDs
-            metadata: Optional metadata
+            metadata: Optional payloads (see VectorDBInterface.vector_payload);
+                      search and delete filters match payload fields
             
         Returns:
             True if successful
         """
         try:
+            if not vectors:
+                return True
+            if collection_name not in self._collections:
+                await self.create_collection(collection_name, dimension=len(vectors[0]))
+            
             points = []
             for i, (point_id, vector) in enumerate(zip(ids, vectors)):
                 payload = metadata[i] if metadata and i < len(metadata) else {}
@@ -121,6 +130,38 @@ class QdrantProvider(VectorDBInterface):
             logger.error(f"Error adding vectors: {str(e)}")
             raise
     
+    async def get_vectors(
+        self,
+        collection_name: str,
+        ids: List[Any],
+        **kwargs
+    ) -> Dict[Any, List[float]]:
+        """
+        Fetch points' vectors from Qdrant.
+        
+        Args:
+            collection_name: Collection name
+            ids: List of point IDs
+            
+        Returns:
+            Mapping of point ID to vector
+        """
+        try:
+            if not ids or not await self.collection_exists(collection_name):
+                return {}
+            
+            points = self.client.retrieve(
+                collection_name=collection_name,
+                ids=ids,
+                with_vectors=True,
+                with_payload=False
+            )
+            return {point.id: point.vector for point in points}
+            
+        except Exception as e:
+            logger.error(f"Error getting vectors: {str(e)}")
+            raise
+    
     async def search(
         self,
         collection_name: str,
@@ -142,32 +183,31 @@ class QdrantProvider(VectorDBInterface):
             List of (id, score, payload)
         """
         try:
-            # Build filter if provided
-            search_filter = None
-            if filter_dict:
-                from qdrant_client.models import Filter, FieldCondition, MatchValue
-                conditions = []
-                for key, value in filter_dict.items():
-                    conditions.append(
-                        FieldCondition(key=key, match=MatchValue(value=value))
-                    )
-                search_filter = Filter(must=conditions)
+            if not await self.collection_exists(collection_name):
+                return []
+            
+            include_embeddings = kwargs.get('include_embeddings', False)
             
             # Search
-            search_result = self.client.search(
+            search_result = self.client.query_points(
                 collection_name=collection_name,
-                query_vector=query_vector,
+                query=query_vector,
                 limit=top_k,
-                query_filter=search_filter
-            )
+                query_filter=self._build_filter(filter_dict) if filter_dict else None,
+                with_payload=True,
+                with_vectors=include_embeddings
+            ).points
             
             # Format results
             results = []
             for hit in search_result:
+                payload = dict(hit.payload or {})
+                if include_embeddings:
+                    payload['embedding'] = hit.vector
                 results.append((
                     hit.id,
                     hit.score,
-                    hit.payload
+                    payload
                 ))
             
             logger.info(f"Found {len(results)} similar points in Qdrant")
@@ -177,6 +217,66 @@ class QdrantProvider(VectorDBInterface):
             logger.error(f"Error searching vectors: {str(e)}")
             raise
     
+    @staticmethod
+    def _build_filter(filter_dict: Dict[str, Any]) -> Any:
+        """Qdrant payload filter for a search/delete filter dict."""
+        from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny
+        conditions = []
+        for key, value in filter_dict.items():
+            if key == 'asset_ids':
+                conditions.append(
+                    FieldCondition(key='asset_id', match=MatchAny(any=list(value)))
+                )
+            else:
+                conditions.append(
+                    FieldCondition(key=key, match=MatchValue(value=value))
+                )
+        return Filter(must=conditions)
+    
+    async def delete_vectors(
+        self,
+        collection_name: str,
+        ids: Optional[List[Any]] = None,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> bool:
+        """
+        Delete points from Qdrant collection by ID or payload filter.
+        
+        Args:
+            collection_name: Collection name
+            ids: List of point IDs
+            filter_dict: Payload filters (e.g. {'asset_id': 7}), used when
+                         no ids are given
+            
+        Returns:
+            True if successful
+        """
+        try:
+            if not ids and not filter_dict:
+                return True
+            if not await self.collection_exists(collection_name):
+                return True
+            
+            from qdrant_client.models import PointIdsList, FilterSelector
+            if ids:
+                selector = PointIdsList(points=list(ids))
+            else:
+                selector = FilterSelector(filter=self._build_filter(filter_dict))
+            
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=selector
+            )
+            logger.info(
+                f"Deleted {len(ids) if ids else 'matching'} points from Qdrant collection '{collection_name}'"
+            )
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error deleting vectors: {str(e)}")
+            raise
+    
     async def delete_collection(
         self,
         collection_name: str,
@@ -193,6 +293,7 @@ class QdrantProvider(VectorDBInterface):
         """
         try:
             self.client.delete_collection(collection_name=collection_name)
+            self._collections.discard(collection_name)
             logger.info(f"Deleted Qdrant collection '{collection_name}'")
             return True
             
@@ -200,6 +301,20 @@ class QdrantProvider(VectorDBInterface):
             logger.error(f"Error deleting collection: {str(e)}")
             raise
     
+    async def list_collections(self, **kwargs) -> List[str]:
+        """
+        List Qdrant collections.
+        
+        Returns:
+            Collection names
+        """
+        try:
+            return [c.name for c in self.client.get_collections().collections]
+            
+        except Exception as e:
+            logger.error(f"Error listing collections: {str(e)}")
+            raise
+    
     async def collection_exists(
         self,
         collection_name: str,
@@ -215,8 +330,9 @@ class QdrantProvider(VectorDBInterface):
             True if exists
         """
         try:
-            collections = self.client.get_collections().collections
-            return any(c.name == collection_name for c in collections)
+            if collection_name in self._collections:
+                return True
+            return self.client.collection_exists(collection_name)
             
         except Exception as e:
             logger.error(f"Error checking collection: {str(e)}")
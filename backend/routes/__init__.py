@@ -1,4 +1,4 @@
 """Routes package initialization."""
-from backend.routes import projects, documents, query, health
+from backend.routes import projects, documents, query, health, jobs, maintenance
 
-__all__ = ["projects", "documents", "query", "health"]
+__all__ = ["projects", "documents", "query", "health", "jobs", "maintenance"]
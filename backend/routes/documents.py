@@ -2,7 +2,8 @@
 Document Routes.
 API endpoints for document management.
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
@@ -37,33 +38,24 @@ class AssetResponse(BaseModel):
 async def upload_document(
     project_id: int,
     file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Upload document to project.
-    Document will be processed in background.
+    Document is queued and processed by the ingestion workers.
     """
     try:
-        # Read file
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        # Upload document
+        # Stream upload to disk
         asset = await document_controller.upload_document(
             db=db,
             project_id=project_id,
-            file_content=file_content,
+            upload_file=file,
             filename=file.filename,
-            file_size=file_size
+            declared_size=file.size
         )
         
-        # Process in background
-        background_tasks.add_task(
-            document_controller.process_document,
-            db=db,
-            asset_id=asset.id
-        )
+        # Queue for processing
+        await document_controller.queue_processing(db=db, asset_id=asset.id)
         
         return asset
         
@@ -106,16 +98,52 @@ async def get_document(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/documents/{asset_id}/process", response_model=AssetResponse)
+@router.post("/documents/{asset_id}/process", status_code=202)
 async def process_document(
     asset_id: int,
     db: AsyncSession = Depends(get_db)
 ):
-    """Manually trigger document processing."""
+    """
+    Manually trigger document processing.
+    The document is queued; poll GET /jobs/{job_id} for progress.
+    """
     try:
-        await document_controller.process_document(db=db, asset_id=asset_id)
-        document = await document_controller.get_document(db=db, asset_id=asset_id)
-        return document
+        job = await document_controller.queue_processing(db=db, asset_id=asset_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Document not found")
+        return {'status': 'queued', 'job_id': job.id}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.put("/documents/{asset_id}", response_model=AssetResponse)
+async def replace_document(
+    asset_id: int,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload a revised version of a document and queue it for re-indexing.
+    Only chunks whose content changed are re-embedded.
+    """
+    try:
+        asset = await document_controller.replace_document(
+            db=db,
+            asset_id=asset_id,
+            upload_file=file,
+            filename=file.filename,
+            declared_size=file.size
+        )
+        if not asset:
+            raise HTTPException(status_code=404, detail="Document not found")
+        return asset
+        
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -127,13 +155,21 @@ async def delete_document(
     asset_id: int,
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete document."""
+    """Delete document.
+    
+    Large ones are deleted in the background: the response is then 202
+    with the job ID to poll at GET /jobs/{job_id}.
+    """
     try:
-        deleted = await document_controller.delete_document(db=db, asset_id=asset_id)
-        if not deleted:
+        result = await document_controller.delete_document(db=db, asset_id=asset_id)
+        if not result:
             raise HTTPException(status_code=404, detail="Document not found")
+        if result['job_id']:
+            return JSONResponse(status_code=202, content=result)
         return None
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,52 @@
+"""
+Job Routes.
+API endpoints for background ingestion job status.
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+from backend.database import get_db
+from backend.workers.job_queue import JobQueue
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+job_queue = JobQueue()
+
+
+# Response Models
+class JobResponse(BaseModel):
+    id: int
+    job_type: str
+    project_id: Optional[int]
+    asset_id: Optional[int]
+    payload: Optional[Dict[str, Any]]
+    status: str
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str]
+    run_after: Optional[datetime]
+    locked_by: Optional[str]
+    created_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+# Routes
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get background job status."""
+    try:
+        job = await job_queue.get_job(db=db, job_id=job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
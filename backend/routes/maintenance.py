@@ -0,0 +1,69 @@
+"""
+Maintenance Routes.
+API endpoints for storage reconciliation.
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from typing import List, Optional
+from backend.database import get_db
+from backend.controllers.maintenance_controller import MaintenanceController
+
+router = APIRouter(prefix="/maintenance", tags=["Maintenance"])
+maintenance_controller = MaintenanceController()
+
+
+# Response Models
+class OrphanStats(BaseModel):
+    count: int
+    bytes: int
+
+
+class OrphanCollections(BaseModel):
+    count: int
+    names: List[str]
+
+
+class StorageReportResponse(BaseModel):
+    project_dirs: OrphanStats
+    files: OrphanStats
+    extracted: OrphanStats
+    blobs: OrphanStats
+    chunks: OrphanStats
+    parent_chunks: OrphanStats
+    collections: OrphanCollections
+    reclaimable_bytes: int
+    dry_run: bool
+    counters_corrected: Optional[int] = None
+
+
+class ReconcileJobResponse(BaseModel):
+    job_id: int
+    status: str
+
+
+# Routes
+@router.get("/storage", response_model=StorageReportResponse)
+async def get_storage_report(db: AsyncSession = Depends(get_db)):
+    """
+    Dry run: report orphaned storage and how many bytes a reconciliation would reclaim
+    (chunk table bytes are estimated from table statistics).
+    """
+    try:
+        return await maintenance_controller.reconcile(db=db, dry_run=True)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/storage/reconcile", response_model=ReconcileJobResponse, status_code=202)
+async def reconcile_storage(db: AsyncSession = Depends(get_db)):
+    """
+    Remove orphaned storage in the background (report in GET /jobs/{job_id}).
+    """
+    try:
+        job = await maintenance_controller.start_reconcile(db=db)
+        return {'job_id': job.id, 'status': job.status}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -3,15 +3,18 @@ Project Routes.
 API endpoints for project management.
 """
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from backend.database import get_db
 from backend.controllers.project_controller import ProjectController
+from backend.controllers.index_controller import IndexController
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 project_controller = ProjectController()
+index_controller = IndexController()
 
 
 # Request/Response Models
@@ -44,6 +47,19 @@ class ProjectStatsResponse(BaseModel):
     stats: Dict[str, Any]
 
 
+class ReindexStatusResponse(BaseModel):
+    project_id: int
+    active_generation: int
+    embedding_model: Optional[str]
+    embedding_models: Dict[str, int]
+    target_embedding_model: Optional[str]
+    job_id: Optional[int]
+    status: Optional[str]
+    generation: Optional[int]
+    progress: Optional[Dict[str, Any]]
+    last_error: Optional[str]
+
+
 # Routes
 @router.post("/", response_model=ProjectResponse, status_code=201)
 async def create_project(
@@ -117,6 +133,46 @@ async def get_project_stats(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/{project_id}/reindex", response_model=ReindexStatusResponse, status_code=202)
+async def reindex_project(
+    project_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Rebuild the project's index with the current chunking and embedding settings.
+    
+    Queries keep using the current index until the new one is complete.
+    """
+    try:
+        job = await index_controller.start_reindex(db=db, project_id=project_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return await index_controller.get_reindex_status(db=db, project_id=project_id)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{project_id}/reindex", response_model=ReindexStatusResponse)
+async def get_reindex_status(
+    project_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get progress of the project's latest reindex."""
+    try:
+        status = await index_controller.get_reindex_status(db=db, project_id=project_id)
+        if not status:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return status
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
@@ -146,13 +202,21 @@ async def delete_project(
     project_id: int,
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete project and all associated data."""
+    """Delete project and all associated data.
+    
+    Large ones are deleted in the background: the response is then 202
+    with the job ID to poll at GET /jobs/{job_id}.
+    """
     try:
-        deleted = await project_controller.delete_project(db=db, project_id=project_id)
-        if not deleted:
+        result = await project_controller.delete_project(db=db, project_id=project_id)
+        if not result:
             raise HTTPException(status_code=404, detail="Project not found")
+        if result['job_id']:
+            return JSONResponse(status_code=202, content=result)
         return None
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -19,11 +19,15 @@ class QueryRequest(BaseModel):
     top_k: int = Field(default=5, ge=1, le=20)
     language: str = Field(default="ar", pattern="^(ar|en)$")
     asset_id: Optional[int] = None
+    compress: bool = False
+    # MMR trade-off: 1.0 = pure relevance, lower values favour diversity
+    mmr_lambda: Optional[float] = Field(default=None, ge=0.0, le=1.0)
 
 
 class SourceInfo(BaseModel):
     document_name: str
     chunk_index: int
+    page_number: Optional[int] = None
     similarity: float
     asset_id: int
 
@@ -32,6 +36,7 @@ class QueryResponse(BaseModel):
     answer: str
     sources: List[SourceInfo]
     context_used: int
+    metadata: Optional[Dict[str, Any]] = None
 
 
 # Routes
@@ -52,7 +57,9 @@ async def query_project(
             query=query_data.query,
             top_k=query_data.top_k,
             language=query_data.language,
-            asset_id=query_data.asset_id
+            asset_id=query_data.asset_id,
+            compress=query_data.compress,
+            mmr_lambda=query_data.mmr_lambda
         )
         
         return result
@@ -1,30 +1,32 @@
 """
 Stats Routes.
-API endpoints for global statistics.
+API endpoints for global statistics and ingestion throughput.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional, Literal, Dict, Any
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select
-from backend.database import get_db
-from backend.database.models import Project, Asset, Chunk
+from sqlalchemy import func, select, literal_column
+from backend.database import get_db, get_pool_stats
+from backend.database.models import Project, ProjectCounters, IngestionRun
+from backend.services.ingestion_pipeline import IngestionMetrics
 
 router = APIRouter(prefix="/stats", tags=["Stats"])
 
 @router.get("/")
 async def get_global_stats(db: AsyncSession = Depends(get_db)):
-    """Get global statistics."""
+    """Get global statistics (documents and served chunks from the project counters)."""
     try:
         # Count projects
         projects_query = select(func.count(Project.id))
         projects_count = await db.scalar(projects_query)
         
-        # Count documents
-        documents_query = select(func.count(Asset.id))
-        documents_count = await db.scalar(documents_query)
-        
-        # Count chunks
-        chunks_query = select(func.count(Chunk.id))
-        chunks_count = await db.scalar(chunks_query)
+        # Sum per-project counters instead of counting every row
+        totals_query = select(
+            func.coalesce(func.sum(ProjectCounters.asset_count), 0),
+            func.coalesce(func.sum(ProjectCounters.chunk_count), 0)
+        )
+        documents_count, chunks_count = (await db.execute(totals_query)).one()
         
         return {
             "projects": projects_count or 0,
@@ -33,3 +35,105 @@ async def get_global_stats(db: AsyncSession = Depends(get_db)):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/database")
+async def get_database_stats():
+    """Get connection pool checkout latency and utilization."""
+    try:
+        return get_pool_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _ingestion_columns():
+    """Aggregates over ingestion runs shared by totals and time series."""
+    return [
+        func.count(IngestionRun.id).label("runs"),
+        func.count(IngestionRun.id).filter(IngestionRun.status == "failed").label("failed"),
+        *[
+            func.coalesce(func.sum(getattr(IngestionRun, counter)), 0).label(counter)
+            for counter in ('file_bytes',) + IngestionMetrics.COUNTERS
+        ],
+        func.coalesce(func.sum(IngestionRun.duration_seconds), 0.0).label("duration_seconds"),
+        *[
+            func.coalesce(func.avg(IngestionRun.stage_seconds[stage].as_float()), 0.0).label(f"stage_{stage}")
+            for stage in IngestionMetrics.STAGES
+        ]
+    ]
+
+
+def _throughput(row) -> Dict[str, Any]:
+    """Turn an aggregate row into totals, rates and average stage times."""
+    duration = float(row.duration_seconds or 0.0)
+
+    def rate(value) -> float:
+        return round(value / duration, 2) if duration else 0.0
+
+    return {
+        "runs": row.runs,
+        "failed": row.failed,
+        **{counter: int(getattr(row, counter)) for counter in ('file_bytes',) + IngestionMetrics.COUNTERS},
+        "duration_seconds": round(duration, 3),
+        "pages_per_second": rate(row.pages),
+        "chunks_per_second": rate(row.chunks),
+        "embeddings_per_second": rate(row.embedded),
+        "avg_stage_seconds": {
+            stage: round(float(getattr(row, f"stage_{stage}")), 3)
+            for stage in IngestionMetrics.STAGES
+        }
+    }
+
+
+@router.get("/ingestion")
+async def get_ingestion_stats(
+    project_id: Optional[int] = None,
+    days: int = Query(default=7, ge=1, le=365),
+    bucket: Literal["hour", "day", "week"] = "day",
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get ingestion throughput per project, overall and over time.
+
+    Rates divide totals by summed run durations, i.e. per-worker throughput.
+    """
+    try:
+        since = datetime.utcnow() - timedelta(days=days)
+        filters = [IngestionRun.started_at >= since]
+        if project_id is not None:
+            filters.append(IngestionRun.project_id == project_id)
+
+        totals_query = (
+            select(IngestionRun.project_id, *_ingestion_columns())
+            .where(*filters)
+            .group_by(IngestionRun.project_id)
+        )
+        totals = (await db.execute(totals_query)).all()
+
+        # bucket is one of a fixed set; a literal keeps SELECT and GROUP BY identical
+        period = func.date_trunc(literal_column(f"'{bucket}'"), IngestionRun.started_at).label("period")
+        series_query = (
+            select(IngestionRun.project_id, period, *_ingestion_columns())
+            .where(*filters)
+            .group_by(IngestionRun.project_id, period)
+            .order_by(IngestionRun.project_id, period)
+        )
+        series = (await db.execute(series_query)).all()
+
+        projects = {
+            row.project_id: {"project_id": row.project_id, **_throughput(row), "series": []}
+            for row in totals
+        }
+        for row in series:
+            projects[row.project_id]["series"].append({
+                "period": row.period.isoformat(),
+                **_throughput(row)
+            })
+
+        return {
+            "since": since.isoformat(),
+            "bucket": bucket,
+            "projects": list(projects.values())
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
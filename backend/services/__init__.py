@@ -1,10 +1,16 @@
 """Services package initialization."""
+from backend.services.parser_pool import ParserPool
 from backend.services.document_loader import DocumentLoaderService
+from backend.services.text_splitter import RecursiveTextSplitter
 from backend.services.chunking_service import ChunkingService
 from backend.services.file_service import FileService
 from backend.services.embedding_service import EmbeddingService
 from backend.services.query_service import QueryService
 from backend.services.answer_service import AnswerService
+from backend.services.token_estimator import TokenEstimator
+from backend.services.context_packer import ContextPackerService
+from backend.services.context_compressor import ContextCompressorService
+from backend.services.ingestion_pipeline import IngestionPipeline
 
 __all__ = [
     "DocumentLoaderService",
@@ -12,5 +18,11 @@ __all__ = [
     "FileService",
     "EmbeddingService",
     "QueryService",
-    "AnswerService"
+    "AnswerService",
+    "TokenEstimator",
+    "ContextPackerService",
+    "ContextCompressorService",
+    "ParserPool",
+    "RecursiveTextSplitter",
+    "IngestionPipeline"
 ]
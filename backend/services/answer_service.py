@@ -3,7 +3,12 @@ Answer Generation Service.
 Handles generating AI-powered answers using LLM.
 """
 from typing import List, Dict, Any, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.models import ParentChunk
 from backend.providers.llm.factory import LLMProviderFactory
+from backend.services.context_packer import ContextPackerService
+from backend.services.token_estimator import TokenEstimator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +20,7 @@ class AnswerService:
     def __init__(self):
         """Initialize answer service."""
         self.llm_provider = LLMProviderFactory.create_provider()
+        self.context_packer = ContextPackerService()
         logger.info("Answer service initialized")
     
     async def generate_answer(
@@ -22,7 +28,8 @@ class AnswerService:
         query: str,
         context_chunks: List[Dict[str, Any]],
         language: str = "ar",  # Default to Arabic
-        include_sources: bool = True
+        include_sources: bool = True,
+        original_chunks: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Generate answer from query and context.
@@ -32,13 +39,24 @@ class AnswerService:
             context_chunks: List of relevant chunks
             language: Response language ('ar' or 'en')
             include_sources: Whether to include source references
+            original_chunks: Chunks before any compression, used to report
+                             the prompt size without it (defaults to
+                             context_chunks)
             
         Returns:
-            Dict with 'answer' and optional 'sources'
+            Dict with 'answer', 'metadata' and optional 'sources'
         """
         try:
-            # Build context from chunks
-            context = self._build_context(context_chunks)
+            # Prompt size if the retrieved chunks were concatenated verbatim
+            naive_chunks = context_chunks if original_chunks is None else original_chunks
+            naive_prompt = self._build_prompt(query, self._build_context(naive_chunks), language)
+            
+            # Merge overlapping chunks and fit them into the token budget
+            segments, packing_stats = self.context_packer.pack(context_chunks)
+            used_chunks = [chunk for segment in segments for chunk in segment['chunks']]
+            
+            # Build context from packed segments
+            context = self._build_context(segments)
             
             # Build prompt
             prompt = self._build_prompt(query, context, language)
@@ -53,11 +71,16 @@ class AnswerService:
             # Format response
             response = {
                 'answer': answer.strip(),
-                'context_used': len(context_chunks)
+                'context_used': len(used_chunks),
+                'metadata': {
+                    'prompt_tokens_before': TokenEstimator.estimate(naive_prompt),
+                    'prompt_tokens_after': TokenEstimator.estimate(prompt),
+                    **packing_stats
+                }
             }
             
             if include_sources:
-                response['sources'] = self._extract_sources(context_chunks)
+                response['sources'] = self._extract_sources(used_chunks)
             
             logger.info(f"Generated answer (length={len(answer)})")
             return response
@@ -66,12 +89,80 @@ class AnswerService:
             logger.error(f"Error generating answer: {str(e)}")
             raise
     
+    async def expand_to_parents(
+        self,
+        db: AsyncSession,
+        chunks: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Replace retrieved child chunks with their de-duplicated parent windows.
+        
+        Chunks without a parent are passed through unchanged. Each parent keeps
+        the best similarity of its children and results stay in relevance order.
+        
+        Args:
+            db: Database session
+            chunks: Retrieved (child) chunk dictionaries
+            
+        Returns:
+            List of parent (or unchanged) chunk dictionaries
+        """
+        parent_ids = {
+            chunk.get('metadata', {}).get('parent_id')
+            for chunk in chunks
+        }
+        parent_ids.discard(None)
+        if not parent_ids:
+            return chunks
+        
+        try:
+            stmt = select(ParentChunk).where(ParentChunk.id.in_(parent_ids))
+            result = await db.execute(stmt)
+            parents = {parent.id: parent for parent in result.scalars().all()}
+            
+            expanded = {}
+            for chunk in chunks:
+                parent_id = chunk.get('metadata', {}).get('parent_id')
+                parent = parents.get(parent_id)
+                
+                if parent is None:
+                    expanded[('chunk', chunk.get('chunk_id'))] = chunk
+                    continue
+                
+                key = ('parent', parent_id)
+                if key in expanded:
+                    entry = expanded[key]
+                    entry['similarity'] = max(entry['similarity'], chunk.get('similarity', 0.0))
+                    entry['metadata']['child_chunk_ids'].append(chunk.get('chunk_id'))
+                    continue
+                
+                expanded[key] = {
+                    'chunk_id': chunk.get('chunk_id'),
+                    'similarity': chunk.get('similarity', 0.0),
+                    'content': parent.content,
+                    'metadata': {
+                        **(parent.extra_metadata or {}),
+                        'chunk_index': parent.parent_index,
+                        'parent_id': parent.id,
+                        'child_chunk_ids': [chunk.get('chunk_id')]
+                    },
+                    'asset_id': parent.asset_id
+                }
+            
+            results = sorted(expanded.values(), key=lambda c: c.get('similarity', 0.0), reverse=True)
+            logger.info(f"Expanded {len(chunks)} child chunks to {len(results)} parent windows")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error expanding parent chunks: {str(e)}")
+            raise
+    
     def _build_context(self, chunks: List[Dict[str, Any]]) -> str:
         """
-        Build context string from chunks.
+        Build context string from chunks or packed segments.
         
         Args:
-            chunks: List of chunk dictionaries
+            chunks: List of chunk (or segment) dictionaries
             
         Returns:
             Formatted context string
@@ -144,6 +235,7 @@ Answer:"""
             sources.append({
                 'document_name': metadata.get('document_name', 'Unknown'),
                 'chunk_index': metadata.get('chunk_index', 0),
+                'page_number': metadata.get('page_number'),
                 'similarity': chunk.get('similarity', 0.0),
                 'asset_id': chunk.get('asset_id')
             })
@@ -1,9 +1,10 @@
 """
 Text Chunking Service.
-Handles splitting text into chunks using LangChain.
+Handles splitting text into chunks.
 """
-from typing import List, Dict, Any
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from typing import List, Dict, Any, Tuple, Optional, AsyncIterator
+from bisect import bisect_right
+from backend.services.text_splitter import RecursiveTextSplitter
 from backend.config import settings
 import logging
 
@@ -16,7 +17,9 @@ class ChunkingService:
     def __init__(
         self,
         chunk_size: int = None,
-        chunk_overlap: int = None
+        chunk_overlap: int = None,
+        parent_chunk_size: int = None,
+        length_unit: str = None
     ):
         """
         Initialize chunking service.
@@ -24,24 +27,40 @@ class ChunkingService:
         Args:
             chunk_size: Size of each chunk (defaults to settings)
             chunk_overlap: Overlap between chunks (defaults to settings)
+            parent_chunk_size: Size of parent windows (defaults to settings, 0 disables)
+            length_unit: "chars" or "tokens", unit of the sizes above (defaults to settings)
         """
         self.chunk_size = chunk_size or settings.chunk_size
         self.chunk_overlap = chunk_overlap or settings.chunk_overlap
+        self.parent_chunk_size = parent_chunk_size or settings.parent_chunk_size
+        self.length_unit = length_unit or settings.chunk_length_unit
         
         # Initialize text splitter
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        self.text_splitter = RecursiveTextSplitter(
             chunk_size=self.chunk_size,
             chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""]
+            length_unit=self.length_unit
         )
         
-        logger.info(f"Chunking service initialized (size={self.chunk_size}, overlap={self.chunk_overlap})")
+        # Parent windows do not overlap so each child belongs to exactly one parent
+        self.parent_splitter = None
+        if self.parent_chunk_size:
+            self.parent_splitter = RecursiveTextSplitter(
+                chunk_size=self.parent_chunk_size,
+                chunk_overlap=0,
+                length_unit=self.length_unit
+            )
+        
+        logger.info(
+            f"Chunking service initialized (size={self.chunk_size}, "
+            f"overlap={self.chunk_overlap}, unit={self.length_unit})"
+        )
     
     async def chunk_text(
         self,
         text: str,
-        metadata: Dict[str, Any] = None
+        metadata: Dict[str, Any] = None,
+        pages: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Split text into chunks with metadata.
@@ -49,25 +68,32 @@ class ChunkingService:
         Args:
             text: Text to chunk
             metadata: Optional base metadata for all chunks
+            pages: Optional page offsets from the document loader; chunks
+                   then carry the 'page_number' they start on
             
         Returns:
             List of chunk dictionaries with 'content' and 'metadata'
         """
         try:
             # Split text
-            text_chunks = self.text_splitter.split_text(text)
+            text_chunks = self._split_with_offsets(self.text_splitter, text)
             
             # Create chunk objects with metadata
             chunks = []
             base_metadata = metadata or {}
+            page_starts = [page['start'] for page in pages] if pages else None
             
-            for i, chunk_text in enumerate(text_chunks):
+            for i, (chunk_text, start_index, end_index) in enumerate(text_chunks):
                 chunk_metadata = {
                     **base_metadata,
                     'chunk_index': i,
                     'total_chunks': len(text_chunks),
-                    'chunk_size': len(chunk_text)
+                    'chunk_size': len(chunk_text),
+                    'start_index': start_index,
+                    'end_index': end_index
                 }
+                if page_starts:
+                    chunk_metadata['page_number'] = self._page_number(pages, page_starts, start_index)
                 
                 chunks.append({
                     'content': chunk_text,
@@ -85,7 +111,8 @@ class ChunkingService:
         self,
         text: str,
         document_name: str,
-        additional_metadata: Dict[str, Any] = None
+        additional_metadata: Dict[str, Any] = None,
+        pages: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Chunk document with automatic metadata.
@@ -94,6 +121,7 @@ class ChunkingService:
             text: Document text
             document_name: Name of document
             additional_metadata: Optional additional metadata
+            pages: Optional page offsets from the document loader
             
         Returns:
             List of chunks with metadata
@@ -103,4 +131,293 @@ class ChunkingService:
             **(additional_metadata or {})
         }
         
-        return await self.chunk_text(text, metadata)
+        return await self.chunk_text(text, metadata, pages)
+    
+    async def chunk_document_hierarchy(
+        self,
+        text: str,
+        document_name: str,
+        additional_metadata: Dict[str, Any] = None,
+        pages: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Chunk document into parent windows and small child chunks.
+        
+        Children are split inside each parent and carry 'parent_index' in
+        their metadata; 'chunk_index' stays global across the document.
+        
+        Args:
+            text: Document text
+            document_name: Name of document
+            additional_metadata: Optional additional metadata
+            pages: Optional page offsets from the document loader
+            
+        Returns:
+            Tuple of (parents, children) chunk lists
+            
+        Raises:
+            ValueError: If parent windows are not configured
+        """
+        if not self.parent_splitter:
+            raise ValueError("Parent chunking is disabled (PARENT_CHUNK_SIZE is 0)")
+        
+        try:
+            base_metadata = {
+                'document_name': document_name,
+                **(additional_metadata or {})
+            }
+            
+            parent_texts = self._split_with_offsets(self.parent_splitter, text)
+            page_starts = [page['start'] for page in pages] if pages else None
+            
+            parents = []
+            children = []
+            for parent_index, (parent_text, parent_start, parent_end) in enumerate(parent_texts):
+                parent_metadata = {
+                    **base_metadata,
+                    'parent_index': parent_index,
+                    'total_parents': len(parent_texts),
+                    'chunk_size': len(parent_text),
+                    'start_index': parent_start,
+                    'end_index': parent_end
+                }
+                if page_starts:
+                    parent_metadata['page_number'] = self._page_number(pages, page_starts, parent_start)
+                parents.append({'content': parent_text, 'metadata': parent_metadata})
+                
+                for child_text, child_start, child_end in self.text_splitter.split(parent_text):
+                    child_metadata = {
+                        **base_metadata,
+                        'chunk_index': len(children),
+                        'parent_index': parent_index,
+                        'chunk_size': len(child_text),
+                        'start_index': parent_start + child_start,
+                        'end_index': parent_start + child_end
+                    }
+                    if page_starts:
+                        child_metadata['page_number'] = self._page_number(
+                            pages, page_starts, parent_start + child_start
+                        )
+                    children.append({'content': child_text, 'metadata': child_metadata})
+            
+            for child in children:
+                child['metadata']['total_chunks'] = len(children)
+            
+            logger.info(
+                f"Created {len(parents)} parent windows and {len(children)} child chunks "
+                f"from text ({len(text)} characters)"
+            )
+            return parents, children
+            
+        except Exception as e:
+            logger.error(f"Error chunking document hierarchy: {str(e)}")
+            raise
+    
+    def document_chunker(
+        self,
+        document_name: str,
+        additional_metadata: Dict[str, Any] = None
+    ) -> "DocumentChunker":
+        """
+        Create an incremental chunker for a document given as text windows.
+        
+        Args:
+            document_name: Name of document
+            additional_metadata: Optional additional metadata
+            
+        Returns:
+            DocumentChunker to feed() windows to in order
+        """
+        return DocumentChunker(self, document_name, additional_metadata)
+    
+    async def stream_document(
+        self,
+        windows: AsyncIterator[Dict[str, Any]],
+        document_name: str,
+        additional_metadata: Dict[str, Any] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Chunk a document given as consecutive text windows.
+        
+        Produces the same chunks as chunk_document / chunk_document_hierarchy
+        on the concatenated text (without 'total_chunks', which is unknown
+        until the end) while holding only the current window in memory.
+        With parent windows enabled, each child carries its parent chunk
+        dict under 'parent' (shared by siblings).
+        
+        Args:
+            windows: Windows from DocumentLoaderService.iter_document_windows
+            document_name: Name of document
+            additional_metadata: Optional additional metadata
+            
+        Yields:
+            Chunk dictionaries with 'content' and 'metadata', in order
+        """
+        chunker = self.document_chunker(document_name, additional_metadata)
+        async for window in windows:
+            for chunk in chunker.feed(window):
+                yield chunk
+        for chunk in chunker.finish():
+            yield chunk
+    
+    @staticmethod
+    def _split_with_offsets(
+        splitter: RecursiveTextSplitter,
+        text: str
+    ) -> List[Tuple[str, int, int]]:
+        """
+        Split text and keep each chunk's character offsets in the source.
+        
+        Args:
+            splitter: Text splitter
+            text: Text to split
+            
+        Returns:
+            List of (chunk_text, start_index, end_index)
+        """
+        return list(splitter.split(text))
+    
+    @staticmethod
+    def _page_number(
+        pages: List[Dict[str, Any]],
+        page_starts: List[int],
+        offset: int
+    ) -> int:
+        """
+        Find the page containing a character offset.
+        
+        Args:
+            pages: Page offsets ([{'page_number', 'start', 'end'}])
+            page_starts: Start offset of each page, ascending
+            offset: Character offset in the document text
+            
+        Returns:
+            Page number
+        """
+        position = max(bisect_right(page_starts, offset) - 1, 0)
+        return pages[position]['page_number']
+
+
+class DocumentChunker:
+    """
+    Incremental chunking of one document, window by window.
+    
+    The last chunk of each window may be cut short by the window end, so
+    the text from where that chunk's window began is carried into the next
+    window and split again. Chunk placement depends only on the text from a
+    window start onwards, so the result matches splitting the whole text.
+    """
+    
+    def __init__(
+        self,
+        service: ChunkingService,
+        document_name: str,
+        additional_metadata: Dict[str, Any] = None
+    ):
+        """
+        Initialize document chunker.
+        
+        Args:
+            service: Chunking service providing the splitters
+            document_name: Name of document
+            additional_metadata: Optional additional metadata
+        """
+        self.text_splitter = service.text_splitter
+        self.parent_splitter = service.parent_splitter
+        self.base_metadata = {
+            'document_name': document_name,
+            **(additional_metadata or {})
+        }
+        
+        self.chunk_index = 0
+        self.parent_index = 0
+        self._carry = ""
+        self._carry_start = 0
+        self._pages: List[Dict[str, Any]] = []
+    
+    def feed(self, window: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Chunk the next window.
+        
+        Args:
+            window: Window with 'text', global 'start' and 'pages' offsets
+            
+        Returns:
+            Chunks completed by this window, in order
+        """
+        if not self._carry:
+            self._carry_start = window['start']
+        text = self._carry + window['text']
+        self._pages = [page for page in self._pages if page['end'] > self._carry_start] + window['pages']
+        
+        spans, resume = (self.parent_splitter or self.text_splitter).split_prefix(text)
+        chunks = self._chunks(spans)
+        
+        self._carry = text[resume:]
+        self._carry_start += resume
+        return chunks
+    
+    def finish(self) -> List[Dict[str, Any]]:
+        """
+        Chunk the text left after the last window.
+        
+        Returns:
+            Remaining chunks, in order
+        """
+        spans = list((self.parent_splitter or self.text_splitter).split(self._carry))
+        self._carry = ""
+        return self._chunks(spans)
+    
+    def _chunks(self, spans: List[Tuple[str, int, int]]) -> List[Dict[str, Any]]:
+        """
+        Turn spans of the carried text into chunk dictionaries.
+        
+        Args:
+            spans: (text, start, end) with offsets into the carried text
+            
+        Returns:
+            Chunks (children with their 'parent' when parents are enabled)
+        """
+        pages = self._pages
+        page_starts = [page['start'] for page in pages]
+        
+        chunks = []
+        for span_text, start, end in spans:
+            span_start = self._carry_start + start
+            span_metadata = {
+                **self.base_metadata,
+                'chunk_size': len(span_text),
+                'start_index': span_start,
+                'end_index': self._carry_start + end
+            }
+            if pages:
+                span_metadata['page_number'] = ChunkingService._page_number(pages, page_starts, span_start)
+            
+            if not self.parent_splitter:
+                span_metadata['chunk_index'] = self.chunk_index
+                chunks.append({'content': span_text, 'metadata': span_metadata})
+                self.chunk_index += 1
+                continue
+            
+            span_metadata['parent_index'] = self.parent_index
+            parent = {'content': span_text, 'metadata': span_metadata}
+            
+            for child_text, child_start, child_end in self.text_splitter.split(span_text):
+                child_metadata = {
+                    **self.base_metadata,
+                    'chunk_index': self.chunk_index,
+                    'parent_index': self.parent_index,
+                    'chunk_size': len(child_text),
+                    'start_index': span_start + child_start,
+                    'end_index': span_start + child_end
+                }
+                if pages:
+                    child_metadata['page_number'] = ChunkingService._page_number(
+                        pages, page_starts, span_start + child_start
+                    )
+                chunks.append({'content': child_text, 'metadata': child_metadata, 'parent': parent})
+                self.chunk_index += 1
+            
+            self.parent_index += 1
+        
+        return chunks
@@ -0,0 +1,246 @@
+"""
+Context Compression Service.
+Extractive compression of retrieved chunks before answer generation.
+"""
+from typing import List, Dict, Any, Tuple
+import re
+import numpy as np
+from backend.services.token_estimator import TokenEstimator
+from backend.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ContextCompressorService:
+    """Service for keeping only the query-relevant sentences of chunks."""
+
+    # Sentence boundaries for Arabic and English text
+    SENTENCE_PATTERN = re.compile(r'(?<=[.!?؟؛])\s+|\n+')
+    WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+    # Arabic diacritics and tatweel
+    DIACRITICS_PATTERN = re.compile(r'[ً-ْـ]')
+    ARABIC_NORMALIZATION = str.maketrans({
+        'أ': 'ا', 'إ': 'ا', 'آ': 'ا',
+        'ة': 'ه', 'ى': 'ي'
+    })
+
+    STOPWORDS = {
+        # English
+        'the', 'and', 'for', 'are', 'was', 'what', 'which', 'who', 'how',
+        'why', 'when', 'where', 'that', 'this', 'with', 'from', 'about',
+        'does', 'did', 'can', 'is', 'of', 'in', 'on', 'to', 'an', 'or', 'be',
+        # Arabic (normalized)
+        'في', 'من', 'علي', 'الي', 'عن', 'ما', 'ماذا', 'هل', 'كيف', 'لماذا',
+        'متي', 'اين', 'هو', 'هي', 'هذا', 'هذه', 'ذلك', 'التي', 'الذي', 'او',
+        'مع', 'ان', 'كان', 'تم'
+    }
+
+    # Weight of the chunk's retrieval similarity in each sentence's score
+    SIMILARITY_WEIGHT = 0.5
+
+    def __init__(self, token_budget: int = None):
+        """
+        Initialize context compressor.
+
+        Args:
+            token_budget: Token budget for kept sentences (defaults to settings)
+        """
+        self.token_budget = token_budget or settings.context_compression_budget
+
+    def compress(
+        self,
+        query: str,
+        chunks: List[Dict[str, Any]],
+        token_budget: int = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Keep the highest-scoring sentences of each chunk within a budget.
+
+        Sentences are scored by IDF-weighted overlap with the query terms plus
+        the similarity of the chunk they come from. Kept sentences stay in
+        their original chunk and order, so sources remain correct.
+
+        Args:
+            query: User question
+            chunks: Retrieved chunk dictionaries
+            token_budget: Optional override of the configured budget
+
+        Returns:
+            Tuple of (compressed chunks, stats)
+        """
+        budget = token_budget or self.token_budget
+        tokens_in = sum(TokenEstimator.estimate(c.get('content', '')) for c in chunks)
+
+        # Flatten sentences, remembering which chunk each came from
+        sentences = []
+        owners = []
+        for chunk_pos, chunk in enumerate(chunks):
+            for sentence in self.SENTENCE_PATTERN.split(chunk.get('content', '')):
+                sentence = sentence.strip()
+                if sentence:
+                    sentences.append(sentence)
+                    owners.append(chunk_pos)
+
+        query_terms = sorted(set(self._terms(query)))
+        if not sentences or not query_terms or tokens_in <= budget:
+            return chunks, self._stats(chunks, chunks, tokens_in, tokens_in)
+
+        scores = self._score_sentences(sentences, owners, chunks, query_terms)
+
+        # Greedy selection by score, skipping sentences repeated across chunks
+        selected = set()
+        seen = set()
+        used = 0
+        for idx in np.argsort(-scores, kind='stable'):
+            if scores[idx] <= 0:
+                break
+
+            key = ' '.join(self._terms(sentences[idx]))
+            if key in seen:
+                continue
+
+            tokens = TokenEstimator.estimate(sentences[idx])
+            if used + tokens > budget:
+                continue
+
+            selected.add(int(idx))
+            seen.add(key)
+            used += tokens
+
+        if not selected:
+            # Nothing scored above zero or fit the budget; generating from an
+            # empty context is worse than sending uncompressed chunks
+            fallback = self._top_chunks(chunks, budget)
+            tokens_out = sum(TokenEstimator.estimate(c.get('content', '')) for c in fallback)
+            logger.info(
+                f"No sentences selected, keeping top {len(fallback)} of "
+                f"{len(chunks)} chunks uncompressed"
+            )
+            return fallback, self._stats(chunks, fallback, tokens_in, tokens_out)
+
+        # Rebuild chunks from their selected sentences, in original order
+        kept_by_chunk: Dict[int, List[str]] = {}
+        for idx in sorted(selected):
+            kept_by_chunk.setdefault(owners[idx], []).append(sentences[idx])
+
+        compressed = []
+        for chunk_pos, chunk in enumerate(chunks):
+            kept = kept_by_chunk.get(chunk_pos)
+            if not kept:
+                continue
+            compressed.append({
+                **chunk,
+                'content': ' ... '.join(kept),
+                'metadata': {**chunk.get('metadata', {}), 'compressed': True}
+            })
+
+        logger.info(
+            f"Compressed {len(chunks)} chunks to {len(compressed)} "
+            f"({tokens_in} -> {used} tokens, {len(selected)}/{len(sentences)} sentences)"
+        )
+        return compressed, self._stats(chunks, compressed, tokens_in, used)
+
+    def _score_sentences(
+        self,
+        sentences: List[str],
+        owners: List[int],
+        chunks: List[Dict[str, Any]],
+        query_terms: List[str]
+    ) -> np.ndarray:
+        """
+        Score sentences against query terms.
+
+        Args:
+            sentences: Sentence texts
+            owners: Index of the owning chunk for each sentence
+            chunks: Retrieved chunk dictionaries
+            query_terms: Sorted unique normalized query terms
+
+        Returns:
+            Array of scores, one per sentence
+        """
+        term_index = {term: j for j, term in enumerate(query_terms)}
+
+        # Sentence x query-term presence matrix
+        presence = np.zeros((len(sentences), len(query_terms)), dtype=np.float32)
+        lengths = np.empty(len(sentences), dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            terms = self._terms(sentence)
+            lengths[i] = len(terms)
+            for term in terms:
+                j = term_index.get(term)
+                if j is not None:
+                    presence[i, j] = 1.0
+
+        # Rare query terms are more informative than ones in every sentence
+        document_freq = presence.sum(axis=0)
+        idf = np.log1p(len(sentences) / (1.0 + document_freq))
+
+        lexical = presence @ idf
+        lexical /= np.sqrt(lengths + 1.0)
+        if lexical.max() > 0:
+            lexical /= lexical.max()
+
+        similarity = np.array(
+            [chunks[owner].get('similarity', 0.0) for owner in owners],
+            dtype=np.float32
+        )
+
+        # Similarity keeps sentences with no shared term (e.g. cross-language
+        # questions) eligible, ranked behind strong lexical matches
+        return lexical + self.SIMILARITY_WEIGHT * similarity
+
+    @staticmethod
+    def _top_chunks(chunks: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
+        """
+        Take chunks in retrieval order while they fit the budget.
+
+        Args:
+            chunks: Retrieved chunk dictionaries, most relevant first
+            budget: Token budget
+
+        Returns:
+            Leading chunks within budget (always at least one)
+        """
+        kept = []
+        used = 0
+        for chunk in chunks:
+            tokens = TokenEstimator.estimate(chunk.get('content', ''))
+            if kept and used + tokens > budget:
+                break
+            kept.append(chunk)
+            used += tokens
+        return kept
+
+    def _terms(self, text: str) -> List[str]:
+        """
+        Extract normalized content terms from text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            List of normalized terms
+        """
+        text = self.DIACRITICS_PATTERN.sub('', text.lower()).translate(self.ARABIC_NORMALIZATION)
+        return [
+            word for word in self.WORD_PATTERN.findall(text)
+            if len(word) > 1 and word not in self.STOPWORDS
+        ]
+
+    @staticmethod
+    def _stats(
+        chunks_in: List[Dict[str, Any]],
+        chunks_out: List[Dict[str, Any]],
+        tokens_in: int,
+        tokens_out: int
+    ) -> Dict[str, Any]:
+        """Build compression statistics."""
+        return {
+            'chunks_in': len(chunks_in),
+            'chunks_out': len(chunks_out),
+            'tokens_in': tokens_in,
+            'tokens_out': tokens_out
+        }
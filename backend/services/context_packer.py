@@ -0,0 +1,193 @@
+"""
+Context Packing Service.
+Assembles retrieved chunks into a compact, token-budgeted context.
+"""
+from typing import List, Dict, Any, Tuple
+from backend.services.token_estimator import TokenEstimator
+from backend.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ContextPackerService:
+    """Service for merging, de-duplicating and budgeting context chunks."""
+
+    # Below this many tokens a truncated segment is not worth including
+    MIN_SEGMENT_TOKENS = 50
+
+    # Shorter suffix/prefix matches are treated as coincidence, not overlap
+    MIN_OVERLAP_CHARS = 10
+
+    def __init__(
+        self,
+        token_budget: int = None,
+        max_overlap: int = None
+    ):
+        """
+        Initialize context packer.
+
+        Args:
+            token_budget: Maximum context tokens (defaults to settings)
+            max_overlap: Longest overlap to search for between adjacent
+                         chunks, in characters (defaults to 2x chunk overlap)
+        """
+        self.token_budget = token_budget or settings.context_token_budget
+        overlap_chars = settings.chunk_overlap
+        if settings.chunk_length_unit == "tokens":
+            overlap_chars = int(overlap_chars * TokenEstimator.ASCII_CHARS_PER_TOKEN)
+        self.max_overlap = max_overlap or overlap_chars * 2
+
+    def pack(
+        self,
+        chunks: List[Dict[str, Any]],
+        token_budget: int = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Pack chunks into context segments.
+
+        Adjacent chunks of the same asset are merged with their overlapping
+        text removed, segments are ordered by relevance and added until the
+        token budget is exhausted.
+
+        Args:
+            chunks: Retrieved chunk dictionaries
+            token_budget: Optional override of the configured budget
+
+        Returns:
+            Tuple of (segments, stats). Each segment has 'content',
+            'metadata', 'similarity', 'asset_id' and the member 'chunks'
+            whose text made it into 'content'.
+        """
+        budget = self.token_budget if token_budget is None else token_budget
+        tokens_in = sum(TokenEstimator.estimate(c.get('content', '')) for c in chunks)
+
+        segments = self._merge_adjacent(chunks)
+        segments.sort(key=lambda s: s['similarity'], reverse=True)
+
+        packed = []
+        used = 0
+        for segment in segments:
+            remaining = budget - used
+            if remaining < self.MIN_SEGMENT_TOKENS:
+                break
+
+            tokens = TokenEstimator.estimate(segment['content'])
+            if tokens > remaining:
+                segment['content'] = TokenEstimator.truncate(segment['content'], remaining)
+                segment['metadata']['truncated'] = True
+                self._drop_cut_chunks(segment)
+                tokens = TokenEstimator.estimate(segment['content'])
+
+            packed.append(segment)
+            used += tokens
+
+        stats = {
+            'chunks_in': len(chunks),
+            'segments_out': len(packed),
+            'context_tokens_in': tokens_in,
+            'context_tokens_out': used
+        }
+
+        logger.info(
+            f"Packed {len(chunks)} chunks into {len(packed)} segments "
+            f"({tokens_in} -> {used} tokens)"
+        )
+        return packed, stats
+
+    def _merge_adjacent(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Merge runs of consecutive chunks from the same asset.
+
+        Args:
+            chunks: Retrieved chunk dictionaries
+
+        Returns:
+            List of merged segments
+        """
+        # Group by asset and order each group by position in the document
+        by_asset: Dict[Any, List[Dict[str, Any]]] = {}
+        for chunk in chunks:
+            by_asset.setdefault(chunk.get('asset_id'), []).append(chunk)
+
+        segments = []
+        for asset_chunks in by_asset.values():
+            asset_chunks.sort(key=lambda c: c.get('metadata', {}).get('chunk_index', 0))
+
+            current = None
+            last_index = None
+            for chunk in asset_chunks:
+                index = chunk.get('metadata', {}).get('chunk_index', 0)
+
+                if current is not None and index == last_index:
+                    # Same chunk retrieved twice
+                    continue
+
+                if current is not None and index == last_index + 1:
+                    content = chunk.get('content', '')
+                    overlap = self._find_overlap(current['content'], content)
+                    separator = '' if overlap else '\n'
+                    current['chunk_offsets'].append(len(current['content']) + len(separator))
+                    current['content'] += separator + content[overlap:]
+                    current['chunks'].append(chunk)
+                    current['similarity'] = max(current['similarity'], chunk.get('similarity', 0.0))
+                    current['metadata']['chunk_indices'].append(index)
+                else:
+                    current = self._new_segment(chunk)
+                    segments.append(current)
+
+                last_index = index
+
+        return segments
+
+    def _find_overlap(self, previous: str, following: str) -> int:
+        """
+        Find the length of the longest suffix of previous that prefixes following.
+
+        Args:
+            previous: Earlier chunk text
+            following: Later chunk text
+
+        Returns:
+            Number of overlapping characters
+        """
+        start = max(0, len(previous) - self.max_overlap)
+        for i in range(start, len(previous) - self.MIN_OVERLAP_CHARS + 1):
+            if following.startswith(previous[i:]):
+                return len(previous) - i
+        return 0
+
+    @staticmethod
+    def _drop_cut_chunks(segment: Dict[str, Any]) -> None:
+        """
+        Keep only the member chunks whose own text survived truncation.
+
+        Args:
+            segment: Segment whose content has just been truncated
+        """
+        length = len(segment['content'])
+        kept = [
+            i for i, offset in enumerate(segment['chunk_offsets'])
+            if offset < length
+        ]
+        segment['chunks'] = [segment['chunks'][i] for i in kept]
+        segment['chunk_offsets'] = [segment['chunk_offsets'][i] for i in kept]
+        segment['metadata']['chunk_indices'] = [
+            segment['metadata']['chunk_indices'][i] for i in kept
+        ]
+
+    @staticmethod
+    def _new_segment(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a segment from a single chunk."""
+        metadata = dict(chunk.get('metadata', {}))
+        metadata['chunk_indices'] = [metadata.get('chunk_index', 0)]
+
+        return {
+            'content': chunk.get('content', ''),
+            'metadata': metadata,
+            'similarity': chunk.get('similarity', 0.0),
+            'asset_id': chunk.get('asset_id'),
+            'chunks': [chunk],
+            # Where each member's own text starts within 'content'
+            'chunk_offsets': [0]
+        }
@@ -2,10 +2,17 @@
 Document Loader Service.
 Handles loading and extracting text from various document formats.
 """
-from typing import Optional
+from typing import Optional, Dict, Any, AsyncIterator, List
+from collections import deque
+import asyncio
+import codecs
+import math
 import os
 import logging
 from pathlib import Path
+from backend.parsing import extractors
+from backend.services.parser_pool import ParserPool
+from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +20,13 @@ logger = logging.getLogger(__name__)
 class DocumentLoaderService:
     """Service for loading documents and extracting text."""
     
+    # Characters read per window when streaming plain text files
+    TXT_WINDOW_CHARS = 1_000_000
+    
+    # Bump when extracted text changes for the same file, so cached
+    # extracted-text artifacts of older versions are no longer used
+    LOADER_VERSION = 1
+    
     @staticmethod
     async def load_document(file_path: str) -> str:
         """
@@ -24,6 +38,27 @@ class DocumentLoaderService:
         Returns:
             Extracted text content
             
+        Raises:
+            ValueError: If file type is not supported
+        """
+        document = await DocumentLoaderService.load_document_with_pages(file_path)
+        return document['text']
+    
+    @staticmethod
+    async def load_document_with_pages(file_path: str) -> Dict[str, Any]:
+        """
+        Load document and extract text with page metadata.
+        
+        PDF and DOCX parsing runs in the parser process pool so the event
+        loop is never blocked by a large file.
+        
+        Args:
+            file_path: Path to document file
+            
+        Returns:
+            Dict with 'text', 'pages' ([{'page_number', 'start', 'end'}]
+            character offsets into text) and 'page_count'
+            
         Raises:
             ValueError: If file type is not supported
         """
@@ -39,41 +74,232 @@ class DocumentLoaderService:
             raise ValueError(f"Unsupported file type: {file_ext}")
     
     @staticmethod
-    async def _load_pdf(file_path: str) -> str:
+    async def iter_document_windows(
+        file_path: str,
+        window_pages: int = None,
+        resume_after: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Load PDF file and extract text.
+        Extract a document as a sequence of consecutive text windows.
+        
+        Windows concatenate to exactly the text load_document_with_pages
+        returns, so only one window (plus prefetched ones) is held in
+        memory. PDFs are read window_pages pages at a time, with up to one
+        window per parser worker extracted ahead; text files are read in
+        fixed-size blocks; DOCX is a single window.
+        
+        Extraction can continue where an earlier, interrupted one stopped:
+        given the last window it produced, only the rest is extracted.
+        
+        Args:
+            file_path: Path to document file
+            window_pages: PDF pages per window (defaults to settings)
+            resume_after: Last window of an earlier extraction of this file
+            
+        Yields:
+            Dict with 'text', 'start' (offset of the window in the full
+            text), 'pages' (offsets into the full text) and 'page_count'
+            (total pages of the document)
+            
+        Raises:
+            ValueError: If file type is not supported
+        """
+        file_ext = Path(file_path).suffix.lower()
+        
+        # Characters (and PDF pages) already extracted
+        offset = 0
+        first_page = 0
+        if resume_after:
+            offset = resume_after['start'] + len(resume_after['text'])
+            if resume_after['pages']:
+                first_page = resume_after['pages'][-1]['page_number']
+        
+        if file_ext == '.pdf':
+            parts = DocumentLoaderService._iter_pdf_windows(
+                file_path, window_pages or settings.ingestion_window_pages, first_page
+            )
+        elif file_ext == '.txt':
+            parts = DocumentLoaderService._iter_txt_windows(file_path, skip_chars=offset)
+        elif file_ext == '.docx':
+            if resume_after:
+                return  # Extracted as a single window
+            parts = DocumentLoaderService._iter_single_window(file_path)
+        else:
+            raise ValueError(f"Unsupported file type: {file_ext}")
+        
+        # Re-base window offsets onto the full document text
+        async for part in parts:
+            text = part['text']
+            if not text:
+                continue
+            
+            separator = extractors.PAGE_SEPARATOR if offset and part['pages'] else ""
+            shift = offset + len(separator)
+            yield {
+                'text': separator + text,
+                'start': offset,
+                'pages': [
+                    {**page, 'start': page['start'] + shift, 'end': page['end'] + shift}
+                    for page in part['pages']
+                ],
+                'page_count': part['page_count']
+            }
+            offset += len(separator) + len(text)
+    
+    @staticmethod
+    async def _iter_pdf_windows(
+        file_path: str,
+        window_pages: int,
+        first_page: int = 0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Extract PDF page windows in order, prefetching one per parser worker.
         
         Args:
             file_path: Path to PDF file
+            window_pages: Pages per window
+            first_page: Index of the first page to extract
             
-        Returns:
-            Extracted text
+        Yields:
+            Extracted window dicts (offsets relative to the window)
         """
+        pool = ParserPool.get_instance()
+        page_count = await pool.run(extractors.count_pdf_pages, file_path)
+        ranges = deque((start, start + window_pages) for start in range(first_page, page_count, window_pages))
+        
+        pending = deque()
         try:
-            from pypdf import PdfReader
+            while ranges or pending:
+                while ranges and len(pending) < pool.max_workers:
+                    start, end = ranges.popleft()
+                    pending.append((start, asyncio.ensure_future(
+                        pool.run(extractors.extract_pdf_pages, file_path, start, end)
+                    )))
+                
+                start, task = pending.popleft()
+                document = extractors.assemble_pages(await task, first_page=start + 1)
+                document['page_count'] = page_count
+                yield document
+        finally:
+            for _, task in pending:
+                task.cancel()
+    
+    @staticmethod
+    async def _iter_txt_windows(file_path: str, skip_chars: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Read a text file in blocks.
+        
+        Args:
+            file_path: Path to text file
+            skip_chars: Leading characters not to yield (already extracted)
             
-            reader = PdfReader(file_path)
-            text_parts = []
+        Yields:
+            Window dicts (no pages)
+        """
+        encoding = await asyncio.to_thread(DocumentLoaderService._detect_txt_encoding, file_path)
+        
+        with open(file_path, 'r', encoding=encoding) as f:
+            while skip_chars > 0:
+                skipped = await asyncio.to_thread(f.read, min(skip_chars, DocumentLoaderService.TXT_WINDOW_CHARS))
+                if not skipped:
+                    break
+                skip_chars -= len(skipped)
             
-            for page_num, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
-                if text.strip():
-                    text_parts.append(text)
+            while True:
+                text = await asyncio.to_thread(f.read, DocumentLoaderService.TXT_WINDOW_CHARS)
+                if not text:
+                    break
+                yield {'text': text, 'pages': [], 'page_count': 0}
+    
+    @staticmethod
+    def _detect_txt_encoding(file_path: str) -> str:
+        """
+        Check whether a file is valid UTF-8 without loading it whole.
+        
+        Args:
+            file_path: Path to text file
             
-            full_text = "\n\n".join(text_parts)
-            logger.info(f"Extracted {len(full_text)} characters from PDF ({len(reader.pages)} pages)")
+        Returns:
+            'utf-8', or 'latin-1' as fallback (same rule as _read_txt)
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            with open(file_path, 'rb') as f:
+                while block := f.read(1024 * 1024):
+                    decoder.decode(block)
+            decoder.decode(b'', final=True)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'latin-1'
+    
+    @staticmethod
+    async def _iter_single_window(file_path: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a whole document as one window (formats without page access)."""
+        yield await DocumentLoaderService.load_document_with_pages(file_path)
+    
+    @staticmethod
+    async def _load_pdf(file_path: str) -> Dict[str, Any]:
+        """
+        Load PDF file and extract text.
+        
+        PDFs with at least PDF_PARALLEL_MIN_PAGES pages are split into page
+        ranges extracted concurrently by the parser workers.
+        
+        Args:
+            file_path: Path to PDF file
             
-            return full_text
+        Returns:
+            Extracted document dict
+        """
+        try:
+            pool = ParserPool.get_instance()
+            
+            page_count = await pool.run(extractors.count_pdf_pages, file_path)
+            if page_count >= settings.pdf_parallel_min_pages and pool.max_workers > 1:
+                # A few ranges per worker evens out pages of uneven density
+                range_count = min(pool.max_workers * 2, math.ceil(page_count / settings.pdf_min_pages_per_range))
+                range_size = math.ceil(page_count / range_count)
+                ranges = [(start, start + range_size) for start in range(0, page_count, range_size)]
+                
+                page_ranges = await asyncio.gather(*[
+                    pool.run(extractors.extract_pdf_pages, file_path, start, end)
+                    for start, end in ranges
+                ])
+                page_texts = [text for page_range in page_ranges for text in page_range]
+                document = extractors.assemble_pages(page_texts)
+                logger.info(f"Extracted {page_count} PDF pages in {len(ranges)} parallel ranges")
+            else:
+                document = await pool.run(extractors.extract_pdf, file_path)
+            
+            logger.info(
+                f"Extracted {len(document['text'])} characters from PDF "
+                f"({document['page_count']} pages)"
+            )
+            return document
             
         except Exception as e:
             logger.error(f"Error loading PDF: {str(e)}")
             raise
     
     @staticmethod
-    async def _load_txt(file_path: str) -> str:
+    async def _load_txt(file_path: str) -> Dict[str, Any]:
         """
         Load text file.
         
+        Args:
+            file_path: Path to text file
+            
+        Returns:
+            Extracted document dict (no pages)
+        """
+        text = await asyncio.to_thread(DocumentLoaderService._read_txt, file_path)
+        return {'text': text, 'pages': [], 'page_count': 0}
+    
+    @staticmethod
+    def _read_txt(file_path: str) -> str:
+        """
+        Read text file, falling back to latin-1 for non UTF-8 files.
+        
         Args:
             file_path: Path to text file
             
@@ -102,7 +328,7 @@ class DocumentLoaderService:
             raise
     
     @staticmethod
-    async def _load_docx(file_path: str) -> str:
+    async def _load_docx(file_path: str) -> Dict[str, Any]:
         """
         Load DOCX file and extract text.
         
@@ -110,22 +336,15 @@ class DocumentLoaderService:
             file_path: Path to DOCX file
             
         Returns:
-            Extracted text
+            Extracted document dict (no pages)
         """
         try:
-            from docx import Document
-            
-            doc = Document(file_path)
-            text_parts = []
-            
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    text_parts.append(para.text)
-            
-            full_text = "\n\n".join(text_parts)
-            logger.info(f"Extracted {len(full_text)} characters from DOCX ({len(doc.paragraphs)} paragraphs)")
-            
-            return full_text
+            document = await ParserPool.get_instance().run(extractors.extract_docx, file_path)
+            logger.info(
+                f"Extracted {len(document['text'])} characters from DOCX "
+                f"({document['paragraph_count']} paragraphs)"
+            )
+            return document
             
         except Exception as e:
             logger.error(f"Error loading DOCX: {str(e)}")
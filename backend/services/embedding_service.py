@@ -2,7 +2,8 @@
 Embedding Service.
 Handles generating embeddings using LLM provider.
 """
-from typing import List
+from typing import List, Optional
+import numpy as np
 from backend.providers.llm.factory import LLMProviderFactory
 import logging
 
@@ -20,7 +21,8 @@ class EmbeddingService:
     async def generate_embeddings(
         self,
         texts: List[str],
-        batch_size: int = 10
+        batch_size: int = 10,
+        model: Optional[str] = None
     ) -> List[List[float]]:
         """
         Generate embeddings for list of texts.
@@ -28,6 +30,7 @@ class EmbeddingService:
         Args:
             texts: List of text strings
             batch_size: Batch size for processing
+            model: Embedding model to use instead of the configured one
             
         Returns:
             List of embedding vectors
@@ -38,7 +41,8 @@ class EmbeddingService:
             
             embeddings = await self.llm_provider.generate_embeddings(
                 texts=texts,
-                batch_size=batch_size
+                batch_size=batch_size,
+                model=model
             )
             
             logger.info(f"Generated {len(embeddings)} embeddings")
@@ -48,19 +52,29 @@ class EmbeddingService:
             logger.error(f"Error generating embeddings: {str(e)}")
             raise
     
-    async def generate_single_embedding(self, text: str) -> List[float]:
+    async def generate_single_embedding(self, text: str, model: Optional[str] = None) -> List[float]:
         """
         Generate embedding for single text.
         
         Args:
             text: Text string
+            model: Embedding model to use instead of the configured one
             
         Returns:
             Embedding vector
         """
-        embeddings = await self.generate_embeddings([text])
+        embeddings = await self.generate_embeddings([text], model=model)
         return embeddings[0] if embeddings else []
     
+    def get_embedding_model_name(self) -> str:
+        """
+        Get the identifier of the model producing embeddings.
+        
+        Returns:
+            Embedding model name
+        """
+        return getattr(self.llm_provider, 'embedding_model', self.llm_provider.get_model_name())
+    
     def get_embedding_dimension(self) -> int:
         """
         Get the embedding vector dimension.
@@ -69,3 +83,42 @@ class EmbeddingService:
             Dimension size
         """
         return self.llm_provider.get_embedding_dimension()
+    
+    @staticmethod
+    def compute_centroid(embeddings: List[List[float]]) -> List[float]:
+        """
+        Compute the mean direction of a set of embeddings.
+        
+        Vectors are L2-normalized before averaging so long and short chunks
+        weigh the same under cosine similarity.
+        
+        Args:
+            embeddings: List of embedding vectors
+            
+        Returns:
+            Centroid vector (empty if no embeddings)
+        """
+        if len(embeddings) == 0:
+            return []
+        
+        return (EmbeddingService.sum_normalized(embeddings) / len(embeddings)).tolist()
+    
+    @staticmethod
+    def sum_normalized(embeddings: List[List[float]]) -> np.ndarray:
+        """
+        Sum of L2-normalized embeddings.
+        
+        Lets a centroid be accumulated batch by batch: the centroid of all
+        batches is the total sum divided by the total count.
+        
+        Args:
+            embeddings: Non-empty list of embedding vectors
+            
+        Returns:
+            Summed vector
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        
+        return (vectors / norms).sum(axis=0)
@@ -3,13 +3,19 @@ File Management Service.
 Handles file storage with project-based organization.
 """
 import os
+import re
+import json
+import time
 import uuid
 import shutil
+import asyncio
+import hashlib
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Any, AsyncIterator, Tuple, List, Set
 from backend.config import settings
 import logging
 import aiofiles
+import zstandard
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +23,20 @@ logger = logging.getLogger(__name__)
 class FileService:
     """Service for managing uploaded files."""
     
+    # Bytes read per iteration when streaming uploads to disk
+    STREAM_CHUNK_SIZE = 1024 * 1024
+    
+    # Compression level of extracted-text artifacts
+    EXTRACTED_TEXT_ZSTD_LEVEL = 3
+    
+    # Directory names inside upload_dir
+    PROJECT_DIR_PATTERN = re.compile(r"^project_(\d+)$")
+    EXTRACTED_DIR = ".extracted"
+    BLOBS_DIR = "blobs"
+    
+    # Tries to link an upload to a blob that concurrent releases keep removing
+    BLOB_LINK_ATTEMPTS = 3
+    
     def __init__(self):
         """Initialize file service."""
         self.upload_dir = Path(settings.upload_dir)
@@ -40,6 +60,96 @@ class FileService:
         project_dir.mkdir(parents=True, exist_ok=True)
         return project_dir
     
+    def get_blob_path(self, sha256: str) -> Path:
+        """
+        Get content-addressed storage path for a file hash.
+        
+        Args:
+            sha256: Hex digest of file content
+            
+        Returns:
+            Path to blob (sharded by the first two hex characters)
+        """
+        return self.upload_dir / self.BLOBS_DIR / sha256[:2] / sha256
+    
+    def get_extracted_text_path(self, project_id: int, sha256: str, loader_version: int) -> Path:
+        """
+        Get path of the extracted-text artifact of a file.
+        
+        Args:
+            project_id: Project ID
+            sha256: Hex digest of file content
+            loader_version: DocumentLoaderService.LOADER_VERSION that produced it
+            
+        Returns:
+            Path inside the project's hidden .extracted directory
+        """
+        extracted_dir = self.get_project_dir(project_id) / self.EXTRACTED_DIR
+        extracted_dir.mkdir(exist_ok=True)
+        return extracted_dir / self.extracted_text_name(sha256, loader_version)
+    
+    @staticmethod
+    def extracted_text_name(sha256: str, loader_version: int) -> str:
+        """File name of an extracted-text artifact (its spools add ".<asset_id>.part")."""
+        return f"{sha256}.v{loader_version}.jsonl.zst"
+    
+    def encode_extracted_window(self, window: Dict[str, Any]) -> bytes:
+        """
+        Serialize one extracted window for appending to an artifact.
+        
+        Each window is a self-contained zstd frame holding one JSON line,
+        so an artifact can be appended to and read back window by window.
+        
+        Args:
+            window: Window dict ('text', 'start', 'pages', 'page_count')
+            
+        Returns:
+            Compressed frame
+        """
+        line = json.dumps(window, ensure_ascii=False) + "\n"
+        return zstandard.ZstdCompressor(level=self.EXTRACTED_TEXT_ZSTD_LEVEL).compress(line.encode("utf-8"))
+    
+    async def iter_extracted_windows(self, path: Path) -> AsyncIterator[Tuple[Dict[str, Any], int]]:
+        """
+        Read windows back from an extracted-text artifact.
+        
+        Args:
+            path: Artifact written with encode_extracted_window frames
+            
+        Yields:
+            (window, bytes of the file up to and including its frame);
+            reading stops at the first incomplete or corrupt frame
+        """
+        decompressor = zstandard.ZstdDecompressor()
+        frame = decompressor.decompressobj()
+        parts = []
+        frame_start = 0
+        read = 0
+        
+        async with aiofiles.open(path, 'rb') as f:
+            while block := await f.read(self.STREAM_CHUNK_SIZE):
+                read += len(block)
+                while block:
+                    try:
+                        parts.append(frame.decompress(block))
+                    except zstandard.ZstdError:
+                        logger.warning(f"Corrupt extracted-text frame in {path} at byte {frame_start}")
+                        return
+                    if not frame.eof:
+                        break
+                    
+                    frame_end = read - len(frame.unused_data)
+                    try:
+                        window = json.loads(b"".join(parts))
+                    except ValueError:
+                        return
+                    yield window, frame_end
+                    
+                    block = frame.unused_data
+                    frame_start = frame_end
+                    frame = decompressor.decompressobj()
+                    parts = []
+    
     def generate_unique_filename(self, original_filename: str) -> str:
         """
         Generate unique filename while preserving extension.
@@ -97,12 +207,177 @@ class FileService:
         
         return unique_filename, str(file_path)
     
-    async def delete_file(self, file_path: str) -> bool:
+    async def save_upload_stream(
+        self,
+        upload_file: Any,
+        filename: str,
+        project_id: int
+    ) -> Dict[str, Any]:
+        """
+        Stream an upload to the project directory without buffering it in memory.
+        
+        The file is written to a temporary file while its size is enforced and
+        its sha256 computed, then atomically moved into content-addressed
+        storage. The project file is a hard link to that blob, so identical
+        uploads share one copy on disk.
+        
+        Args:
+            upload_file: Object with an async read(size) method (e.g. UploadFile)
+            filename: Original filename
+            project_id: Project ID
+            
+        Returns:
+            Dict with 'unique_filename', 'file_path', 'file_size', 'sha256'
+            and 'deduplicated' (content was already stored)
+            
+        Raises:
+            ValueError: If file is too large
+        """
+        unique_filename = self.generate_unique_filename(filename)
+        project_dir = self.get_project_dir(project_id)
+        file_path = project_dir / unique_filename
+        temp_path = project_dir / f".{unique_filename}.part"
+        
+        digest = hashlib.sha256()
+        file_size = 0
+        
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                while True:
+                    block = await upload_file.read(self.STREAM_CHUNK_SIZE)
+                    if not block:
+                        break
+                    
+                    file_size += len(block)
+                    if file_size > self.max_size_bytes:
+                        raise ValueError(
+                            f"File too large (more than {self.max_size_bytes} bytes). "
+                            f"Maximum size is {settings.max_file_size_mb}MB"
+                        )
+                    
+                    digest.update(block)
+                    await f.write(block)
+            
+            sha256 = digest.hexdigest()
+            deduplicated = self._store_blob(temp_path, sha256, file_path)
+            
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        
+        logger.info(
+            f"Saved file: {file_path} ({file_size} bytes"
+            f"{', deduplicated' if deduplicated else ''})"
+        )
+        
+        return {
+            'unique_filename': unique_filename,
+            'file_path': str(file_path),
+            'file_size': file_size,
+            'sha256': sha256,
+            'deduplicated': deduplicated
+        }
+    
+    def _store_blob(self, temp_path: Path, sha256: str, file_path: Path) -> bool:
+        """
+        Store a finished upload as a blob and link it into the project.
+        
+        Args:
+            temp_path: Fully written temporary file
+            sha256: Content hash
+            file_path: Project path to create
+            
+        Returns:
+            True if identical content was already stored
+        """
+        blob_path = self.get_blob_path(sha256)
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # release_blob() may unlink the blob before we link to it; the upload
+        # is kept until linking succeeds so the blob can be re-created from it
+        deduplicated = True
+        for _ in range(self.BLOB_LINK_ATTEMPTS):
+            if not blob_path.exists():
+                deduplicated = False
+                try:
+                    self._link_blob(temp_path, blob_path)
+                except FileExistsError:
+                    # Same content stored concurrently by another upload
+                    pass
+            
+            try:
+                self._link_blob(blob_path, file_path)
+                break
+            except FileNotFoundError:
+                logger.info(f"Blob {sha256} was released while linking, re-creating it")
+        else:
+            raise FileNotFoundError(f"Blob {sha256} kept disappearing while linking {file_path}")
+        
+        temp_path.unlink()
+        return deduplicated
+    
+    @staticmethod
+    def _link_blob(source: Path, target: Path) -> None:
+        """
+        Hard link target to source, copying where hard links are unsupported.
+        
+        Raises:
+            FileNotFoundError: If source does not exist
+            FileExistsError: If target already exists
+        """
+        try:
+            # The hard link count doubles as the blob's reference count
+            os.link(source, target)
+        except (FileNotFoundError, FileExistsError):
+            raise
+        except OSError:
+            # Filesystem without hard links: keep an independent copy
+            shutil.copy2(source, target)
+    
+    def release_blob(self, sha256: str) -> bool:
+        """
+        Delete a blob once no project file links to it any more.
+        
+        Args:
+            sha256: Content hash
+            
+        Returns:
+            True if the blob was removed
+        """
+        blob_path = self.get_blob_path(sha256)
+        try:
+            if blob_path.stat().st_nlink <= 1:
+                blob_path.unlink()
+                logger.info(f"Deleted unreferenced blob: {sha256}")
+                return True
+        except FileNotFoundError:
+            pass
+        return False
+    
+    def prune_blobs(self) -> int:
+        """
+        Delete all blobs no longer linked from any project directory.
+        
+        Returns:
+            Number of blobs deleted
+        """
+        blobs_dir = self.upload_dir / self.BLOBS_DIR
+        if not blobs_dir.exists():
+            return 0
+        
+        removed = 0
+        for blob_path in blobs_dir.glob("*/*"):
+            if self.release_blob(blob_path.name):
+                removed += 1
+        return removed
+    
+    async def delete_file(self, file_path: str, sha256: Optional[str] = None) -> bool:
         """
         Delete file from storage.
         
         Args:
             file_path: Path to file
+            sha256: Content hash, to also release the shared blob
             
         Returns:
             True if deleted successfully
@@ -112,6 +387,8 @@ class FileService:
             if path.exists():
                 path.unlink()
                 logger.info(f"Deleted file: {file_path}")
+                if sha256:
+                    self.release_blob(sha256)
                 return True
             else:
                 logger.warning(f"File not found: {file_path}")
@@ -131,16 +408,107 @@ class FileService:
             True if deleted successfully
         """
         try:
-            project_dir = self.get_project_dir(project_id)
+            project_dir = self.upload_dir / f"project_{project_id}"
             if project_dir.exists():
-                shutil.rmtree(project_dir)
+                # Large trees take a while; keep the event loop free
+                await asyncio.to_thread(shutil.rmtree, project_dir)
                 logger.info(f"Deleted project directory: {project_dir}")
+                await asyncio.to_thread(self.prune_blobs)
                 return True
             return False
         except Exception as e:
             logger.error(f"Error deleting project files: {str(e)}")
             raise
     
+    def find_orphans(
+        self,
+        live_projects: Set[int],
+        live_files: Set[str],
+        live_extracted: Dict[int, Set[str]],
+        grace_seconds: float
+    ) -> List[Tuple[str, Path, int]]:
+        """
+        Walk upload_dir for files no database row refers to.
+        
+        Blocking; run it in a thread. Entries modified within the grace
+        period are skipped (uploads are linked before their asset row is
+        committed, spools are appended while a document is processed).
+        
+        Args:
+            live_projects: Existing project IDs
+            live_files: Resolved paths of all assets' files
+            live_extracted: Per project, the artifact and spool names of its
+                            assets at the current loader version
+            grace_seconds: Minimum age of an orphan
+            
+        Returns:
+            (kind, path, bytes) tuples; kind is "project_dirs", "files",
+            "extracted" or "blobs"
+        """
+        cutoff = time.time() - grace_seconds
+        orphans = []
+        
+        def old_enough(path: Path) -> bool:
+            return path.stat().st_mtime < cutoff
+        
+        if not self.upload_dir.exists():
+            return orphans
+        
+        for entry in self.upload_dir.iterdir():
+            match = self.PROJECT_DIR_PATTERN.match(entry.name)
+            if not match or not entry.is_dir():
+                continue
+            project_id = int(match.group(1))
+            
+            if project_id not in live_projects:
+                size = sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
+                orphans.append(("project_dirs", entry, size))
+                continue
+            
+            for path in entry.iterdir():
+                if path.is_file() and str(path.resolve()) not in live_files and old_enough(path):
+                    orphans.append(("files", path, path.stat().st_size))
+            
+            # Old loader versions, legacy .jsonl artifacts, deleted files' text
+            extracted_dir = entry / self.EXTRACTED_DIR
+            if extracted_dir.is_dir():
+                names = live_extracted.get(project_id, set())
+                for path in extracted_dir.iterdir():
+                    if path.is_file() and path.name not in names and old_enough(path):
+                        orphans.append(("extracted", path, path.stat().st_size))
+        
+        blobs_dir = self.upload_dir / self.BLOBS_DIR
+        if blobs_dir.exists():
+            for path in blobs_dir.glob("*/*"):
+                stat = path.stat()
+                if stat.st_nlink <= 1 and stat.st_mtime < cutoff:
+                    orphans.append(("blobs", path, stat.st_size))
+        
+        return orphans
+    
+    @staticmethod
+    def remove_paths(paths: List[Path]) -> int:
+        """
+        Delete files and directory trees (blocking; run it in a thread).
+        
+        Args:
+            paths: Paths to delete (missing ones are ignored)
+            
+        Returns:
+            Number of paths deleted
+        """
+        removed = 0
+        for path in paths:
+            try:
+                if path.is_dir():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+    
     def validate_file(self, filename: str, file_size: int) -> tuple[bool, Optional[str]]:
         """
         Validate file before upload.
@@ -0,0 +1,657 @@
+"""
+Ingestion Pipeline Service.
+Streams a document through extract -> chunk -> embed -> write stages.
+"""
+from typing import List, Dict, Any, Optional, AsyncIterator, Set, Tuple
+from contextlib import contextmanager
+from datetime import datetime
+import asyncio
+import hashlib
+import os
+import time
+import aiofiles
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.models import Asset, Chunk, ParentChunk
+from backend.database.bulk import bulk_insert_chunks
+from backend.services.document_loader import DocumentLoaderService
+from backend.services.chunking_service import ChunkingService
+from backend.services.embedding_service import EmbeddingService
+from backend.services.file_service import FileService
+from backend.providers.vectordb.interface import VectorDBInterface
+from backend.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionMetrics:
+    """Counters and per-stage timings of one ingestion run."""
+
+    STAGES = ('extract', 'chunk', 'vector_lookup', 'embed', 'db_write', 'vector_write')
+    COUNTERS = (
+        'pages', 'characters', 'chunks', 'kept', 'embedded', 'removed',
+        'embedding_requests', 'embedding_retries'
+    )
+
+    def __init__(self):
+        """Start the run clock."""
+        self.started = time.perf_counter()
+        self.duration = None
+        self.stage_seconds = {stage: 0.0 for stage in self.STAGES}
+        self.counts = {counter: 0 for counter in self.COUNTERS}
+
+    @contextmanager
+    def timed(self, stage: str):
+        """Add the wall-clock time of the enclosed block to a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[stage] += time.perf_counter() - start
+
+    def finish(self) -> None:
+        """Stop the run clock."""
+        self.duration = time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Summary for asset metadata.
+
+        Stages overlap in time, so stage seconds may add up to more than
+        the run duration; the largest one is the bottleneck.
+        """
+        duration = self.duration if self.duration is not None else time.perf_counter() - self.started
+        return {
+            **self.counts,
+            'duration_seconds': round(duration, 3),
+            'stage_seconds': {stage: round(seconds, 3) for stage, seconds in self.stage_seconds.items()}
+        }
+
+
+class IngestionPipeline:
+    """
+    Bounded-memory ingestion of one document.
+
+    Stages run concurrently and hand batches to each other through bounded
+    queues, so a page window is parsed while the previous window's chunks
+    are embedded and written, and memory stays proportional to the queue
+    sizes rather than to the document.
+
+    Runs are resumable: extracted text is spooled to disk as it is
+    produced, every written batch is committed together with a checkpoint
+    in the asset metadata, and a later run re-uses stored chunks (and their
+    embeddings) by content hash, so a retry only extracts what is missing
+    and only embeds chunks that have no vector yet.
+    """
+
+    def __init__(
+        self,
+        document_loader: DocumentLoaderService,
+        chunking_service: ChunkingService,
+        embedding_service: EmbeddingService,
+        vector_db: VectorDBInterface,
+        batch_size: int = None,
+        queue_size: int = None,
+        embedding_max_retries: int = None,
+        file_service: Optional[FileService] = None
+    ):
+        """
+        Initialize ingestion pipeline.
+
+        Args:
+            document_loader: Document loader service
+            chunking_service: Chunking service
+            embedding_service: Embedding service
+            vector_db: Vector database provider
+            batch_size: Chunks per embedding/write batch (defaults to settings)
+            queue_size: Batches buffered between stages (defaults to settings)
+            embedding_max_retries: Retries of a failed embedding batch (defaults to settings)
+            file_service: File service for extracted-text artifacts (none: always extract)
+        """
+        self.document_loader = document_loader
+        self.chunking_service = chunking_service
+        self.embedding_service = embedding_service
+        self.vector_db = vector_db
+        self.batch_size = batch_size or settings.ingestion_batch_size
+        self.queue_size = queue_size or settings.ingestion_queue_size
+        self.embedding_max_retries = (
+            settings.embedding_max_retries if embedding_max_retries is None else embedding_max_retries
+        )
+        self.file_service = file_service
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """Hash of chunk text used to match chunks across runs and versions."""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    async def run(
+        self,
+        db: AsyncSession,
+        asset: Asset,
+        metrics: Optional[IngestionMetrics] = None,
+        generation: int = 0,
+        donor_generation: Optional[int] = None,
+        embedding_model: Optional[str] = None,
+        embedding_rate: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest an asset's file into chunk records and vectors.
+
+        Chunks already stored for the asset are matched by content hash and
+        keep their row and embedding; only new or changed chunks are
+        embedded, and chunks no longer present are deleted at the end.
+
+        When building a new index generation, embeddings of identical
+        chunks in the donor (served) generation are copied instead of being
+        recomputed. Stored vectors are only re-used if they were produced by
+        the embedding model of this run.
+
+        Args:
+            db: Database session
+            asset: Asset being processed
+            metrics: Optional metrics to fill (also useful when the run fails)
+            generation: Index generation to write
+            donor_generation: Generation to copy matching embeddings from
+            embedding_model: Model to embed with (defaults to the configured one)
+            embedding_rate: Maximum embeddings per second (None: unlimited)
+
+        Returns:
+            Dict with 'centroid' (mean normalized embedding), 'chunk_count'
+            and 'stats' (IngestionMetrics.as_dict())
+        """
+        metrics = metrics or IngestionMetrics()
+        checkpoint = (asset.extra_metadata or {}).get('checkpoint')
+        if checkpoint:
+            logger.info(
+                f"Resuming ingestion of document {asset.id}: {checkpoint['chunks']} chunks "
+                f"were written before the previous run stopped"
+            )
+        embedding_model = embedding_model or self.embedding_service.get_embedding_model_name()
+        existing, reusable = await self._load_existing(db, asset, generation, embedding_model)
+        if existing:
+            # Parent windows are cheap to rebuild and carry no embeddings
+            await db.execute(delete(ParentChunk).where(
+                ParentChunk.asset_id == asset.id,
+                ParentChunk.generation == generation
+            ))
+            await db.commit()
+
+        donors = {}
+        if donor_generation is not None and donor_generation != generation:
+            donors, donor_reusable = await self._load_existing(db, asset, donor_generation, embedding_model)
+            donors = {
+                content_hash: [chunk_id for chunk_id in ids if chunk_id in donor_reusable]
+                for content_hash, ids in donors.items()
+            }
+
+        state = {
+            'asset': asset,
+            'generation': generation,
+            'collection_name': VectorDBInterface.collection_name(asset.project_id, generation),
+            'donor_collection': VectorDBInterface.collection_name(asset.project_id, donor_generation or 0),
+            'existing': existing,
+            'reusable': reusable,
+            'donors': donors,
+            'embedding_model': embedding_model,
+            'embedding_rate': embedding_rate,
+            'rate_started': time.monotonic(),
+            'embedding_sum': None,
+            'metrics': metrics,
+            'stats': metrics.counts
+        }
+
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        await self._run_stages([
+            self._chunk_stage(state, chunk_queue),
+            self._embed_stage(state, chunk_queue, write_queue),
+            self._write_stage(db, state, write_queue)
+        ])
+
+        removed_ids = [chunk_id for ids in existing.values() for chunk_id in ids]
+        if removed_ids:
+            with metrics.timed('db_write'):
+                await db.execute(delete(Chunk).where(Chunk.id.in_(removed_ids)))
+                await db.commit()
+            if not self.vector_db.stores_embeddings_in_chunks:
+                with metrics.timed('vector_write'):
+                    await self.vector_db.delete_vectors(state['collection_name'], removed_ids)
+        state['stats']['removed'] = len(removed_ids)
+
+        stats = state['stats']
+        centroid = []
+        if stats['chunks']:
+            centroid = (state['embedding_sum'] / stats['chunks']).tolist()
+        metrics.finish()
+
+        # Committed by the caller together with the completed status
+        asset.extra_metadata = {
+            key: value for key, value in (asset.extra_metadata or {}).items() if key != 'checkpoint'
+        }
+
+        logger.info(
+            f"Ingested document {asset.id}: {stats['chunks']} chunks "
+            f"({stats['kept']} kept, {stats['embedded']} embedded, {stats['removed']} removed)"
+        )
+        return {'centroid': centroid, 'chunk_count': stats['chunks'], 'stats': metrics.as_dict()}
+
+    @staticmethod
+    async def _run_stages(stages: List) -> None:
+        """Run stage coroutines concurrently; if one fails, cancel the rest."""
+        tasks = [asyncio.ensure_future(stage) for stage in stages]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _load_existing(
+        self,
+        db: AsyncSession,
+        asset: Asset,
+        generation: int,
+        embedding_model: str
+    ) -> Tuple[Dict[str, List[int]], Set[int]]:
+        """
+        Index the asset's stored chunks by content hash.
+
+        Args:
+            db: Database session
+            asset: Asset being processed
+            generation: Index generation to look at
+            embedding_model: Model whose vectors can be re-used
+
+        Returns:
+            Mapping of content hash to chunk IDs (in chunk_index order), and
+            the IDs of chunks whose vector was produced by embedding_model
+        """
+        stmt = select(
+            Chunk.id,
+            Chunk.embedding_model,
+            Chunk.extra_metadata['content_hash'].as_string().label('content_hash')
+        ).where(
+            Chunk.asset_id == asset.id,
+            Chunk.generation == generation
+        ).order_by(Chunk.chunk_index)
+        rows = (await db.execute(stmt)).all()
+
+        # Untagged chunks were embedded with the model recorded for the document
+        recorded_model = (asset.extra_metadata or {}).get('pipeline', {}).get('embedding_model')
+        reusable = {
+            row.id for row in rows
+            if (row.embedding_model or recorded_model) in (None, embedding_model)
+        }
+
+        existing: Dict[str, List[int]] = {}
+        legacy_ids = []
+        for row in rows:
+            if row.content_hash:
+                existing.setdefault(row.content_hash, []).append(row.id)
+            else:
+                legacy_ids.append(row.id)
+
+        # Chunks stored before hashes were recorded: hash their content
+        if legacy_ids:
+            legacy_stmt = select(Chunk.id, Chunk.content).where(Chunk.id.in_(legacy_ids))
+            async for row in await db.stream(legacy_stmt):
+                existing.setdefault(self.content_hash(row.content), []).append(row.id)
+
+        return existing, reusable
+
+    async def _extracted_windows(self, asset: Asset) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Page windows of the asset, extracting only what was not extracted before.
+
+        Windows are appended to a per-asset spool file as they are
+        extracted; once extraction completes the spool becomes the
+        zstd-compressed extracted-text artifact of the file, keyed by its
+        hash and the loader version. Every later run of the same content
+        replays the artifact instead of parsing the file, and a partial
+        spool (interrupted run) is replayed and then extended from where it
+        stopped.
+
+        Args:
+            asset: Asset being processed
+
+        Yields:
+            Window dicts as produced by DocumentLoaderService.iter_document_windows
+        """
+        sha256 = (asset.extra_metadata or {}).get('sha256')
+        if self.file_service is None or not sha256:
+            async for window in self.document_loader.iter_document_windows(asset.file_path):
+                yield window
+            return
+
+        path = self.file_service.get_extracted_text_path(
+            asset.project_id, sha256, self.document_loader.LOADER_VERSION
+        )
+        if path.exists():
+            logger.info(f"Re-using extracted text of {asset.original_filename}")
+            async for window, _ in self.file_service.iter_extracted_windows(path):
+                yield window
+            return
+
+        spool = path.with_name(f"{path.name}.{asset.id}.part")
+        last, valid_bytes = None, 0
+        if spool.exists():
+            async for last, valid_bytes in self.file_service.iter_extracted_windows(spool):
+                yield last
+            if last:
+                logger.info(
+                    f"Resuming extraction of {asset.original_filename} "
+                    f"after {last['start'] + len(last['text'])} characters"
+                )
+
+        async with aiofiles.open(spool, 'ab') as f:
+            # Drop a frame torn by a crash before appending
+            await f.truncate(valid_bytes)
+            windows = self.document_loader.iter_document_windows(asset.file_path, resume_after=last)
+            async for window in windows:
+                # Flushed per window: a failed run may never close the spool
+                await f.write(self.file_service.encode_extracted_window(window))
+                await f.flush()
+                yield window
+
+        os.replace(spool, path)
+
+    async def _chunk_stage(self, state: Dict[str, Any], out_queue: asyncio.Queue) -> None:
+        """Extract page windows and chunk them into batches."""
+        asset = state['asset']
+        metrics = state['metrics']
+        stats = state['stats']
+
+        chunker = self.chunking_service.document_chunker(
+            document_name=asset.original_filename,
+            additional_metadata={'file_type': asset.file_type, 'asset_id': asset.id}
+        )
+        source = self._extracted_windows(asset)
+        batch = []
+        while True:
+            # Timed separately: the chunker never waits on extraction
+            with metrics.timed('extract'):
+                try:
+                    window = await source.__anext__()
+                except StopAsyncIteration:
+                    window = None
+
+            if window is not None:
+                stats['pages'] = window['page_count']
+                stats['characters'] = window['start'] + len(window['text'])
+
+            with metrics.timed('chunk'):
+                chunks = chunker.feed(window) if window is not None else chunker.finish()
+
+            for chunk in chunks:
+                batch.append(chunk)
+                if len(batch) >= self.batch_size:
+                    await out_queue.put(batch)
+                    batch = []
+
+            if window is None:
+                break
+
+        if batch:
+            await out_queue.put(batch)
+        await out_queue.put(None)
+
+    async def _embed_stage(
+        self,
+        state: Dict[str, Any],
+        in_queue: asyncio.Queue,
+        out_queue: asyncio.Queue
+    ) -> None:
+        """Match chunks to stored ones and embed those without a vector."""
+        existing = state['existing']
+        donors = state['donors']
+        metrics = state['metrics']
+
+        while (batch := await in_queue.get()) is not None:
+            donor_ids = {}
+            for chunk in batch:
+                content_hash = self.content_hash(chunk['content'])
+                chunk['metadata']['content_hash'] = content_hash
+                matches = existing.get(content_hash)
+                if matches:
+                    chunk['id'] = matches.pop(0)
+                elif donors.get(content_hash):
+                    donor_ids[id(chunk)] = donors[content_hash].pop(0)
+
+            kept_ids = [chunk['id'] for chunk in batch if chunk.get('id') in state['reusable']]
+            vectors = {}
+            donor_vectors = {}
+            with metrics.timed('vector_lookup'):
+                if kept_ids:
+                    vectors = await self.vector_db.get_vectors(state['collection_name'], kept_ids)
+                if donor_ids:
+                    donor_vectors = await self.vector_db.get_vectors(
+                        state['donor_collection'], list(donor_ids.values())
+                    )
+
+            to_embed = []
+            for chunk in batch:
+                donor_id = donor_ids.get(id(chunk))
+                if chunk.get('id') in vectors:
+                    chunk['embedding'] = vectors[chunk['id']]
+                elif donor_id in donor_vectors:
+                    # Copied from the served generation; still to be written
+                    chunk['embedding'] = donor_vectors[donor_id]
+                    chunk['copied'] = True
+                else:
+                    to_embed.append(chunk)
+
+            if to_embed:
+                with metrics.timed('embed'):
+                    embeddings = await self._embed_with_retry(
+                        [chunk['content'] for chunk in to_embed], metrics, state['embedding_model']
+                    )
+                for chunk, embedding in zip(to_embed, embeddings):
+                    chunk['embedding'] = embedding
+                    chunk['embedded'] = True
+                if state['embedding_rate']:
+                    await self._throttle(state, len(to_embed))
+
+            await out_queue.put(batch)
+        await out_queue.put(None)
+
+    @staticmethod
+    async def _throttle(state: Dict[str, Any], count: int) -> None:
+        """Sleep until the run's embeddings so far fit within its rate limit."""
+        state['rate_count'] = state.get('rate_count', 0) + count
+        due = state['rate_started'] + state['rate_count'] / state['embedding_rate']
+        delay = due - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _embed_with_retry(
+        self,
+        texts: List[str],
+        metrics: IngestionMetrics,
+        model: Optional[str] = None
+    ) -> List[List[float]]:
+        """
+        Embed a batch, retrying transient failures with exponential backoff.
+
+        Args:
+            texts: Chunk texts
+            metrics: Run metrics (requests and retries are counted)
+            model: Embedding model (defaults to the configured one)
+
+        Returns:
+            Embedding vectors
+        """
+        attempt = 0
+        while True:
+            metrics.counts['embedding_requests'] += 1
+            try:
+                return await self.embedding_service.generate_embeddings(texts, model=model)
+            except Exception as e:
+                if attempt >= self.embedding_max_retries:
+                    raise
+                attempt += 1
+                metrics.counts['embedding_retries'] += 1
+                logger.warning(f"Embedding batch failed ({str(e)}), retry {attempt}/{self.embedding_max_retries}")
+                await asyncio.sleep(2 ** attempt)
+
+    async def _write_stage(
+        self,
+        db: AsyncSession,
+        state: Dict[str, Any],
+        in_queue: asyncio.Queue
+    ) -> None:
+        """Write each batch of chunks and vectors in a few set-based statements."""
+        asset = state['asset']
+        metrics = state['metrics']
+        stats = state['stats']
+        inline = self.vector_db.stores_embeddings_in_chunks
+
+        while (batch := await in_queue.get()) is not None:
+            checkpoint = {
+                'chunks': stats['chunks'] + len(batch),
+                'characters': batch[-1]['metadata']['end_index'],
+                'updated_at': datetime.utcnow().isoformat()
+            }
+            with metrics.timed('db_write'):
+                await self._write_batch(
+                    db, asset, batch, inline, checkpoint, state['generation'], state['embedding_model']
+                )
+
+            if not inline:
+                pending = [chunk for chunk in batch if chunk.get('embedded') or chunk.get('copied')]
+                if pending:
+                    with metrics.timed('vector_write'):
+                        await self.vector_db.add_vectors(
+                            collection_name=state['collection_name'],
+                            vectors=[chunk['embedding'] for chunk in pending],
+                            ids=[chunk['id'] for chunk in pending],
+                            metadata=[
+                                VectorDBInterface.vector_payload(
+                                    project_id=asset.project_id,
+                                    asset_id=asset.id,
+                                    generation=state['generation'],
+                                    content=chunk['content'],
+                                    metadata=chunk['metadata'],
+                                    embedding_model=state['embedding_model'],
+                                    embedding_dimension=len(chunk['embedding'])
+                                )
+                                for chunk in pending
+                            ]
+                        )
+
+            batch_sum = EmbeddingService.sum_normalized([chunk['embedding'] for chunk in batch])
+            state['embedding_sum'] = batch_sum if state['embedding_sum'] is None else state['embedding_sum'] + batch_sum
+
+            embedded = sum(1 for chunk in batch if chunk.get('embedded'))
+            stats['chunks'] += len(batch)
+            stats['embedded'] += embedded
+            stats['kept'] += len(batch) - embedded
+
+    async def _write_batch(
+        self,
+        db: AsyncSession,
+        asset: Asset,
+        batch: List[Dict[str, Any]],
+        inline: bool,
+        checkpoint: Dict[str, Any],
+        generation: int,
+        embedding_model: str
+    ) -> None:
+        """
+        Insert new chunks and update kept ones, committing the batch.
+
+        Args:
+            db: Database session
+            asset: Asset being processed
+            batch: Chunk dictionaries with embeddings
+            inline: Write embeddings into the chunks table
+            checkpoint: Progress stored in the asset metadata in the same commit
+            generation: Index generation of the rows
+            embedding_model: Model tagged on new and re-embedded vectors
+        """
+        await self._write_parents(db, asset, batch, generation)
+
+        new_chunks = [chunk for chunk in batch if 'id' not in chunk]
+        kept_chunks = [chunk for chunk in batch if 'id' in chunk]
+
+        new_ids = await bulk_insert_chunks(db, [
+            {
+                'project_id': asset.project_id,
+                'asset_id': asset.id,
+                'content': chunk['content'],
+                'chunk_index': chunk['metadata']['chunk_index'],
+                'generation': generation,
+                'extra_metadata': chunk['metadata'],
+                'embedding': chunk['embedding'] if inline else None,
+                'embedding_model': embedding_model,
+                'embedding_dimension': len(chunk['embedding'])
+            }
+            for chunk in new_chunks
+        ])
+        for chunk, chunk_id in zip(new_chunks, new_ids):
+            chunk['id'] = chunk_id
+
+        if kept_chunks:
+            await db.execute(update(Chunk), [
+                {
+                    'id': chunk['id'],
+                    'chunk_index': chunk['metadata']['chunk_index'],
+                    'extra_metadata': chunk['metadata'],
+                    **({
+                        'embedding_model': embedding_model,
+                        'embedding_dimension': len(chunk['embedding']),
+                        **({'embedding': chunk['embedding']} if inline else {})
+                    } if chunk.get('embedded') else {})
+                }
+                for chunk in kept_chunks
+            ])
+
+        asset.extra_metadata = {**(asset.extra_metadata or {}), 'checkpoint': checkpoint}
+        await db.commit()
+
+    @staticmethod
+    async def _write_parents(
+        db: AsyncSession,
+        asset: Asset,
+        batch: List[Dict[str, Any]],
+        generation: int
+    ) -> None:
+        """
+        Store parent windows first seen in this batch and link their children.
+
+        Args:
+            db: Database session
+            asset: Asset being processed
+            batch: Chunk dictionaries (children carry 'parent')
+            generation: Index generation of the rows
+        """
+        parents: Dict[int, Dict[str, Any]] = {}
+        for chunk in batch:
+            parent = chunk.get('parent')
+            if parent is not None and 'id' not in parent:
+                parents[id(parent)] = parent
+
+        if parents:
+            records = [
+                ParentChunk(
+                    project_id=asset.project_id,
+                    asset_id=asset.id,
+                    content=parent['content'],
+                    parent_index=parent['metadata']['parent_index'],
+                    generation=generation,
+                    extra_metadata=parent['metadata']
+                )
+                for parent in parents.values()
+            ]
+            db.add_all(records)
+
+            # Flush to get parent IDs before children are written
+            await db.flush()
+            for parent, record in zip(parents.values(), records):
+                parent['id'] = record.id
+
+        for chunk in batch:
+            if chunk.get('parent') is not None:
+                chunk['metadata']['parent_id'] = chunk['parent']['id']
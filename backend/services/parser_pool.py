@@ -0,0 +1,206 @@
+"""
+Parser Pool Service.
+Runs CPU-bound document parsing in a pool of pre-warmed worker processes,
+keeping the API event loop responsive during large PDF/DOCX parses.
+"""
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import itertools
+import multiprocessing
+import os
+import signal
+import sys
+import weakref
+from backend.parsing import extractors
+from backend.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ParserPool:
+    """Shared process pool for document parsing."""
+
+    _instance = None
+
+    # ProcessPoolExecutor replaces workers after max_tasks_per_child parses
+    # only from Python 3.11; before that the whole pool is rotated instead
+    NATIVE_MAX_TASKS_PER_CHILD = sys.version_info >= (3, 11)
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        timeout: float = None,
+        max_tasks_per_child: int = None
+    ):
+        """
+        Initialize parser pool (processes start lazily or on warm()).
+
+        Args:
+            max_workers: Number of parser processes (defaults to settings)
+            timeout: Seconds before a parse is abandoned (defaults to settings)
+            max_tasks_per_child: Parses before a worker is replaced, bounding
+                                 leaks from malformed files (defaults to settings)
+        """
+        self.max_workers = max_workers or settings.parser_workers
+        self.timeout = timeout or settings.parser_timeout_seconds
+        self.max_tasks_per_child = max_tasks_per_child or settings.parser_max_tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_tasks = 0
+        # Queue on which workers of every executor report the tasks they start
+        self._task_log = None
+        self._task_ids = itertools.count(1)
+        self._task_pids: Dict[int, int] = {}
+        # Pools torn down because one parse hung; their other parses are retried
+        self._recycled = weakref.WeakSet()
+
+    @classmethod
+    def get_instance(cls) -> "ParserPool":
+        """Return the process-wide parser pool (Singleton)."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the executor on first use."""
+        if self._executor is None:
+            # max_tasks_per_child requires spawned (not forked) workers
+            context = multiprocessing.get_context("spawn")
+            if self._task_log is None:
+                self._task_log = context.SimpleQueue()
+            options = {}
+            if self.NATIVE_MAX_TASKS_PER_CHILD:
+                options['max_tasks_per_child'] = self.max_tasks_per_child
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=extractors.warm_worker,
+                initargs=(self._task_log,),
+                **options
+            )
+            self._executor_tasks = 0
+            logger.info(
+                f"Parser pool started (workers={self.max_workers}, "
+                f"max_tasks_per_child={self.max_tasks_per_child})"
+            )
+        return self._executor
+
+    async def warm(self) -> None:
+        """Start all worker processes and import parsers ahead of the first upload."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*[
+            loop.run_in_executor(executor, extractors.worker_pid)
+            for _ in range(self.max_workers)
+        ])
+        logger.info("Parser pool warmed up")
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: float = None
+    ) -> Any:
+        """
+        Run a picklable parsing function in the pool.
+
+        Args:
+            func: Module-level function from backend.parsing
+            *args: Function arguments
+            timeout: Optional override of the configured timeout
+
+        Returns:
+            Function result
+
+        Raises:
+            TimeoutError: If parsing takes longer than the timeout
+        """
+        loop = asyncio.get_running_loop()
+        timeout = timeout or self.timeout
+
+        for attempt in range(2):
+            executor = self._get_executor()
+            task_id = next(self._task_ids)
+
+            try:
+                future = loop.run_in_executor(executor, extractors.run_task, task_id, func, *args)
+                self._count_task(executor)
+                return await asyncio.wait_for(future, timeout=timeout)
+
+            except asyncio.TimeoutError:
+                # A parse still waiting for a worker is simply dropped; a
+                # running one can only be stopped by killing its process
+                pid = self._task_pid(task_id)
+                if pid is not None:
+                    logger.error(f"Parsing timed out after {timeout}s, killing parser worker {pid}")
+                    self._recycle(executor, pid)
+                raise TimeoutError(f"Document parsing timed out after {timeout} seconds")
+
+            except BrokenProcessPool:
+                if executor in self._recycled and attempt == 0:
+                    # Lost alongside a hung parse, not through a fault of its own
+                    logger.warning("Parser pool was recycled during parsing, retrying")
+                    continue
+                logger.error("Parser worker crashed, recycling parser pool")
+                self._recycle(executor)
+                raise
+
+            finally:
+                # Drain the start reports so the queue's pipe never fills up
+                self._task_pid(task_id)
+                self._task_pids.pop(task_id, None)
+
+    def _count_task(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Rotate the pool once its workers have done max_tasks_per_child
+        parses each on average (Python < 3.11 only).
+
+        The retired executor finishes the parses already submitted to it;
+        new parses go to a fresh pool.
+        """
+        if self.NATIVE_MAX_TASKS_PER_CHILD or executor is not self._executor:
+            return
+
+        self._executor_tasks += 1
+        if self._executor_tasks >= self.max_tasks_per_child * self.max_workers:
+            logger.info("Rotating parser pool after its task quota")
+            self._executor = None
+            executor.shutdown(wait=False)
+
+    def _task_pid(self, task_id: int) -> Optional[int]:
+        """Return the worker process running a task, if it has started."""
+        while self._task_log is not None and not self._task_log.empty():
+            started_id, pid = self._task_log.get()
+            self._task_pids[started_id] = pid
+        return self._task_pids.get(task_id)
+
+    def _recycle(self, executor: ProcessPoolExecutor, hung_pid: Optional[int] = None) -> None:
+        """
+        Retire an executor; a fresh pool is created on next use.
+
+        Args:
+            executor: Executor to retire
+            hung_pid: Worker process stuck on a timed-out parse, killed so the
+                      retired pool can exit. Parses that were running in its
+                      other workers fail and are retried on the fresh pool.
+        """
+        if self._executor is executor:
+            self._executor = None
+
+        if hung_pid is not None:
+            self._recycled.add(executor)
+            try:
+                os.kill(hung_pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        executor.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("Parser pool stopped")
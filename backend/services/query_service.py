@@ -2,9 +2,15 @@
 Query Service.
 Handles query processing and similarity search.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
 from backend.services.embedding_service import EmbeddingService
 from backend.providers.vectordb.factory import VectorDBProviderFactory
+from backend.providers.vectordb.interface import VectorDBInterface
+from backend.database.models import Project, Asset, AssetCentroid
+from backend.database.connection import async_session_maker
+from backend.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,7 +30,9 @@ class QueryService:
         query: str,
         project_id: int,
         top_k: int = 5,
-        asset_id: Optional[int] = None
+        asset_id: Optional[int] = None,
+        top_assets: Optional[int] = None,
+        mmr_lambda: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for chunks similar to query.
@@ -34,30 +42,61 @@ class QueryService:
             project_id: Project ID to search within
             top_k: Number of results to return
             asset_id: Optional asset ID to filter by
+            top_assets: Documents to pre-select by centroid before searching
+                        chunks (defaults to settings, 0 for flat search)
+            mmr_lambda: If set, oversample candidates and re-rank them with
+                        Maximal Marginal Relevance (1.0 = relevance only)
             
         Returns:
             List of similar chunks with metadata
         """
         try:
-            # Generate query embedding
-            query_embedding = await self.embedding_service.generate_single_embedding(query)
+            # Serve the project's current index generation (a reindex may be
+            # building the next one, possibly with another embedding model)
+            generation, embedding_model = await self._served_index(project_id)
+            
+            # Generate query embedding with the model the served vectors came from
+            query_embedding = await self.embedding_service.generate_single_embedding(
+                query, model=embedding_model
+            )
             
             # Build filter
-            filter_dict = {'project_id': project_id}
+            filter_dict = {'project_id': project_id, 'generation': generation}
+            if embedding_model:
+                filter_dict['embedding_model'] = embedding_model
             if asset_id:
                 filter_dict['asset_id'] = asset_id
+            else:
+                top_assets = settings.two_stage_top_assets if top_assets is None else top_assets
+                if top_assets:
+                    candidate_assets = await self._select_candidate_assets(
+                        project_id, query_embedding, top_assets
+                    )
+                    if candidate_assets is not None:
+                        filter_dict['asset_ids'] = candidate_assets
             
-            # Search vector database
+            # Search vector database (oversampled when re-ranking)
+            use_mmr = mmr_lambda is not None
             results = await self.vector_db.search(
-                collection_name=f"project_{project_id}",
+                collection_name=VectorDBInterface.collection_name(project_id, generation),
                 query_vector=query_embedding,
-                top_k=top_k,
-                filter_dict=filter_dict
+                top_k=top_k * settings.mmr_oversample if use_mmr else top_k,
+                filter_dict=filter_dict,
+                include_embeddings=use_mmr
             )
             
+            if use_mmr and len(results) > top_k:
+                order = self.mmr_select(
+                    query_embedding,
+                    [metadata['embedding'] for _, _, metadata in results],
+                    mmr_lambda,
+                    top_k
+                )
+                results = [results[i] for i in order]
+            
             # Format results
             formatted_results = []
-            for chunk_id, similarity, metadata in results:
+            for chunk_id, similarity, metadata in results[:top_k]:
                 formatted_results.append({
                     'chunk_id': chunk_id,
                     'similarity': similarity,
@@ -72,3 +111,132 @@ class QueryService:
         except Exception as e:
             logger.error(f"Error searching chunks: {str(e)}")
             raise
+    
+    @staticmethod
+    async def _served_index(project_id: int) -> Tuple[int, Optional[str]]:
+        """Index generation and embedding model currently served for a project."""
+        async with async_session_maker() as session:
+            stmt = select(Project.index_generation, Project.embedding_model).where(Project.id == project_id)
+            row = (await session.execute(stmt)).first()
+        return (row.index_generation, row.embedding_model) if row else (0, None)
+    
+    async def _select_candidate_assets(
+        self,
+        project_id: int,
+        query_embedding: List[float],
+        top_assets: int
+    ) -> Optional[List[int]]:
+        """
+        First stage of two-stage retrieval: pick documents by centroid.
+        
+        Completed assets without a centroid (processed before centroids
+        existed) are always kept so they are never silently excluded.
+        
+        Args:
+            project_id: Project ID
+            query_embedding: Query vector
+            top_assets: Number of documents to select
+            
+        Returns:
+            Candidate asset IDs, or None if a flat search is cheaper
+        """
+        async with async_session_maker() as session:
+            stmt = select(Asset.id, AssetCentroid.embedding).outerjoin(
+                AssetCentroid, AssetCentroid.asset_id == Asset.id
+            ).where(
+                Asset.project_id == project_id,
+                Asset.status == "completed"
+            )
+            rows = (await session.execute(stmt)).all()
+        
+        if len(rows) <= top_assets:
+            return None
+        
+        with_centroid = [row for row in rows if row.embedding]
+        without_centroid = [row.id for row in rows if not row.embedding]
+        
+        selected = []
+        if with_centroid:
+            top = self.rank_centroids(
+                query_embedding,
+                [row.embedding for row in with_centroid],
+                top_assets
+            )
+            selected = [with_centroid[i].id for i in top]
+        
+        logger.info(
+            f"Two-stage retrieval selected {len(selected)}/{len(rows)} documents "
+            f"(+{len(without_centroid)} without centroid)"
+        )
+        return selected + without_centroid
+    
+    @staticmethod
+    def rank_centroids(
+        query_vector: List[float],
+        centroids: List[List[float]],
+        top_n: int
+    ) -> List[int]:
+        """
+        Rank centroids by cosine similarity to the query.
+        
+        Args:
+            query_vector: Query embedding
+            centroids: Centroid vectors
+            top_n: Number of indices to return
+            
+        Returns:
+            Indices of the top_n most similar centroids, best first
+        """
+        matrix = np.asarray(centroids, dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+        
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        norms[norms == 0] = 1.0
+        scores = (matrix @ query) / norms
+        
+        top_n = min(top_n, len(scores))
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+        return top[np.argsort(-scores[top])].tolist()
+    
+    @staticmethod
+    def mmr_select(
+        query_vector: List[float],
+        candidates: List[List[float]],
+        mmr_lambda: float,
+        top_k: int
+    ) -> List[int]:
+        """
+        Select a relevant yet diverse subset with Maximal Marginal Relevance.
+        
+        Args:
+            query_vector: Query embedding
+            candidates: Candidate embeddings
+            mmr_lambda: Weight of relevance vs. redundancy (0.0 to 1.0)
+            top_k: Number of candidates to select
+            
+        Returns:
+            Indices of selected candidates in selection order
+        """
+        matrix = np.asarray(candidates, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+        
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        
+        relevance = matrix @ query
+        pairwise = matrix @ matrix.T
+        
+        top_k = min(top_k, len(relevance))
+        selected = [int(np.argmax(relevance))]
+        redundancy = pairwise[:, selected[0]].copy()
+        
+        while len(selected) < top_k:
+            scores = mmr_lambda * relevance - (1.0 - mmr_lambda) * redundancy
+            scores[selected] = -np.inf
+            best = int(np.argmax(scores))
+            selected.append(best)
+            np.maximum(redundancy, pairwise[:, best], out=redundancy)
+        
+        return selected
@@ -0,0 +1,240 @@
+"""
+Recursive Text Splitter.
+Single-pass replacement for LangChain's RecursiveCharacterTextSplitter.
+"""
+from typing import List, Iterator, Tuple, Optional
+import numpy as np
+from backend.services.token_estimator import TokenEstimator
+
+
+class RecursiveTextSplitter:
+    """
+    Split text into overlapping chunks at the coarsest available boundary.
+
+    Produces the same shape of output as a recursive splitter with the
+    separators ["\\n\\n", "\\n", ". ", " ", ""]: a chunk ends at a paragraph
+    break if one fits, otherwise at a line break, a sentence end, a space,
+    and only as a last resort mid-word. Instead of re-splitting each
+    oversized piece with the next separator, each chunk is placed by
+    searching its own window once per separator (str.rfind runs in C), so
+    every character is examined a bounded number of times.
+    """
+
+    SEPARATORS = ["\n\n", "\n", ". ", " "]
+
+    # Length units
+    CHARS = "chars"
+    TOKENS = "tokens"
+
+    # Per-character token weights as integers: TokenEstimator's 1/4 and 1/2.5
+    # tokens per character, in units of 1/20 token
+    TOKEN_SCALE = 20
+    ASCII_WEIGHT = round(TOKEN_SCALE / TokenEstimator.ASCII_CHARS_PER_TOKEN)
+    NON_ASCII_WEIGHT = round(TOKEN_SCALE / TokenEstimator.NON_ASCII_CHARS_PER_TOKEN)
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int = 0,
+        separators: Optional[List[str]] = None,
+        length_unit: str = CHARS
+    ):
+        """
+        Initialize splitter.
+
+        Args:
+            chunk_size: Maximum chunk length (in length_unit)
+            chunk_overlap: Maximum overlap between consecutive chunks
+            separators: Boundaries from coarsest to finest (defaults to SEPARATORS)
+            length_unit: "chars", or "tokens" for TokenEstimator-compatible counts
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError(f"Chunk overlap ({chunk_overlap}) must be smaller than chunk size ({chunk_size})")
+        if length_unit not in (self.CHARS, self.TOKENS):
+            raise ValueError(f"Unsupported length unit: {length_unit}")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = [s for s in (separators or self.SEPARATORS) if s]
+        self.length_unit = length_unit
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        Split text into chunk strings.
+
+        Args:
+            text: Text to split
+
+        Returns:
+            List of chunks
+        """
+        return [chunk for chunk, _, _ in self.split(text)]
+
+    def split(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """
+        Lazily split text into chunks.
+
+        Args:
+            text: Text to split
+
+        Yields:
+            (chunk_text, start_index, end_index) with character offsets of
+            the (whitespace-stripped) chunk in text
+        """
+        for _, _, span in self._iter_chunks(text):
+            if span:
+                yield text[span[0]:span[1]], span[0], span[1]
+
+    def split_prefix(self, text: str) -> Tuple[List[Tuple[str, int, int]], int]:
+        """
+        Split the leading part of a text that continues beyond its end.
+
+        Each chunk is placed using only the text from the position where
+        its window starts, so chunks that end before the end of text are
+        final, and splitting text[resume:] + more_text continues exactly as
+        splitting the whole text would.
+
+        Args:
+            text: Text received so far
+
+        Returns:
+            (chunks, resume): the final chunks as in split(), and the offset
+            from which splitting must continue once more text is available
+        """
+        chunks = []
+        for start, cut, span in self._iter_chunks(text):
+            if cut >= len(text):
+                return chunks, start
+            if span:
+                chunks.append((text[span[0]:span[1]], span[0], span[1]))
+        return chunks, len(text)
+
+    def _iter_chunks(self, text: str) -> Iterator[Tuple[int, int, Optional[Tuple[int, int]]]]:
+        """
+        Place chunks one window at a time.
+
+        Yields:
+            (window start, cut, stripped span or None if only whitespace)
+        """
+        if not text:
+            return
+
+        prefix = self._length_prefix(text)
+        size = self._scaled(prefix, self.chunk_size)
+
+        start = 0
+        while start < len(text):
+            limit = self._advance(prefix, start, size)
+
+            if limit >= len(text):
+                cut, level = len(text), None
+            else:
+                cut, level = self._best_cut(text, start, limit)
+
+            yield start, cut, self._strip(text, start, cut)
+
+            if cut >= len(text):
+                return
+
+            start = self._overlap_start(text, prefix, level, start, cut)
+
+    def _length_prefix(self, text: str) -> Optional[np.ndarray]:
+        """
+        Cumulative length of text, used for O(1) span lengths.
+
+        Token lengths are kept as exact integers (in units of
+        1 / TOKEN_SCALE token), so a span measures the same wherever the
+        text it belongs to starts.
+
+        Returns:
+            Array where prefix[i] is the scaled length of text[:i], or None
+            when lengths are plain character counts
+        """
+        if self.length_unit == self.CHARS:
+            return None
+
+        codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        weights = np.where(codepoints < 128, self.ASCII_WEIGHT, self.NON_ASCII_WEIGHT)
+        prefix = np.empty(len(text) + 1, dtype=np.int64)
+        prefix[0] = 0
+        np.cumsum(weights, out=prefix[1:])
+        return prefix
+
+    @classmethod
+    def _scaled(cls, prefix: Optional[np.ndarray], length: int) -> int:
+        """Convert a configured length to the units of prefix."""
+        return length if prefix is None else length * cls.TOKEN_SCALE
+
+    @staticmethod
+    def _advance(prefix: Optional[np.ndarray], start: int, length: int) -> int:
+        """Furthest end offset such that text[start:end] fits in length."""
+        if prefix is None:
+            return start + int(length)
+        end = int(np.searchsorted(prefix, prefix[start] + length, side='right')) - 1
+        return max(end, start + 1)
+
+    @staticmethod
+    def _retreat(prefix: Optional[np.ndarray], end: int, length: int) -> int:
+        """Earliest start offset such that text[start:end] fits in length."""
+        if prefix is None:
+            return max(end - int(length), 0)
+        return int(np.searchsorted(prefix, prefix[end] - length, side='left'))
+
+    def _best_cut(
+        self,
+        text: str,
+        start: int,
+        limit: int
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Choose where a chunk starting at start should end.
+
+        Returns:
+            (cut offset, separator level) - just after the last separator
+            inside the window, at the coarsest level that has one, or
+            (limit, None) for a hard cut
+        """
+        for level, separator in enumerate(self.separators):
+            position = text.rfind(separator, start, limit)
+            if position >= 0:
+                return position + len(separator), level
+        return limit, None
+
+    def _overlap_start(
+        self,
+        text: str,
+        prefix: Optional[np.ndarray],
+        level: Optional[int],
+        start: int,
+        cut: int
+    ) -> int:
+        """
+        Start of the next chunk: just after the earliest separator of the
+        same level within chunk_overlap before the cut (or cut itself).
+        """
+        if not self.chunk_overlap:
+            return cut
+
+        overlap = self._scaled(prefix, self.chunk_overlap)
+        earliest = max(self._retreat(prefix, cut, overlap), start + 1)
+        if level is None:
+            return min(earliest, cut)
+
+        separator = self.separators[level]
+        # The separator must end at or after earliest and strictly before the cut
+        position = text.find(separator, max(earliest - len(separator), start), cut - 1)
+        if position >= 0:
+            return position + len(separator)
+        return cut
+
+    @staticmethod
+    def _strip(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Offsets of text[start:end] without surrounding whitespace."""
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return (start, end) if start < end else None
@@ -0,0 +1,65 @@
+"""
+Token Estimator.
+Fast local approximation of LLM token counts (no tokenizer round trips).
+"""
+import math
+
+
+class TokenEstimator:
+    """Approximate token counting for mixed Arabic/English text."""
+
+    # Average characters per token observed for Latin script and for
+    # non-Latin scripts (Arabic is tokenized into noticeably shorter pieces)
+    ASCII_CHARS_PER_TOKEN = 4.0
+    NON_ASCII_CHARS_PER_TOKEN = 2.5
+
+    @staticmethod
+    def estimate(text: str) -> int:
+        """
+        Estimate number of tokens in text.
+
+        Args:
+            text: Text to measure
+
+        Returns:
+            Approximate token count
+        """
+        if not text:
+            return 0
+
+        # encode() runs in C, so this stays linear and cheap on large prompts
+        ascii_chars = len(text.encode('ascii', 'ignore'))
+        other_chars = len(text) - ascii_chars
+
+        return math.ceil(
+            ascii_chars / TokenEstimator.ASCII_CHARS_PER_TOKEN
+            + other_chars / TokenEstimator.NON_ASCII_CHARS_PER_TOKEN
+        )
+
+    @staticmethod
+    def truncate(text: str, max_tokens: int) -> str:
+        """
+        Truncate text to approximately max_tokens tokens.
+
+        Args:
+            text: Text to truncate
+            max_tokens: Token budget
+
+        Returns:
+            Truncated text (cut at a whitespace boundary when possible)
+        """
+        if max_tokens <= 0:
+            return ""
+
+        estimated = TokenEstimator.estimate(text)
+        if estimated <= max_tokens:
+            return text
+
+        cut = int(len(text) * max_tokens / estimated)
+        truncated = text[:cut]
+
+        boundary = truncated.rfind(' ')
+        if boundary > cut // 2:
+            truncated = truncated[:boundary]
+
+        return truncated.rstrip()
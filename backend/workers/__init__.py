@@ -0,0 +1,5 @@
+"""Workers package initialization."""
+from backend.workers.job_queue import JobQueue, JobLockLost
+from backend.workers.ingestion_worker import IngestionWorkerPool
+
+__all__ = ["JobQueue", "JobLockLost", "IngestionWorkerPool"]
@@ -0,0 +1,261 @@
+"""
+Ingestion Worker Pool.
+Runs queued ingestion jobs, in-process with the API or as a standalone process:
+
+    python -m backend.workers.ingestion_worker [--workers N]
+"""
+from typing import Callable, Awaitable, Dict, List, Optional
+import asyncio
+import os
+import socket
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.connection import async_session_maker
+from backend.database.models import IngestionJob
+from backend.workers.job_queue import JobQueue, JobLockLost
+from backend.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, IngestionJob], Awaitable[None]]
+
+
+class IngestionWorkerPool:
+    """Pool of asyncio workers claiming jobs from the durable job queue."""
+    
+    def __init__(
+        self,
+        concurrency: int = None,
+        poll_interval: float = None
+    ):
+        """
+        Initialize worker pool.
+        
+        Args:
+            concurrency: Number of jobs run at once (defaults to settings)
+            poll_interval: Seconds to sleep when the queue is empty (defaults to settings)
+        """
+        from backend.controllers.document_controller import DocumentController
+        from backend.controllers.index_controller import IndexController
+        from backend.controllers.project_controller import ProjectController
+        from backend.controllers.maintenance_controller import MaintenanceController
+        
+        self.concurrency = concurrency or settings.ingestion_workers
+        self.poll_interval = poll_interval or settings.ingestion_poll_interval_seconds
+        self.job_queue = JobQueue()
+        self.document_controller = DocumentController()
+        self.index_controller = IndexController(self.document_controller)
+        self.project_controller = ProjectController()
+        self.maintenance_controller = MaintenanceController(
+            self.project_controller.file_service, self.project_controller.vector_db
+        )
+        
+        self.handlers: Dict[str, JobHandler] = {
+            JobQueue.PROCESS_DOCUMENT: self._process_document,
+            JobQueue.REINDEX_PROJECT: self._reindex_project,
+            JobQueue.DELETE_DOCUMENT: self._delete_document,
+            JobQueue.DELETE_PROJECT: self._delete_project,
+            JobQueue.RECONCILE_STORAGE: self._reconcile_storage
+        }
+        
+        self._worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+    
+    async def start(self) -> None:
+        """Start worker tasks."""
+        self._stopping.clear()
+        if settings.embedding_migration:
+            await self._queue_model_migrations()
+        if settings.storage_gc_interval_hours > 0:
+            await self._schedule_reconciliation()
+        for i in range(self.concurrency):
+            worker_id = f"{self._worker_prefix}:{i}"
+            self._tasks.append(asyncio.create_task(self._worker_loop(worker_id)))
+        logger.info(f"Started {self.concurrency} ingestion workers ({self._worker_prefix})")
+    
+    async def _queue_model_migrations(self) -> None:
+        """Reindex projects still served with another embedding model."""
+        try:
+            async with async_session_maker() as session:
+                await self.index_controller.start_model_migrations(session)
+        except Exception as e:
+            logger.error(f"Error queueing embedding model migrations: {str(e)}")
+    
+    async def _schedule_reconciliation(self) -> None:
+        """Queue the periodic storage reconciliation if it is not queued yet."""
+        try:
+            async with async_session_maker() as session:
+                await self.maintenance_controller.schedule(session)
+        except Exception as e:
+            logger.error(f"Error scheduling storage reconciliation: {str(e)}")
+    
+    async def stop(self) -> None:
+        """Stop worker tasks, letting in-flight jobs be reclaimed later if cancelled."""
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Ingestion workers stopped")
+    
+    async def run_forever(self) -> None:
+        """Run until cancelled (standalone worker entry point)."""
+        await self.start()
+        try:
+            await self._stopping.wait()
+        finally:
+            await self.stop()
+    
+    async def _worker_loop(self, worker_id: str) -> None:
+        """Claim and run jobs until stopped."""
+        while not self._stopping.is_set():
+            try:
+                async with async_session_maker() as session:
+                    job = await self.job_queue.claim(session, worker_id)
+                
+                if not job:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                
+                await self._run_job(job, worker_id)
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {worker_id} error: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+    
+    async def _run_job(self, job: IngestionJob, worker_id: str) -> None:
+        """
+        Run a claimed job with its own session and a lock heartbeat.
+        
+        If the heartbeat finds the lock taken over by another worker, the
+        handler is cancelled and the job is left to its new owner.
+        
+        Args:
+            job: Claimed job
+            worker_id: Worker holding the lock
+        """
+        handler = self.handlers.get(job.job_type)
+        lock_lost = asyncio.Event()
+        handler_task = asyncio.create_task(self._run_handler(handler, job, worker_id))
+        heartbeat = asyncio.create_task(self._heartbeat_loop(job.id, worker_id, handler_task, lock_lost))
+        
+        try:
+            await handler_task
+            
+            async with async_session_maker() as session:
+                if await self.job_queue.complete(session, job.id, worker_id):
+                    logger.info(f"Job {job.id} completed")
+                else:
+                    logger.warning(f"Job {job.id} finished after its lock was taken over; result not recorded")
+            
+        except asyncio.CancelledError:
+            # stop() sets _stopping before cancelling workers
+            if lock_lost.is_set() and not self._stopping.is_set():
+                logger.warning(f"Worker {worker_id} abandoned job {job.id} after losing its lock")
+                return
+            # Shutting down: hand the job back so it restarts promptly elsewhere
+            handler_task.cancel()
+            async with async_session_maker() as session:
+                await asyncio.shield(self.job_queue.release(session, job.id, worker_id))
+            raise
+        except JobLockLost as e:
+            logger.warning(f"Worker {worker_id} abandoned job {job.id}: {str(e)}")
+        except Exception as e:
+            async with async_session_maker() as session:
+                await self.job_queue.fail(session, job.id, worker_id, str(e))
+        finally:
+            heartbeat.cancel()
+    
+    async def _run_handler(self, handler: Optional[JobHandler], job: IngestionJob, worker_id: str) -> None:
+        """Run a job handler in its own session."""
+        if handler is None:
+            raise ValueError(f"Unknown job type: {job.job_type}")
+        
+        logger.info(f"Worker {worker_id} running job {job.id} ({job.job_type}, attempt {job.attempts})")
+        async with async_session_maker() as session:
+            await handler(session, job)
+    
+    async def _heartbeat_loop(
+        self,
+        job_id: int,
+        worker_id: str,
+        handler_task: asyncio.Task,
+        lock_lost: asyncio.Event
+    ) -> None:
+        """Keep the job lock fresh while it runs; cancel the handler if it is lost."""
+        interval = max(settings.ingestion_lock_timeout_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with async_session_maker() as session:
+                    held = await self.job_queue.heartbeat(session, job_id, worker_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat for job {job_id} failed: {str(e)}")
+                continue
+            
+            if not held:
+                logger.warning(f"Job {job_id} was reclaimed from {worker_id}, cancelling")
+                lock_lost.set()
+                handler_task.cancel()
+                return
+    
+    # Job handlers
+    
+    async def _process_document(self, db: AsyncSession, job: IngestionJob) -> None:
+        """Run the document ingestion pipeline for job.asset_id."""
+        # A retry may find the asset still marked processing by a lost worker
+        await self.document_controller.process_document(
+            db=db, asset_id=job.asset_id, resume=job.attempts > 1
+        )
+    
+    async def _reindex_project(self, db: AsyncSession, job: IngestionJob) -> None:
+        """Build and switch to a new index generation of job.project_id."""
+        await self.index_controller.run_reindex(db=db, job=job)
+    
+    async def _delete_document(self, db: AsyncSession, job: IngestionJob) -> None:
+        """Delete the large document payload['asset_id']."""
+        await self.document_controller.run_delete_document(db=db, job=job)
+    
+    async def _delete_project(self, db: AsyncSession, job: IngestionJob) -> None:
+        """Delete the large project payload['project_id']."""
+        await self.project_controller.run_delete_project(db=db, job=job)
+    
+    async def _reconcile_storage(self, db: AsyncSession, job: IngestionJob) -> None:
+        """Remove orphaned files, chunks and collections."""
+        await self.maintenance_controller.run_reconcile(db=db, job=job)
+
+
+async def main(concurrency: Optional[int] = None) -> None:
+    """Run a standalone worker process."""
+    from backend.database import init_db, close_db
+    from backend.services.parser_pool import ParserPool
+    
+    await init_db()
+    await ParserPool.get_instance().warm()
+    pool = IngestionWorkerPool(concurrency=concurrency or max(settings.ingestion_workers, 1))
+    try:
+        await pool.run_forever()
+    finally:
+        ParserPool.get_instance().shutdown()
+        await close_db()
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    parser = argparse.ArgumentParser(description="RAGMind ingestion worker")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent jobs (defaults to INGESTION_WORKERS)")
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(main(args.workers))
+    except KeyboardInterrupt:
+        pass
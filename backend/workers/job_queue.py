@@ -0,0 +1,332 @@
+"""
+Ingestion Job Queue.
+Durable job table operations shared by API processes and standalone workers.
+"""
+from typing import Optional, Dict, Any
+from datetime import timedelta
+from sqlalchemy import select, update, or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database.models import IngestionJob
+from backend.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class JobLockLost(RuntimeError):
+    """Raised when a worker writes to a job another worker has reclaimed."""
+
+
+class JobQueue:
+    """Postgres-backed job queue using SELECT ... FOR UPDATE SKIP LOCKED."""
+    
+    # Job types
+    PROCESS_DOCUMENT = "process_document"
+    REINDEX_PROJECT = "reindex_project"
+    DELETE_DOCUMENT = "delete_document"
+    DELETE_PROJECT = "delete_project"
+    RECONCILE_STORAGE = "reconcile_storage"
+    
+    # Longest delay between retries
+    MAX_BACKOFF_SECONDS = 3600
+    
+    def __init__(self):
+        """Initialize job queue."""
+        self.max_attempts = settings.ingestion_max_attempts
+        self.backoff_seconds = settings.ingestion_retry_backoff_seconds
+        self.lock_timeout = timedelta(seconds=settings.ingestion_lock_timeout_seconds)
+    
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        job_type: str,
+        asset_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        max_attempts: Optional[int] = None,
+        delay_seconds: Optional[float] = None
+    ) -> IngestionJob:
+        """
+        Add a job to the queue.
+        
+        Args:
+            db: Database session
+            job_type: Job type (e.g. JobQueue.PROCESS_DOCUMENT)
+            asset_id: Optional asset the job works on
+            project_id: Optional project the job works on
+            payload: Optional job parameters
+            max_attempts: Attempts before giving up (defaults to settings)
+            delay_seconds: Seconds before the job may start (defaults to now)
+            
+        Returns:
+            Created job
+        """
+        try:
+            job = IngestionJob(
+                job_type=job_type,
+                asset_id=asset_id,
+                project_id=project_id,
+                payload=payload or {},
+                status="queued",
+                attempts=0,
+                max_attempts=max_attempts or self.max_attempts,
+                **({'run_after': func.now() + timedelta(seconds=delay_seconds)} if delay_seconds else {})
+            )
+            
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+            
+            logger.info(f"Enqueued job {job.id} ({job_type}, asset={asset_id}, project={project_id})")
+            return job
+            
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error enqueuing job: {str(e)}")
+            raise
+    
+    async def claim(
+        self,
+        db: AsyncSession,
+        worker_id: str
+    ) -> Optional[IngestionJob]:
+        """
+        Claim the next runnable job.
+        
+        Runnable jobs are queued jobs whose retry delay has passed and running
+        jobs whose lock expired (their worker died). Rows locked by another
+        worker's in-flight claim are skipped rather than waited on. An
+        abandoned job that has used all its attempts is failed instead of
+        being run again, so a job that keeps killing its worker (out of
+        memory, parser crash) is not reclaimed forever.
+        
+        Args:
+            db: Database session
+            worker_id: Identifier of the claiming worker
+            
+        Returns:
+            Claimed job or None if the queue is empty
+        """
+        try:
+            now = func.now()
+            stmt = select(IngestionJob).where(
+                or_(
+                    and_(IngestionJob.status == "queued", IngestionJob.run_after <= now),
+                    and_(IngestionJob.status == "running", IngestionJob.locked_at < now - self.lock_timeout)
+                )
+            ).order_by(
+                IngestionJob.run_after, IngestionJob.id
+            ).limit(1).with_for_update(skip_locked=True)
+            
+            while True:
+                result = await db.execute(stmt)
+                job = result.scalar_one_or_none()
+                if not job:
+                    await db.rollback()
+                    return None
+                
+                if job.status != "running":
+                    break
+                
+                if job.attempts >= job.max_attempts:
+                    logger.error(
+                        f"Job {job.id} lost its worker ({job.locked_by}) on its last attempt, "
+                        f"failing it after {job.attempts} attempts"
+                    )
+                    job.status = "failed"
+                    job.last_error = f"Worker lost: {job.locked_by} stopped responding"
+                    job.locked_by = None
+                    job.locked_at = None
+                    job.finished_at = now
+                    await db.commit()
+                    continue
+                
+                logger.warning(f"Reclaiming abandoned job {job.id} from {job.locked_by}")
+                break
+            
+            job.status = "running"
+            job.locked_by = worker_id
+            job.locked_at = now
+            job.attempts += 1
+            await db.commit()
+            await db.refresh(job)
+            
+            return job
+            
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error claiming job: {str(e)}")
+            raise
+    
+    async def heartbeat(
+        self,
+        db: AsyncSession,
+        job_id: int,
+        worker_id: str
+    ) -> bool:
+        """
+        Refresh the lock of a running job so it is not reclaimed.
+        
+        Args:
+            db: Database session
+            job_id: Job ID
+            worker_id: Worker holding the lock
+            
+        Returns:
+            False if the worker no longer holds the lock
+        """
+        stmt = update(IngestionJob).where(
+            IngestionJob.id == job_id,
+            IngestionJob.locked_by == worker_id
+        ).values(locked_at=func.now())
+        result = await db.execute(stmt)
+        await db.commit()
+        return result.rowcount > 0
+    
+    async def update_payload(
+        self,
+        db: AsyncSession,
+        job_id: int,
+        payload: Dict[str, Any],
+        worker_id: str
+    ) -> None:
+        """
+        Replace the payload of a job (used to report progress).
+        
+        Args:
+            db: Database session
+            job_id: Job ID
+            payload: New payload
+            worker_id: Worker holding the lock
+            
+        Raises:
+            JobLockLost: If another worker has reclaimed the job
+        """
+        stmt = update(IngestionJob).where(
+            IngestionJob.id == job_id,
+            IngestionJob.locked_by == worker_id
+        ).values(payload=payload)
+        result = await db.execute(stmt)
+        await db.commit()
+        if result.rowcount == 0:
+            raise JobLockLost(f"Job {job_id} is no longer locked by {worker_id}")
+    
+    async def complete(
+        self,
+        db: AsyncSession,
+        job_id: int,
+        worker_id: str
+    ) -> bool:
+        """
+        Mark job as completed.
+        
+        Args:
+            db: Database session
+            job_id: Job ID
+            worker_id: Worker holding the lock
+            
+        Returns:
+            False if the job was reclaimed by another worker (left untouched)
+        """
+        stmt = update(IngestionJob).where(
+            IngestionJob.id == job_id,
+            IngestionJob.locked_by == worker_id
+        ).values(
+            status="completed",
+            locked_by=None,
+            locked_at=None,
+            last_error=None,
+            finished_at=func.now()
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+        return result.rowcount > 0
+    
+    async def fail(
+        self,
+        db: AsyncSession,
+        job_id: int,
+        worker_id: str,
+        error: str
+    ) -> bool:
+        """
+        Record a failed attempt; retry with exponential backoff or give up.
+        
+        Args:
+            db: Database session
+            job_id: Job ID
+            worker_id: Worker holding the lock
+            error: Error message
+            
+        Returns:
+            False if the job was reclaimed by another worker (left untouched)
+        """
+        stmt = select(IngestionJob).where(
+            IngestionJob.id == job_id,
+            IngestionJob.locked_by == worker_id
+        ).with_for_update()
+        job = (await db.execute(stmt)).scalar_one_or_none()
+        if not job:
+            await db.rollback()
+            return False
+        
+        job.last_error = error
+        job.locked_by = None
+        job.locked_at = None
+        
+        if job.attempts >= job.max_attempts:
+            job.status = "failed"
+            job.finished_at = func.now()
+            logger.error(f"Job {job_id} failed permanently after {job.attempts} attempts: {error}")
+        else:
+            delay = min(self.backoff_seconds * 2 ** (job.attempts - 1), self.MAX_BACKOFF_SECONDS)
+            job.status = "queued"
+            job.run_after = func.now() + timedelta(seconds=delay)
+            logger.warning(f"Job {job_id} attempt {job.attempts} failed, retrying in {delay}s: {error}")
+        
+        await db.commit()
+        return True
+    
+    async def release(
+        self,
+        db: AsyncSession,
+        job_id: int,
+        worker_id: str
+    ) -> None:
+        """
+        Return an interrupted job to the queue without counting the attempt.
+        
+        Args:
+            db: Database session
+            job_id: Job ID
+            worker_id: Worker holding the lock
+        """
+        stmt = update(IngestionJob).where(
+            IngestionJob.id == job_id,
+            IngestionJob.status == "running",
+            IngestionJob.locked_by == worker_id
+        ).values(
+            status="queued",
+            attempts=IngestionJob.attempts - 1,
+            locked_by=None,
+            locked_at=None
+        )
+        await db.execute(stmt)
+        await db.commit()
+    
+    async def get_job(
+        self,
+        db: AsyncSession,
+        job_id: int
+    ) -> Optional[IngestionJob]:
+        """
+        Get job by ID.
+        
+        Args:
+            db: Database session
+            job_id: Job ID
+            
+        Returns:
+            Job or None
+        """
+        return await db.get(IngestionJob, job_id)
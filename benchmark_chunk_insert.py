@@ -0,0 +1,104 @@
+"""
+Benchmark: per-row ORM chunk inserts vs bulk INSERT ... RETURNING.
+
+Creates a throwaway project and asset in the configured database, inserts
+the same synthetic chunks (with 768-dim embeddings) both ways and reports
+wall-clock time. The project is deleted afterwards.
+
+Usage:
+    python benchmark_chunk_insert.py [chunk counts...]
+    python benchmark_chunk_insert.py 1000 5000
+"""
+import asyncio
+import random
+import sys
+import time
+
+from sqlalchemy import delete
+
+from backend.database import Project, Asset, Chunk, async_session_maker, init_db, close_db
+from backend.database.bulk import bulk_insert_chunks
+
+DIMENSION = 768
+
+
+def make_rows(project_id: int, asset_id: int, count: int):
+    """Synthetic chunk rows of ~1000 characters each."""
+    rng = random.Random(42)
+    return [
+        {
+            'project_id': project_id,
+            'asset_id': asset_id,
+            'content': f"chunk {i} " + "lorem ipsum dolor sit amet " * 36,
+            'chunk_index': i,
+            'extra_metadata': {'chunk_index': i, 'document_name': 'benchmark.pdf'},
+            'embedding': [rng.random() for _ in range(DIMENSION)]
+        }
+        for i in range(count)
+    ]
+
+
+async def per_row(session, rows) -> float:
+    """Previous write path: add each chunk, commit, refresh each for its id."""
+    start = time.perf_counter()
+    records = [Chunk(**row) for row in rows]
+    for record in records:
+        session.add(record)
+    await session.commit()
+    for record in records:
+        await session.refresh(record)
+    return time.perf_counter() - start
+
+
+async def bulk(session, rows) -> float:
+    """New write path: multi-row INSERT ... RETURNING id."""
+    start = time.perf_counter()
+    await bulk_insert_chunks(session, rows)
+    await session.commit()
+    return time.perf_counter() - start
+
+
+async def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 5000]
+    await init_db()
+
+    async with async_session_maker() as session:
+        project = Project(name="benchmark-chunk-insert")
+        session.add(project)
+        await session.flush()
+        asset = Asset(
+            project_id=project.id,
+            filename="benchmark.pdf",
+            original_filename="benchmark.pdf",
+            file_path="benchmark.pdf",
+            file_size=0,
+            file_type="pdf",
+            status="completed"
+        )
+        session.add(asset)
+        await session.commit()
+
+        try:
+            print(f"{'chunks':>8}{'per-row (s)':>14}{'bulk (s)':>12}{'speedup':>10}")
+            for count in counts:
+                rows = make_rows(project.id, asset.id, count)
+
+                slow = await per_row(session, rows)
+                await session.execute(delete(Chunk).where(Chunk.asset_id == asset.id))
+                await session.commit()
+                session.expunge_all()
+
+                fast = await bulk(session, rows)
+                await session.execute(delete(Chunk).where(Chunk.asset_id == asset.id))
+                await session.commit()
+
+                print(f"{count:>8}{slow:>14.2f}{fast:>12.2f}{slow / fast:>9.1f}x")
+        finally:
+            await session.execute(delete(Project).where(Project.id == project.id))
+            await session.commit()
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
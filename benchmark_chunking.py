@@ -0,0 +1,128 @@
+"""
+Benchmark: native single-pass splitter vs LangChain's recursive splitter.
+
+Generates large English and Arabic documents (paragraphs of sentences of
+random words), plus Arabic text without any separator (as produced by some
+PDF extractors), and compares split time, chunk counts and chunk sizes for
+RecursiveTextSplitter and langchain_text_splitters.RecursiveCharacterTextSplitter
+with the same separators, size and overlap.
+
+Usage:
+    python benchmark_chunking.py [megabytes] [chunk_size] [chunk_overlap]
+    python benchmark_chunking.py 5 1000 200
+"""
+import random
+import statistics
+import sys
+import time
+
+from backend.services.text_splitter import RecursiveTextSplitter
+from backend.services.token_estimator import TokenEstimator
+
+ENGLISH = (
+    "retrieval augmented generation splits documents into chunks embeds them "
+    "and answers questions using the most similar passages as context for the model"
+).split()
+ARABIC = (
+    "التعلم الآلي هو فرع من الذكاء الاصطناعي يركز على بناء أنظمة تتعلم من البيانات "
+    "وتحسن أداءها مع الخبرة دون أن تتم برمجتها بشكل صريح لكل مهمة"
+).split()
+
+
+def generate_text(words, megabytes: float, rng: random.Random) -> str:
+    """Paragraphs of 1-3 lines, each line a few sentences of random words."""
+    target = int(megabytes * 1024 * 1024)
+    paragraphs = []
+    size = 0
+    while size < target:
+        lines = []
+        for _ in range(rng.randint(1, 3)):
+            sentences = [
+                ' '.join(rng.choice(words) for _ in range(rng.randint(4, 30))) + '.'
+                for _ in range(rng.randint(1, 8))
+            ]
+            lines.append(' '.join(sentences))
+        paragraph = '\n'.join(lines)
+        paragraphs.append(paragraph)
+        size += len(paragraph.encode('utf-8')) + 2
+    return '\n\n'.join(paragraphs)
+
+
+def generate_unbroken(megabytes: float, rng: random.Random) -> str:
+    """Arabic letters with no spaces or line breaks (worst case for recursion)."""
+    letters = ''.join(sorted(set(''.join(ARABIC))))
+    return ''.join(rng.choice(letters) for _ in range(int(megabytes * 1024 * 1024 / 2)))
+
+
+def timed(func, *args):
+    """Run func and return (result, seconds)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def report(label: str, chunks, seconds: float) -> None:
+    lengths = [len(c) for c in chunks]
+    tokens = [TokenEstimator.estimate(c) for c in chunks]
+    print(
+        f"  {label:<22}{seconds:>9.2f}s{len(chunks):>9}"
+        f"{statistics.mean(lengths):>11.0f}{max(lengths):>9}{max(tokens):>11}"
+    )
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    chunk_overlap = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    rng = random.Random(42)
+
+    try:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        langchain = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+            separators=["\n\n", "\n", ". ", " ", ""]
+        )
+        langchain_tokens = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size // 4,
+            chunk_overlap=chunk_overlap // 4,
+            length_function=TokenEstimator.estimate,
+            separators=["\n\n", "\n", ". ", " ", ""]
+        )
+    except ImportError:
+        langchain = langchain_tokens = None
+        print("langchain-text-splitters not installed; timing the native splitter only")
+
+    native = RecursiveTextSplitter(chunk_size, chunk_overlap)
+    # Same budget expressed in estimated tokens (~4 English chars per token)
+    native_tokens = RecursiveTextSplitter(
+        chunk_size // 4, chunk_overlap // 4, length_unit=RecursiveTextSplitter.TOKENS
+    )
+
+    corpora = [
+        ("English", generate_text(ENGLISH, megabytes, rng)),
+        ("Arabic", generate_text(ARABIC, megabytes, rng)),
+        ("Arabic, no separators", generate_unbroken(megabytes, rng))
+    ]
+    for language, text in corpora:
+        print(f"\n{language}: {len(text):,} characters (size={chunk_size}, overlap={chunk_overlap})")
+        print(f"  {'splitter':<22}{'time':>10}{'chunks':>9}{'avg chars':>11}{'max':>9}{'max tokens':>11}")
+
+        if langchain:
+            chunks, seconds = timed(langchain.split_text, text)
+            report("langchain (chars)", chunks, seconds)
+
+        chunks, seconds = timed(native.split_text, text)
+        report("native (chars)", chunks, seconds)
+
+        if langchain_tokens:
+            chunks, seconds = timed(langchain_tokens.split_text, text)
+            report(f"langchain ({chunk_size // 4} tokens)", chunks, seconds)
+
+        chunks, seconds = timed(native_tokens.split_text, text)
+        report(f"native ({chunk_size // 4} tokens)", chunks, seconds)
+
+
+if __name__ == "__main__":
+    main()
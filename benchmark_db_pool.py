@@ -0,0 +1,152 @@
+"""
+Benchmark: query-path database latency with NullPool vs the connection pool.
+
+Replays the database round trips of a /query request (project lookup,
+served-index lookup, centroid selection and the chunk fetch, each in its
+own session as in the API) from many concurrent clients against a
+throwaway project in the configured database, once with a new connection
+per session (the previous NullPool engine) and once with the configured
+pool. Reports request latency percentiles, throughput and pool metrics.
+The project is deleted afterwards.
+
+Usage:
+    python benchmark_db_pool.py [concurrency levels...]
+    python benchmark_db_pool.py 1 10 50
+
+Results: not measured yet. The benchmark needs a PostgreSQL server with
+pgvector, and none was available where the pool was written, so no
+before/after latency figures exist. Record them here once it has run
+against a real database.
+"""
+import asyncio
+import random
+import sys
+import time
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.database import Project, Asset, Chunk, AssetCentroid, init_db, close_db
+from backend.database.bulk import bulk_insert_chunks
+from backend.database.connection import create_engine
+from backend.database.pool import pool_metrics
+from backend.config import settings
+
+DIMENSION = 768
+CHUNKS = 200
+REQUESTS_PER_CLIENT = 20
+
+
+async def setup(session_maker) -> int:
+    """Create a project with one document and its chunks."""
+    rng = random.Random(42)
+    async with session_maker() as session:
+        project = Project(name="benchmark-db-pool")
+        session.add(project)
+        await session.flush()
+        asset = Asset(
+            project_id=project.id,
+            filename="benchmark.pdf",
+            original_filename="benchmark.pdf",
+            file_path="benchmark.pdf",
+            file_size=0,
+            file_type="pdf",
+            status="completed"
+        )
+        session.add(asset)
+        await session.flush()
+        session.add(AssetCentroid(
+            asset_id=asset.id,
+            project_id=project.id,
+            embedding=[rng.random() for _ in range(DIMENSION)],
+            chunk_count=CHUNKS
+        ))
+        await bulk_insert_chunks(session, [
+            {
+                'project_id': project.id,
+                'asset_id': asset.id,
+                'content': f"chunk {i} " + "lorem ipsum dolor sit amet " * 36,
+                'chunk_index': i,
+                'extra_metadata': {'chunk_index': i},
+                'embedding': None
+            }
+            for i in range(CHUNKS)
+        ])
+        await session.commit()
+        return project.id
+
+
+async def request(session_maker, project_id: int) -> float:
+    """One /query request's database work; returns its latency."""
+    start = time.perf_counter()
+    async with session_maker() as session:
+        await session.get(Project, project_id)
+    async with session_maker() as session:
+        await session.execute(select(Project.index_generation, Project.embedding_model).where(Project.id == project_id))
+    async with session_maker() as session:
+        await session.execute(select(Asset.id, AssetCentroid.embedding).outerjoin(
+            AssetCentroid, AssetCentroid.asset_id == Asset.id
+        ).where(Asset.project_id == project_id, Asset.status == "completed"))
+    async with session_maker() as session:
+        await session.execute(select(Chunk.id, Chunk.content).where(Chunk.project_id == project_id).limit(20))
+    return time.perf_counter() - start
+
+
+async def run(pool_size: int, concurrency: int, project_id: int):
+    """Latencies and wall time of concurrency clients on a fresh engine."""
+    engine = create_engine(pool_size=pool_size)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    pool_metrics.reset()
+
+    async def client():
+        return [await request(session_maker, project_id) for _ in range(REQUESTS_PER_CLIENT)]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[client() for _ in range(concurrency)])
+    wall = time.perf_counter() - start
+    stats = pool_metrics.snapshot(engine.sync_engine.pool)
+    await engine.dispose()
+    return sorted(latency for latencies in results for latency in latencies), wall, stats
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of sorted values."""
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def main():
+    levels = [int(arg) for arg in sys.argv[1:]] or [1, 10, 50]
+    await init_db()
+
+    engine = create_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    project_id = await setup(session_maker)
+
+    try:
+        print(f"pool: size={settings.db_pool_size} overflow={settings.db_max_overflow}")
+        print(
+            f"{'clients':>8}{'engine':>10}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}"
+            f"{'connects':>10}{'wait p95 ms':>13}{'peak conns':>12}"
+        )
+        for concurrency in levels:
+            for label, pool_size in (("NullPool", 0), ("pooled", settings.db_pool_size)):
+                latencies, wall, stats = await run(pool_size, concurrency, project_id)
+                print(
+                    f"{concurrency:>8}{label:>10}"
+                    f"{percentile(latencies, 0.50) * 1000:>10.1f}"
+                    f"{percentile(latencies, 0.95) * 1000:>10.1f}"
+                    f"{len(latencies) / wall:>10.1f}"
+                    f"{stats['connects']:>10}"
+                    f"{stats['wait_ms_p95']:>13.2f}"
+                    f"{stats['peak_checked_out']:>12}"
+                )
+    finally:
+        async with session_maker() as session:
+            await session.execute(delete(Project).where(Project.id == project_id))
+            await session.commit()
+        await engine.dispose()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+Benchmark: page-parallel PDF extraction.
+
+Generates a multi-hundred-page text PDF and measures wall-clock extraction
+time through DocumentLoaderService for different parser worker counts.
+
+Usage:
+    python benchmark_pdf_extraction.py [pages] [worker counts...]
+    python benchmark_pdf_extraction.py 500 1 2 4 8
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from backend.config import settings
+from backend.services.document_loader import DocumentLoaderService
+from backend.services.parser_pool import ParserPool
+
+LINES_PER_PAGE = 45
+WORDS = (
+    "retrieval augmented generation splits documents into chunks embeds them "
+    "and answers questions using the most similar passages as context"
+).split()
+
+
+def generate_pdf(path: str, pages: int) -> None:
+    """Write a plain-text PDF with the given number of pages."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+
+    for page in range(pages):
+        lines = []
+        for line in range(LINES_PER_PAGE):
+            words = [WORDS[(page + line + i) % len(WORDS)] for i in range(12)]
+            lines.append(f"({page + 1}.{line + 1} {' '.join(words)}) Tj T*")
+        stream = ("BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(lines) + " ET").encode()
+
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+
+async def run(path: str, worker_counts) -> None:
+    baseline = None
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}{'pages':>8}{'chars':>12}")
+
+    for workers in worker_counts:
+        pool = ParserPool(max_workers=workers)
+        ParserPool._instance = pool
+        await pool.warm()
+
+        start = time.perf_counter()
+        document = await DocumentLoaderService.load_document_with_pages(path)
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>8}{elapsed:>10.2f}{baseline / elapsed:>10.2f}"
+            f"{len(document['pages']):>8}{len(document['text']):>12}"
+        )
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    worker_counts = [int(n) for n in sys.argv[2:]] or [1, 2, 4, 8]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "benchmark.pdf")
+        generate_pdf(path, pages)
+        print(f"Generated {pages}-page PDF ({os.path.getsize(path) / 1e6:.1f} MB), "
+              f"parallel threshold={settings.pdf_parallel_min_pages} pages, CPUs={os.cpu_count()}\n")
+        asyncio.run(run(path, worker_counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Check that streamed chunking matches chunking the whole text.
+
+ChunkingService.stream_document splits a document window by window; the
+chunks must be identical to splitting the concatenated text at once, in
+both length units and with or without parent windows.
+
+Usage:
+    python -m pytest test_chunk_streaming.py
+    python test_chunk_streaming.py
+"""
+import asyncio
+import random
+
+from backend.services.chunking_service import ChunkingService
+
+WORDS = (
+    "retrieval augmented generation splits documents into chunks "
+    "التعلم الآلي هو فرع من الذكاء الاصطناعي يركز على بناء أنظمة"
+).split()
+BREAKS = [". ", ".\n", "\n\n", " ", "  \n "]
+TRIALS = 200
+
+
+def generate_text(rng: random.Random, length: int) -> str:
+    """Mixed English/Arabic sentences separated by assorted boundaries."""
+    parts = []
+    size = 0
+    while size < length:
+        part = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 20))) + rng.choice(BREAKS)
+        parts.append(part)
+        size += len(part)
+    return ''.join(parts)
+
+
+async def iter_windows(text: str, rng: random.Random):
+    """Cut text into windows of random size, like iter_document_windows."""
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 400)
+        yield {'text': text[position:position + size], 'start': position, 'pages': []}
+        position += size
+
+
+async def stream_chunks(service: ChunkingService, text: str, rng: random.Random):
+    """Chunk text window by window."""
+    chunks = []
+    async for chunk in service.stream_document(iter_windows(text, rng), "doc.txt"):
+        metadata = chunk['metadata']
+        chunks.append((chunk['content'], metadata['start_index'], metadata['end_index']))
+    return chunks
+
+
+async def full_chunks(service: ChunkingService, text: str):
+    """Chunk the whole text at once."""
+    if service.parent_splitter:
+        _, chunks = await service.chunk_document_hierarchy(text, "doc.txt")
+    else:
+        chunks = await service.chunk_document(text, "doc.txt")
+    return [
+        (chunk['content'], chunk['metadata']['start_index'], chunk['metadata']['end_index'])
+        for chunk in chunks
+    ]
+
+
+def check_streaming_matches_full(length_unit: str, with_parents: bool, seed: int) -> None:
+    """Compare streamed and full chunking over random multi-window texts."""
+    rng = random.Random(seed)
+    scale = 1 if length_unit == "chars" else 4
+
+    for _ in range(TRIALS):
+        chunk_size = rng.randint(20, 200) // scale + 2
+        service = ChunkingService(
+            chunk_size=chunk_size,
+            chunk_overlap=rng.randint(1, chunk_size - 1),
+            parent_chunk_size=chunk_size * rng.randint(2, 5) if with_parents else None,
+            length_unit=length_unit
+        )
+        if not with_parents:
+            service.parent_splitter = None
+
+        text = generate_text(rng, rng.randint(100, 4000))
+        streamed = asyncio.run(stream_chunks(service, text, rng))
+        expected = asyncio.run(full_chunks(service, text))
+
+        assert streamed == expected, f"Streamed chunks differ ({length_unit}, parents={with_parents})"
+
+
+def test_streaming_matches_full_chars():
+    check_streaming_matches_full("chars", with_parents=False, seed=1)
+
+
+def test_streaming_matches_full_tokens():
+    check_streaming_matches_full("tokens", with_parents=False, seed=2)
+
+
+def test_streaming_matches_full_with_parents():
+    check_streaming_matches_full("chars", with_parents=True, seed=3)
+    check_streaming_matches_full("tokens", with_parents=True, seed=4)
+
+
+if __name__ == "__main__":
+    test_streaming_matches_full_chars()
+    test_streaming_matches_full_tokens()
+    test_streaming_matches_full_with_parents()
+    print("Streamed chunks match full-text chunking")
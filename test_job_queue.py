@@ -0,0 +1,91 @@
+"""
+Check that JobQueue.claim dead-letters jobs that keep losing their worker.
+
+A running job whose lock expired is normally reclaimed and retried, but one
+that has used all its attempts (e.g. it keeps crashing the worker) must be
+failed instead of running again. The database session is replaced by a
+fake that hands out the given jobs in order, so no PostgreSQL is needed.
+
+Usage:
+    python -m pytest test_job_queue.py
+    python test_job_queue.py
+"""
+import asyncio
+from types import SimpleNamespace
+
+from backend.workers.job_queue import JobQueue
+
+
+class FakeSession:
+    """Minimal AsyncSession stand-in returning one candidate job per query."""
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.commits = 0
+
+    async def execute(self, stmt):
+        job = self.jobs.pop(0) if self.jobs else None
+        return SimpleNamespace(scalar_one_or_none=lambda: job)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+    async def refresh(self, job):
+        pass
+
+
+def make_job(job_id, status, attempts, max_attempts=3, locked_by=None):
+    """Job row with the fields claim() reads and writes."""
+    return SimpleNamespace(
+        id=job_id,
+        status=status,
+        attempts=attempts,
+        max_attempts=max_attempts,
+        locked_by=locked_by,
+        locked_at=None,
+        last_error=None,
+        finished_at=None
+    )
+
+
+def test_reclaim_with_attempts_left_runs_again():
+    job = make_job(1, "running", attempts=1, locked_by="dead:1")
+    claimed = asyncio.run(JobQueue().claim(FakeSession([job]), "w:0"))
+
+    assert claimed is job
+    assert job.status == "running"
+    assert job.locked_by == "w:0"
+    assert job.attempts == 2
+
+
+def test_reclaim_without_attempts_left_is_failed():
+    exhausted = make_job(1, "running", attempts=3, locked_by="dead:1")
+    queued = make_job(2, "queued", attempts=0)
+    session = FakeSession([exhausted, queued])
+
+    claimed = asyncio.run(JobQueue().claim(session, "w:0"))
+
+    assert exhausted.status == "failed"
+    assert exhausted.locked_by is None
+    assert "Worker lost" in exhausted.last_error
+    assert exhausted.attempts == 3
+    assert claimed is queued
+    assert queued.status == "running"
+
+
+def test_only_exhausted_jobs_leave_queue_empty():
+    exhausted = make_job(1, "running", attempts=5, max_attempts=5, locked_by="dead:1")
+    claimed = asyncio.run(JobQueue().claim(FakeSession([exhausted]), "w:0"))
+
+    assert claimed is None
+    assert exhausted.status == "failed"
+
+
+if __name__ == "__main__":
+    test_reclaim_with_attempts_left_runs_again()
+    test_reclaim_without_attempts_left_is_failed()
+    test_only_exhausted_jobs_leave_queue_empty()
+    print("Job queue claim checks passed")